@@ -0,0 +1,33 @@
+"""
+Compare the size and JSON encode time of a wide list response as an array of objects and in
+the columnar forms of `responds(columnar=True)`.
+
+    python benchmarks/bench_columnar.py
+"""
+import json
+import timeit
+
+from flask_accepts.columnar import to_columnar
+
+
+def make_rows(size: int, width: int):
+    return [{f"column_{c}": i * c for c in range(width)} for i in range(size)]
+
+
+def main(size: int = 5000, width: int = 30, number: int = 5):
+    rows = make_rows(size, width)
+    columns = list(rows[0])
+    outputs = {
+        "objects": lambda: rows,
+        "columns": lambda: to_columnar(rows, columns, "columns"),
+        "rows": lambda: to_columnar(rows, columns, "rows"),
+    }
+
+    for name, build in outputs.items():
+        size_kb = len(json.dumps(build())) / 1024
+        elapsed = min(timeit.repeat(lambda: json.dumps(build()), number=number, repeat=3))
+        print(f"{name:>8}: {size_kb:9.0f} KiB, {elapsed / number * 1e3:7.1f} ms to build and encode")
+
+
+if __name__ == "__main__":
+    main()
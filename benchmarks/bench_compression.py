@@ -0,0 +1,50 @@
+"""
+Compare the size and time of a large list response without compression and with
+`responds(compress=True)` at a few compression levels.
+
+    python benchmarks/bench_compression.py
+"""
+import timeit
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+
+
+class WidgetSchema(Schema):
+    foo = fields.String()
+    baz = fields.Integer()
+    qux = fields.Float()
+
+
+WIDGETS = [{"foo": f"widget {i}", "baz": i, "qux": i / 3} for i in range(20000)]
+
+
+def create_views():
+    views = {"uncompressed": responds(schema=WidgetSchema(many=True))(lambda: WIDGETS)}
+    for level in (1, 6, 9):
+        views[f"gzip level {level}"] = responds(
+            schema=WidgetSchema(many=True), compress=True, compress_level=level
+        )(lambda: WIDGETS)
+    return views
+
+
+def _body(view):
+    rv = view()
+    response = rv[0] if isinstance(rv, tuple) else rv
+    return b"".join(response.response)
+
+
+def main(number: int = 5):
+    app = Flask(__name__)
+
+    with app.test_request_context("/", headers={"Accept-Encoding": "gzip"}):
+        for name, view in create_views().items():
+            size_kb = len(_body(view)) / 1024
+            elapsed = min(timeit.repeat(lambda: _body(view), number=number, repeat=3))
+            print(f"{name:>14}: {size_kb:8.0f} KiB, {elapsed / number * 1e3:7.1f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare dumping SQLAlchemy objects whose relationships are lazy loaded, one query per row,
+with loading them with the options from `eager_load_options`, on an in-memory SQLite database.
+
+    python benchmarks/bench_eager_load.py
+"""
+import timeit
+
+import sqlalchemy as sa
+from marshmallow import Schema, fields
+from sqlalchemy import event, orm
+
+from flask_accepts.orm import eager_load_options
+
+
+Base = orm.declarative_base()
+
+
+class Owner(Base):
+    __tablename__ = "owner"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+
+
+class Cog(Base):
+    __tablename__ = "cog"
+    id = sa.Column(sa.Integer, primary_key=True)
+    size = sa.Column(sa.Integer)
+    widget_id = sa.Column(sa.ForeignKey("widget.id"))
+
+
+class Widget(Base):
+    __tablename__ = "widget"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    description = sa.Column(sa.Text)
+    owner_id = sa.Column(sa.ForeignKey("owner.id"))
+    owner = orm.relationship(Owner)
+    cogs = orm.relationship(Cog)
+
+
+class OwnerSchema(Schema):
+    name = fields.String()
+
+
+class CogSchema(Schema):
+    id = fields.Integer()
+    size = fields.Integer()
+
+
+class WidgetSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    owner = fields.Nested(OwnerSchema)
+    cogs = fields.List(fields.Nested(CogSchema))
+
+
+def main(n: int = 500, number: int = 5):
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+    with orm.Session(engine) as session:
+        session.add_all(
+            Widget(
+                name=f"widget {i}",
+                description="x" * 2000,
+                owner=Owner(name=f"owner {i}"),
+                cogs=[Cog(size=j) for j in range(3)],
+            )
+            for i in range(n)
+        )
+        session.commit()
+
+        schema = WidgetSchema(many=True)
+        options = eager_load_options(Widget, schema)
+        for label, query_options in (("lazy", []), ("eager", options)):
+
+            def run():
+                session.expire_all()
+                return schema.dump(session.query(Widget).options(*query_options).all())
+
+            statements.clear()
+            run()
+            count = len(statements)
+            seconds = min(timeit.repeat(run, number=number, repeat=3)) / number
+            print(f"{label:>6}: {seconds * 1e3:7.1f} ms, {count:4d} statements for {n} widgets")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare the per-request overhead of stacked `@accepts`/`@responds` decorators with the
+fused `@endpoint` decorator.
+
+The route has no reqparse arguments and a single-field schema, so that the time is spent in
+the decorators rather than in reqparse and marshmallow. The "hand-written" row loads, dumps
+and jsonifies the body with the schema directly, without the decorators; the overhead of each
+form of the decorators is its time minus that row.
+
+    python benchmarks/bench_endpoint.py
+"""
+import timeit
+
+from flask import Flask, jsonify, request
+from marshmallow import Schema, fields
+
+from flask_accepts import accepts, endpoint, responds
+
+
+class IdSchema(Schema):
+    id = fields.Integer()
+
+
+def create_views():
+    schema = IdSchema()
+
+    def hand_written():
+        return jsonify(schema.dump(schema.load(request.get_json())))
+
+    @accepts(schema=IdSchema, as_kwargs=True)
+    @responds(schema=IdSchema)
+    def stacked(body):
+        return body
+
+    @endpoint(accepts=dict(schema=IdSchema, as_kwargs=True), responds=dict(schema=IdSchema))
+    def fused(body):
+        return body
+
+    return hand_written, stacked, fused
+
+
+def main(number: int = 10000, repeat: int = 30):
+    app = Flask(__name__)
+    hand_written, stacked, fused = create_views()
+
+    views = {"hand-written": hand_written, "stacked": stacked, "endpoint": fused}
+    timings = {name: float("inf") for name in views}
+    with app.test_request_context("/", method="POST", json={"id": 3}):
+        # Interleaved, so that noise such as CPU frequency changes affects all views alike
+        for _ in range(repeat):
+            for name, view in views.items():
+                elapsed = timeit.timeit(view, number=number) / number * 1e6
+                timings[name] = min(timings[name], elapsed)
+
+    baseline = timings.pop("hand-written")
+    print(f"{'hand-written':>12}: {baseline:7.2f} us/request")
+    for name, us in timings.items():
+        print(f"{name:>12}: {us:7.2f} us/request, {us - baseline:5.2f} us of decorator overhead")
+
+
+if __name__ == "__main__":
+    main()
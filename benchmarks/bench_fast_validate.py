@@ -0,0 +1,67 @@
+"""
+Compare loading request bodies with marshmallow alone against `fast_validate` and
+`validate_only`, for valid and invalid bodies.
+
+    python benchmarks/bench_fast_validate.py
+"""
+import timeit
+
+from flask import Flask
+from marshmallow import Schema, fields
+from werkzeug.exceptions import BadRequest
+
+from flask_accepts import accepts
+
+
+class ItemSchema(Schema):
+    sku = fields.String(required=True)
+    quantity = fields.Integer(required=True)
+    price = fields.Float()
+
+
+class OrderSchema(Schema):
+    customer = fields.String(required=True)
+    notes = fields.String(allow_none=True)
+    items = fields.Nested(ItemSchema, many=True)
+
+
+VALID = {
+    "customer": "acme",
+    "notes": None,
+    "items": [{"sku": f"sku-{i}", "quantity": i, "price": 1.5} for i in range(20)],
+}
+INVALID = {**VALID, "items": [{"sku": i, "quantity": [i]} for i in range(20)]}
+
+
+def create_views():
+    def view():
+        return None
+
+    return {
+        "marshmallow": accepts(schema=OrderSchema)(view),
+        "fast_validate": accepts(schema=OrderSchema, fast_validate=True)(view),
+        "validate_only": accepts(schema=OrderSchema, validate_only=True)(view),
+    }
+
+
+def _call(view):
+    try:
+        view()
+    except BadRequest:
+        pass
+
+
+def main(number: int = 2000):
+    app = Flask(__name__)
+    views = create_views()
+
+    for label, body in (("valid", VALID), ("invalid", INVALID)):
+        with app.test_request_context("/", method="POST", json=body):
+            for name, view in views.items():
+                _call(view)  # warm up
+                elapsed = min(timeit.repeat(lambda: _call(view), number=number, repeat=5))
+                print(f"{label:>8} {name:>14}: {elapsed / number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
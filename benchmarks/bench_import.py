@@ -0,0 +1,46 @@
+"""
+Measure the import time of flask_accepts with `python -X importtime`, in fresh interpreters,
+and whether flask_restx was imported.
+
+    python benchmarks/bench_import.py
+"""
+import statistics
+import subprocess
+import sys
+
+
+STATEMENTS = (
+    "import flask_accepts",
+    "from flask_accepts import accepts, responds",
+    "from flask_accepts import for_swagger",
+)
+
+
+def import_time(statement: str) -> tuple:
+    code = f"{statement}; import sys; print('flask_restx' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Cumulative times (in us) of the top-level imports, which are not indented
+    total = sum(
+        int(line.split("|")[1])
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and not line.split("|")[2].startswith("  ")
+        and line.split("|")[1].strip().isdigit()
+    )
+    return total, result.stdout.strip() == "True"
+
+
+def main(repeat: int = 5):
+    for statement in STATEMENTS:
+        runs = [import_time(statement) for _ in range(repeat)]
+        median = statistics.median(total for total, _ in runs)
+        restx = "with flask_restx" if runs[0][1] else "without flask_restx"
+        print(f"{statement:>45}: {median / 1e3:7.1f} ms {restx}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare returning a whole SQLite table from a `responds(many=True)` route with returning a
+page of it with `paginate_by`.
+
+    python benchmarks/bench_pagination.py
+"""
+import timeit
+import tracemalloc
+
+import sqlalchemy as sa
+from flask import Flask
+from marshmallow import Schema, fields
+from sqlalchemy import orm
+
+from flask_accepts import responds
+from flask_accepts.pagination import encode_cursor
+
+
+Base = orm.declarative_base()
+
+
+class Widget(Base):
+    __tablename__ = "widget"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    price = sa.Column(sa.Float)
+
+
+class WidgetSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    price = fields.Float()
+
+
+def main(n: int = 50_000, number: int = 3):
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    app = Flask(__name__)
+
+    with orm.Session(engine) as session:
+        session.execute(
+            sa.insert(Widget), [{"name": f"widget {i}", "price": i / 3} for i in range(n)]
+        )
+        session.commit()
+
+        @app.route("/all")
+        @responds(schema=WidgetSchema(many=True))
+        def everything():
+            session.expunge_all()
+            return session.query(Widget).all()
+
+        @app.route("/page")
+        @responds(schema=WidgetSchema(many=True), paginate_by="id", page_size=100)
+        def page():
+            session.expunge_all()
+            return session.query(Widget)
+
+        client = app.test_client()
+        for label, url in (("all", "/all"), ("page", f"/page?cursor={encode_cursor(n // 2)}")):
+            tracemalloc.start()
+            client.get(url)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            seconds = min(timeit.repeat(lambda: client.get(url), number=number, repeat=3)) / number
+            print(f"{label:>5}: {seconds * 1e3:8.2f} ms, peak {peak / 2 ** 20:6.1f} MiB")
+
+if __name__ == "__main__":
+    main()
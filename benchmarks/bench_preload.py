@@ -0,0 +1,71 @@
+"""
+Compare the memory a forked worker copies from its parent when its garbage collector first
+runs, without and with `preload()` (Linux only, as it reads /proc/self/smaps_rollup).
+
+    python benchmarks/bench_preload.py
+"""
+import gc
+import os
+import sys
+
+from flask import Flask
+from flask_restx import Api, Namespace, Resource
+from marshmallow import Schema, fields
+
+from flask_accepts import accepts, preload, responds
+
+
+def make_app(routes: int = 300, width: int = 20) -> Flask:
+    app = Flask(__name__)
+    api = Api(app)
+    ns = Namespace("bench")
+    api.add_namespace(ns)
+    for i in range(routes):
+        attrs = {f"value_{j}": fields.String() for j in range(width)}
+        schema = type(f"Route{i}Schema", (Schema,), attrs)
+
+        @ns.route(f"/route-{i}")
+        class _Resource(Resource):
+            @accepts(schema=schema, api=ns)
+            @responds(schema=schema, api=ns)
+            def post(self):
+                pass
+
+    return app
+
+
+def private_dirty_kib() -> int:
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+    raise RuntimeError("Private_Dirty not found")
+
+
+def copied_by_worker_gc() -> int:
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        before = private_dirty_kib()
+        gc.collect()
+        os.write(write, str(private_dirty_kib() - before).encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    return int(os.read(read, 64))
+
+
+def main():
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark requires Linux")
+
+    app = make_app()
+    gc.collect()
+    print(f"{'no preload':>12}: {copied_by_worker_gc():7d} KiB copied by the first GC in a worker")
+    report = preload(app)
+    print(f"{'preload':>12}: {copied_by_worker_gc():7d} KiB copied by the first GC in a worker")
+    print(report)
+    gc.unfreeze()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure the overhead of `responds(profile_fields=True)` on a list response, and show the
+field report, in which the slow `Method` field stands out.
+
+    python benchmarks/bench_profiling.py
+"""
+import timeit
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.profiling import field_profiler
+
+
+class CogSchema(Schema):
+    cog_id = fields.Integer()
+    cog_foo = fields.Method("get_cog_foo")
+
+    def get_cog_foo(self, obj):
+        return sum(range(200))
+
+
+class WidgetSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    price = fields.Float()
+    cog = fields.Nested(CogSchema)
+
+
+def main(n: int = 1000, number: int = 20):
+    app = Flask(__name__)
+    widgets = [
+        {"id": i, "name": f"widget {i}", "price": i / 3, "cog": {"cog_id": i}} for i in range(n)
+    ]
+
+    for profile in (False, True):
+
+        @responds(schema=WidgetSchema(many=True), profile_fields=profile)
+        def view():
+            return widgets
+
+        with app.test_request_context("/"):
+            seconds = min(timeit.repeat(view, number=number, repeat=5)) / number
+        label = "profiled" if profile else "plain"
+        print(f"{label:>10}: {seconds * 1e3:7.2f} ms per response of {n} items")
+
+    print()
+    print(field_profiler.format())
+
+
+if __name__ == "__main__":
+    main()
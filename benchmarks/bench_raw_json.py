@@ -0,0 +1,57 @@
+"""
+Compare the time of responding with JSON documents cached as text, parsed and dumped again
+through a `fields.Raw` field, with splicing them as-is with `RawJSONField` and
+`responds(raw_json=True)`.
+
+    python benchmarks/bench_raw_json.py
+"""
+import json
+import time
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.raw_json import RawJSONField
+
+
+class ParsedSchema(Schema):
+    id = fields.Integer()
+    document = fields.Raw()
+
+
+class SplicedSchema(Schema):
+    id = fields.Integer()
+    document = RawJSONField()
+
+
+def main(n: int = 500, repeat: int = 20):
+    document = json.dumps(
+        {"tags": [f"tag {i}" for i in range(20)], "scores": [i / 7 for i in range(50)]},
+        separators=(",", ":"),
+    )
+    cache = [{"id": i, "document": document} for i in range(n)]
+    app = Flask(__name__)
+
+    @app.route("/parsed")
+    @responds(schema=ParsedSchema(many=True))
+    def parsed():
+        return [{"id": row["id"], "document": json.loads(row["document"])} for row in cache]
+
+    @app.route("/spliced")
+    @responds(schema=SplicedSchema(many=True), raw_json=True)
+    def spliced():
+        return cache
+
+    client = app.test_client()
+    for label, url in (("parsed", "/parsed"), ("spliced", "/spliced")):
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            size = len(client.get(url).data)
+        seconds = (time.perf_counter() - start) / repeat
+        print(f"{label:>8}: {seconds * 1e3:7.2f} ms per response of {size / 2 ** 10:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare the memory held by a `many=True` body loaded into dicts against the compact row types
+of `accepts(row_type=...)`, measured with tracemalloc.
+
+    python benchmarks/bench_rows.py
+"""
+import gc
+import timeit
+import tracemalloc
+
+from marshmallow import Schema, fields
+
+from flask_accepts.rows import row_class, to_rows
+
+
+class RecordSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    email = fields.String()
+    age = fields.Integer()
+    score = fields.Float()
+    active = fields.Boolean()
+    city = fields.String()
+    country = fields.String()
+    created = fields.String()
+    rank = fields.Integer()
+
+
+def make_body(size: int):
+    return [
+        {
+            "id": i,
+            "name": f"name {i}",
+            "email": f"user{i}@example.com",
+            "age": i % 90,
+            "score": i / 7,
+            "active": i % 2 == 0,
+            "city": "Springfield",
+            "country": "US",
+            "created": "2024-01-01T00:00:00",
+            "rank": i,
+        }
+        for i in range(size)
+    ]
+
+
+def main(size: int = 20000):
+    schema = RecordSchema(many=True)
+    body = make_body(size)
+
+    for row_type in (None, "slots", "namedtuple"):
+        gc.collect()
+        tracemalloc.start()
+        rows = schema.load(body)
+        if row_type:
+            to_rows(rows, row_class(schema, row_type))
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del rows
+
+        elapsed = min(
+            timeit.repeat(
+                lambda: to_rows(schema.load(body), row_class(schema, row_type))
+                if row_type
+                else schema.load(body),
+                number=1,
+                repeat=3,
+            )
+        )
+        print(
+            f"{row_type or 'dict':>10}: {retained / size:7.0f} B/row retained, "
+            f"{peak / size:7.0f} B/row peak, {elapsed * 1e3:7.1f} ms to load {size} rows"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compare the peak memory and time of dumping a large SQLite table, materialized with `.all()`,
+with streaming it with `responds(stream=True)` and `yield_per`. The response body is read
+chunk by chunk and discarded, like a WSGI server sending it.
+
+    python benchmarks/bench_streaming.py
+"""
+import time
+import tracemalloc
+
+import sqlalchemy as sa
+from flask import Flask
+from marshmallow import Schema, fields
+from sqlalchemy import orm
+
+from flask_accepts import responds
+
+
+Base = orm.declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "row"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    value = sa.Column(sa.Float)
+    note = sa.Column(sa.String)
+
+
+class RowSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    value = fields.Float()
+    note = fields.String()
+
+
+def main(n: int = 100_000):
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    app = Flask(__name__)
+
+    with orm.Session(engine) as session:
+        rows = [{"name": f"row {i}", "value": i / 7, "note": "x" * 50} for i in range(n)]
+        session.execute(sa.insert(Row), rows)
+        del rows
+        session.commit()
+
+        @app.route("/all")
+        @responds(schema=RowSchema(many=True))
+        def everything():
+            return session.query(Row).all()
+
+        @app.route("/stream")
+        @responds(schema=RowSchema(many=True), stream=True, stream_batch_size=1000)
+        def stream():
+            return session.query(Row)
+
+        client = app.test_client()
+        for label, url in (("all", "/all"), ("stream", "/stream")):
+            session.expunge_all()
+            tracemalloc.start()
+            start = time.perf_counter()
+            response = client.get(url, buffered=False)
+            size = sum(len(chunk) for chunk in response.response)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            response.close()
+            print(
+                f"{label:>7}: {seconds * 1e3:7.0f} ms, peak {peak / 2 ** 20:6.1f} MiB "
+                f"for {size / 2 ** 20:.1f} MiB of JSON"
+            )
+
+
+if __name__ == "__main__":
+    main()
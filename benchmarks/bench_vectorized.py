@@ -0,0 +1,31 @@
+"""
+Compare loading a large list of floats with `fields.List` against the vectorized loading of
+`accepts(vectorize_lists=...)`. Requires NumPy.
+
+    python benchmarks/bench_vectorized.py
+"""
+import random
+import timeit
+
+from marshmallow import Schema, fields, validate
+
+from flask_accepts.vectorized import vectorize_list_fields
+
+
+class TelemetrySchema(Schema):
+    values = fields.List(fields.Float(validate=validate.Range(min=0)), required=True)
+
+
+def main(size: int = 200000, number: int = 5):
+    data = {"values": [random.random() for _ in range(size)]}
+    schemas = {"marshmallow": TelemetrySchema()}
+    for output in ("list", "array", "ndarray"):
+        schemas[f"vectorized {output}"] = vectorize_list_fields(TelemetrySchema(), output)
+
+    for name, schema in schemas.items():
+        elapsed = min(timeit.repeat(lambda: schema.load(data), number=number, repeat=3))
+        print(f"{name:>18}: {elapsed / number * 1e3:8.2f} ms per {size} floats")
+
+
+if __name__ == "__main__":
+    main()
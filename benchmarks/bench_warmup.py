@@ -0,0 +1,57 @@
+"""
+Compare the latency of the first request of a route with nested schemas, without warm-up and
+after `warm_up_all()`.
+
+    python benchmarks/bench_warmup.py
+"""
+import time
+
+from flask import Flask
+from marshmallow import Schema, fields
+
+from flask_accepts import responds, warm_up_all
+
+
+def make_schemas(prefix: str, depth: int = 4, width: int = 4):
+    # A tree of distinct nested schema classes, referenced by name like in larger apps
+    for level in reversed(range(depth)):
+        attrs = {f"value_{i}": fields.String() for i in range(width)}
+        if level < depth - 1:
+            nested = f"{prefix}Level{level + 1}Schema"
+            attrs.update({f"child_{i}": fields.Nested(nested) for i in range(width)})
+        schema = type(f"{prefix}Level{level}Schema", (Schema,), attrs)
+    return schema
+
+
+def make_object(depth: int = 4, width: int = 4):
+    obj = {f"value_{i}": "x" for i in range(width)}
+    if depth > 1:
+        obj.update({f"child_{i}": make_object(depth - 1, width) for i in range(width)})
+    return obj
+
+
+def first_request(warm: bool) -> float:
+    app = Flask(__name__)
+    schema = make_schemas("Warm" if warm else "Cold")
+    obj = make_object()
+
+    @responds(schema=schema)
+    def view():
+        return obj
+
+    if warm:
+        warm_up_all()
+    with app.test_request_context("/"):
+        start = time.perf_counter()
+        view()
+        return time.perf_counter() - start
+
+
+def main():
+    for warm in (False, True):
+        label = "warm_up_all" if warm else "cold"
+        print(f"{label:>12}: {first_request(warm) * 1e3:7.2f} ms for the first request")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,27 @@
-from .decorators import accepts, responds  # noqa
-from .utils import for_swagger  # noqa
+import importlib
+
+from .warmup import warm_up_all  # noqa
+from .preload import preload  # noqa
+
+# Imported on first use, so that `import flask_accepts` does not import flask_restx (through
+# flask_accepts.utils) or the decorators until they are needed
+_LAZY_ATTRIBUTES = {
+    "accepts": ".decorators",
+    "responds": ".decorators",
+    "endpoint": ".decorators",
+    "for_swagger": ".utils",
+}
+
+__all__ = ["accepts", "responds", "endpoint", "for_swagger", "warm_up_all", "preload"]
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
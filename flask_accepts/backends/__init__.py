@@ -0,0 +1,55 @@
+from typing import Any, List
+
+from marshmallow import RAISE
+
+
+class Backend:
+    """
+    Interface between `accepts`/`responds` and a validation/serialization library.
+
+    `bind` turns whatever the user passed as `schema` into an object with the subset of the
+    marshmallow `Schema` interface that the decorators use: `load`, `dump` and `validate`
+    (raising/returning marshmallow-style errors) plus the `many` and `ordered` attributes. A
+    marshmallow schema instance already is such an object, so the default backend adds no
+    indirection.
+    """
+
+    def handles(self, schema: Any) -> bool:
+        """Whether `schema` (a type or an instance) belongs to this backend."""
+        raise NotImplementedError
+
+    def bind(self, schema: Any, many: bool = False, unknown: str = RAISE):
+        """Return the object used to load, dump and validate data at request time."""
+        raise NotImplementedError
+
+    def for_swagger(self, schema: Any, api, model_name: str = None, operation: str = "dump"):
+        """Convert `schema` into an equivalent Flask-restx model."""
+        raise NotImplementedError
+
+
+_backends: List[Backend] = []
+
+
+def register_backend(backend: Backend):
+    """Register a backend. Backends registered later take precedence over earlier ones."""
+    _backends.insert(0, backend)
+    return backend
+
+
+def get_backend(schema: Any) -> Backend:
+    for backend in _backends:
+        if backend.handles(schema):
+            return backend
+    raise TypeError(f"No validation backend is registered for {schema!r}")
+
+
+def bind_schema(schema: Any, many: bool = False, unknown: str = RAISE):
+    """Bind a schema of any registered backend, see `Backend.bind`."""
+    return get_backend(schema).bind(schema, many=many, unknown=unknown)
+
+
+from .msgspec_backend import MsgspecBackend  # noqa: E402
+from .marshmallow_backend import MarshmallowBackend  # noqa: E402
+
+register_backend(MsgspecBackend())
+register_backend(MarshmallowBackend())
@@ -0,0 +1,23 @@
+from typing import Any
+
+from marshmallow import RAISE, Schema
+from marshmallow.schema import SchemaMeta
+
+from flask_accepts.backends import Backend
+
+
+class MarshmallowBackend(Backend):
+    """The default backend, for marshmallow `Schema` types and instances."""
+
+    def handles(self, schema: Any) -> bool:
+        return isinstance(schema, (Schema, SchemaMeta))
+
+    def bind(self, schema: Any, many: bool = False, unknown: str = RAISE) -> Schema:
+        if isinstance(schema, Schema):
+            return schema
+        return schema(many=many, unknown=unknown)
+
+    def for_swagger(self, schema: Any, api, model_name: str = None, operation: str = "dump"):
+        from flask_accepts.utils import for_swagger
+
+        return for_swagger(schema, api, model_name=model_name, operation=operation)
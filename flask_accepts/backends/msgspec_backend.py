@@ -0,0 +1,163 @@
+import re
+import sys
+from typing import Any, List
+
+from marshmallow import RAISE
+from marshmallow.exceptions import ValidationError
+from werkzeug.exceptions import BadRequest
+
+from flask_accepts.backends import Backend
+
+
+# msgspec reports the location of an error as a JSONPath, e.g. "... - at `$.items[0].name`"
+_ERROR_LOCATION = re.compile(r"^(?P<message>.*?)(?: - at `\$(?P<path>[^`]*)`)?$", re.DOTALL)
+_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]|\[\.\.\.\]")
+_MISSING_FIELD = re.compile(r"^Object missing required field `(?P<name>[^`]+)`$")
+
+
+class MsgspecSchema:
+    """
+    Wraps a `msgspec.Struct` type in the marshmallow `Schema` interface used by `accepts`
+    and `responds`.
+    """
+
+    ordered = False
+
+    def __init__(self, struct, many: bool = False, backend: "MsgspecBackend" = None):
+        import msgspec
+
+        self.struct = struct
+        self.many = many
+        self.__name__ = struct.__name__
+        self._backend = backend or MsgspecBackend()
+        self._type = List[struct] if many else struct
+        self._decoder = msgspec.json.Decoder(self._type)
+
+    def load(self, data: Any):
+        import msgspec
+
+        try:
+            return msgspec.convert(data, type=self._type, strict=False)
+        except msgspec.ValidationError as ex:
+            raise ValidationError(self._backend.format_error(ex)) from ex
+
+    def load_json(self, data: bytes):
+        """Decode and validate a raw JSON request body in a single pass."""
+        import msgspec
+
+        try:
+            return self._decoder.decode(data or b"{}")
+        except msgspec.ValidationError as ex:
+            raise ValidationError(self._backend.format_error(ex)) from ex
+        except msgspec.DecodeError as ex:
+            raise BadRequest("Failed to decode JSON object") from ex
+
+    def dump(self, obj: Any):
+        import msgspec
+
+        return msgspec.to_builtins(obj)
+
+    def validate(self, data: Any) -> dict:
+        try:
+            self.load(data)
+        except ValidationError as ex:
+            return ex.messages
+        return {}
+
+    def __repr__(self):
+        return f"<MsgspecSchema({self.struct.__name__}, many={self.many})>"
+
+
+class MsgspecBackend(Backend):
+    """Backend for `msgspec.Struct` types. msgspec is only imported once a Struct is used."""
+
+    def handles(self, schema: Any) -> bool:
+        if isinstance(schema, MsgspecSchema):
+            return True
+        msgspec = sys.modules.get("msgspec")
+        return (
+            msgspec is not None
+            and isinstance(schema, type)
+            and issubclass(schema, msgspec.Struct)
+        )
+
+    def bind(self, schema: Any, many: bool = False, unknown: str = RAISE) -> MsgspecSchema:
+        # `unknown` is not applied: unknown fields are ignored, unless the Struct is declared
+        # with `forbid_unknown_fields=True`
+        if isinstance(schema, MsgspecSchema):
+            return schema
+        return MsgspecSchema(schema, many=many, backend=self)
+
+    def format_error(self, error: Exception) -> dict:
+        """Convert a msgspec validation error into marshmallow's nested errors dict."""
+        match = _ERROR_LOCATION.match(str(error))
+        message, path = match.group("message"), match.group("path") or ""
+        keys = [
+            int(index) if index else name
+            for name, index in _PATH_PART.findall(path)
+            if name or index
+        ]
+
+        missing = _MISSING_FIELD.match(message)
+        if missing:
+            keys.append(missing.group("name"))
+            message = "Missing data for required field."
+        if not keys:
+            keys = ["_schema"]
+
+        errors = [message]
+        for key in reversed(keys):
+            errors = {key: errors}
+        return errors
+
+    def for_swagger(self, schema: Any, api, model_name: str = None, operation: str = "dump"):
+        import msgspec.inspect
+
+        struct = schema.struct if isinstance(schema, MsgspecSchema) else schema
+        info = msgspec.inspect.type_info(struct)
+        return _struct_to_model(info, api, model_name or struct.__name__)
+
+
+def _struct_to_model(info, api, model_name: str):
+    return api.model(
+        model_name,
+        {field.encode_name: _field_to_fr_field(field, api) for field in info.fields},
+    )
+
+
+def _field_to_fr_field(field, api):
+    import msgspec.inspect as mi
+
+    params = {"required": field.required}
+    if field.default is not mi.NODEFAULT and field.default is not None:
+        params["default"] = field.default
+    return _type_to_fr_field(field.type, api, **params)
+
+
+def _type_to_fr_field(type_info, api, **params):
+    import msgspec.inspect as mi
+    from flask_restx import fields as fr
+
+    # Optional[X] is documented as X
+    if isinstance(type_info, mi.UnionType):
+        types = [t for t in type_info.types if not isinstance(t, mi.NoneType)]
+        if len(types) == 1:
+            return _type_to_fr_field(types[0], api, **params)
+
+    if isinstance(type_info, mi.StructType):
+        model = _struct_to_model(type_info, api, type_info.cls.__name__)
+        return fr.Nested(model, **params)
+    if isinstance(type_info, (mi.ListType, mi.SetType, mi.FrozenSetType, mi.VarTupleType)):
+        return fr.List(_type_to_fr_field(type_info.item_type, api), **params)
+
+    simple_types = {
+        mi.BoolType: fr.Boolean,
+        mi.IntType: fr.Integer,
+        mi.FloatType: fr.Float,
+        mi.DecimalType: fr.Float,
+        mi.StrType: fr.String,
+        mi.UUIDType: fr.String,
+        mi.DateTimeType: fr.DateTime,
+        mi.DateType: fr.Date,
+    }
+    return simple_types.get(type(type_info), fr.Raw)(**params)
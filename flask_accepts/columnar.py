@@ -0,0 +1,80 @@
+"""
+Columnar output for the list responses of `responds(columnar=True)`.
+
+Rather than an array of objects, which repeats every key in every row, the rows are returned
+either as one list per column:
+
+    {"columns": ["id", "name"], "data": {"id": [1, 2], "name": ["a", "b"]}}
+
+or as one array per row:
+
+    {"columns": ["id", "name"], "data": [[1, "a"], [2, "b"]]}
+
+The client chooses the form with the `Accept` header (`COLUMNS_MEDIA_TYPE` or
+`ROWS_MEDIA_TYPE`) or the `QUERY_PARAM` query param ("columns" or "rows"), which takes
+precedence. Responses are still JSON, and the default remains the array of objects.
+"""
+from operator import itemgetter
+from typing import Iterable, List, Optional, Sequence
+
+from marshmallow import Schema
+
+
+JSON_MEDIA_TYPE = "application/json"
+COLUMNS_MEDIA_TYPE = "application/vnd.flask-accepts.columns+json"
+ROWS_MEDIA_TYPE = "application/vnd.flask-accepts.rows+json"
+QUERY_PARAM = "columnar"
+
+FORMATS = ("columns", "rows")
+_MEDIA_TYPES = {COLUMNS_MEDIA_TYPE: "columns", ROWS_MEDIA_TYPE: "rows"}
+
+
+def negotiate(req) -> Optional[str]:
+    """Return the columnar format requested, "columns" or "rows", or None for plain rows."""
+    value = req.args.get(QUERY_PARAM)
+    if value in FORMATS:
+        return value
+    if req.accept_mimetypes:
+        best = req.accept_mimetypes.best_match(
+            (JSON_MEDIA_TYPE, COLUMNS_MEDIA_TYPE, ROWS_MEDIA_TYPE), default=JSON_MEDIA_TYPE
+        )
+        return _MEDIA_TYPES.get(best)
+    return None
+
+
+def schema_columns(schema: Schema) -> List[str]:
+    """The output keys of a schema, in the order of its fields."""
+    return [field.data_key or name for name, field in schema.dump_fields.items()]
+
+
+def to_columnar(rows: Iterable[dict], columns: Sequence[str], form: str) -> dict:
+    """
+    Convert dumped rows to a columnar form.
+
+    Args:
+        rows: The dumped rows. Keys missing from a row (e.g. removed by `skip_none`) are None.
+        columns: The keys of the rows to output, in order
+        form (str): "columns" for a list of values per column, or "rows" for an array per row
+
+    Returns:
+        dict: The columnar data
+    """
+    values = _row_values(rows, columns)
+    if form == "columns":
+        data = dict(zip(columns, map(list, zip(*values)))) if values else {c: [] for c in columns}
+    else:
+        data = [list(row) for row in values]
+    return {"columns": list(columns), "data": data}
+
+
+def _row_values(rows: Iterable[dict], columns: Sequence[str]) -> List[tuple]:
+    if not columns:
+        return [() for row in rows]
+    if len(columns) == 1:
+        column = columns[0]
+        return [(row.get(column),) for row in rows]
+    getter = itemgetter(*columns)
+    try:
+        return list(map(getter, rows))
+    except KeyError:
+        return [tuple(row.get(column) for column in columns) for row in rows]
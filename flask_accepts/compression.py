@@ -0,0 +1,158 @@
+"""
+Negotiated gzip and deflate compression of the responses of `responds(compress=True)`.
+
+The body is compressed incrementally: serialized output is encoded to JSON in chunks, which
+are fed to the compressor as they are produced, so a large response is never held both
+uncompressed and compressed. Bodies smaller than the minimum size are sent uncompressed.
+Responses that already have a `Content-Encoding`, such as compressed bytes taken from a cache,
+are left unchanged.
+"""
+import json
+import zlib
+from itertools import chain
+from typing import Iterable, Iterator, Optional
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.wrappers import Response
+
+from flask_accepts import raw_json
+
+
+ENCODINGS = ("gzip", "deflate")
+# zlib wbits producing the gzip and zlib ("deflate" in HTTP) formats
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+# Size of the JSON chunks handed to the compressor
+_CHUNK_SIZE = 64 * 1024
+# Number of list items encoded at once
+_ITEMS_PER_PART = 500
+
+
+def negotiate(req) -> Optional[str]:
+    """Return the encoding to compress the response with, or None."""
+    encoding = req.accept_encodings.best_match(ENCODINGS)
+    return encoding if encoding and req.accept_encodings[encoding] else None
+
+
+def compress_chunks(chunks: Iterable[bytes], encoding: str, level: int = 6) -> Iterator[bytes]:
+    """Compress a body chunk by chunk, yielding the compressed bytes as they are produced."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compress_response(
+    response: Response, encoding: str, level: int = 6, min_size: int = 500
+) -> Response:
+    """
+    Compress the body of a response in place. Streamed bodies stay streamed.
+
+    Args:
+        response (Response): The response
+        encoding (str): "gzip" or "deflate"
+        level (int, optional): zlib compression level, from 1 (fastest) to 9 (smallest).
+            Defaults to 6.
+        min_size (int, optional): Bodies smaller than this many bytes are not compressed.
+            Defaults to 500.
+
+    Returns:
+        Response: The response
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.status_code in (204, 304)
+        or response.status_code < 200
+    ):
+        return response
+
+    if not response.is_streamed:
+        data = response.get_data()
+        if len(data) >= min_size:
+            response.set_data(b"".join(compress_chunks([data], encoding, level)))
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    # Read a streamed body up to the minimum size to decide whether to compress it
+    chunks = response.iter_encoded()
+    head, size = [], 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            break
+    else:
+        response.response = head
+        return response
+
+    response.response = compress_chunks(chain(head, chunks), encoding, level)
+    response.headers["Content-Encoding"] = encoding
+    response.headers.pop("Content-Length", None)
+    return response
+
+
+def json_encoder() -> Optional[json.JSONEncoder]:
+    """
+    An encoder with the JSON settings of the app, which splices in `RawJSON` values, or None if
+    the app pretty prints or has a custom JSON provider. It can be used outside of the app
+    context.
+    """
+    provider = current_app.json
+    if not isinstance(provider, DefaultJSONProvider):
+        return None
+    if provider.compact is False or (provider.compact is None and current_app.debug):
+        return None
+    return raw_json.json_encoder(compact=True)
+
+
+def json_response(data, status_code: int, headers=None) -> Response:
+    """A streamed JSON response, encoded in chunks with the JSON settings of the app."""
+    # The encoder is set up now, as the body is produced outside of the app context
+    encoder = json_encoder()
+    if encoder is not None:
+        body = json_chunks(_iterencode(encoder, data))
+    else:
+        # Pretty printing and custom providers encode the body in one go
+        body = [raw_json.dumps(data).encode()]
+    return current_app.response_class(
+        body, status=status_code, headers=headers, mimetype="application/json"
+    )
+
+
+def _iterencode(encoder: json.JSONEncoder, data) -> Iterator[str]:
+    """
+    Encode to JSON in parts. Only dicts and long lists are split up, so everything else goes
+    through the C encoder (which `JSONEncoder.iterencode` does not use).
+    """
+    if type(data) is dict and all(type(key) is str for key in data):
+        items = sorted(data.items()) if encoder.sort_keys else data.items()
+        separator = "{"
+        for key, value in items:
+            yield separator + encoder.encode(key) + ":"
+            yield from _iterencode(encoder, value)
+            separator = ","
+        yield "}" if separator == "," else "{}"
+    elif type(data) is list and len(data) > _ITEMS_PER_PART:
+        separator = "["
+        for start in range(0, len(data), _ITEMS_PER_PART):
+            yield separator + encoder.encode(data[start:start + _ITEMS_PER_PART])[1:-1]
+            separator = ","
+        yield "]"
+    else:
+        yield encoder.encode(data)
+
+
+def json_chunks(parts: Iterator[str]) -> Iterator[bytes]:
+    """Join the parts of a JSON document into chunks of about 64 KiB."""
+    buffer, size = [], 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= _CHUNK_SIZE:
+            yield "".join(buffer).encode()
+            buffer, size = [], 0
+    yield "".join(buffer).encode()
@@ -1 +1,2 @@
-from .decorators import accepts, responds  # noqa
+from .decorators import accepts, responds, endpoint  # noqa
+from .spec import AcceptsSpec, RespondsSpec  # noqa
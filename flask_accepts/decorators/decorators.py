@@ -1,15 +1,47 @@
 from collections import OrderedDict
-from typing import Type, Union, Dict
-from flask import jsonify
-from werkzeug.wrappers import Response
-from werkzeug.exceptions import BadRequest, InternalServerError
+from typing import TYPE_CHECKING, Callable, Type, Union, Dict
+from flask import request
+from werkzeug.exceptions import InternalServerError
 from marshmallow import Schema, EXCLUDE, RAISE
-from marshmallow.fields import List
+from marshmallow import fields as ma
 from marshmallow.exceptions import ValidationError
 
-from flask_restx.model import Model
-from flask_restx import fields, reqparse, inputs
-from flask_accepts.utils import for_swagger, get_default_model_name, is_list_field, ma_field_to_reqparse_argument
+from flask_accepts.backends import bind_schema
+from flask_accepts.decorators.spec import AcceptsSpec, RespondsSpec, Step
+from flask_accepts.json_schema import compile_validator, to_json_schema
+from flask_accepts.columnar import FORMATS, QUERY_PARAM, negotiate, schema_columns, to_columnar
+from flask_accepts import messagepack
+from flask_accepts.messagepack import is_msgpack_request, require_msgpack
+from flask_accepts.pagination import (
+    CURSOR_PARAM,
+    ITEMS_KEY,
+    LIMIT_PARAM,
+    NEXT_CURSOR_KEY,
+    key_field,
+)
+from flask_accepts.profiling import FieldProfiler, field_profiler
+from flask_accepts.raw_json import has_raw_json_fields
+from flask_accepts.rows import row_class, to_rows
+from flask_accepts.schema_cache import copy_schema
+from flask_accepts.vectorized import vectorize_list_fields
+
+# flask_restx, and flask_accepts.utils which builds its Swagger type map, are only imported
+# when reqparse arguments or Swagger documentation are needed, to keep `import` fast
+if TYPE_CHECKING:  # pragma: no cover
+    from flask_restx import reqparse
+    from flask_restx.model import Model
+
+    from flask_accepts.orm import QueryDetector
+
+
+# Request attributes used to store the parsed inputs when not passed as keyword arguments
+_REQUEST_ATTRIBUTES = {
+    "args": "parsed_args",
+    "body": "parsed_obj",
+    "query": "parsed_query_params",
+    "headers": "parsed_headers",
+    "form": "parsed_form",
+}
 
 
 def accepts(
@@ -22,6 +54,13 @@ def accepts(
     many: bool = False,
     api=None,
     use_swagger: bool = True,
+    as_kwargs: bool = False,
+    fast_validate: bool = False,
+    validate_only: bool = False,
+    vectorize_lists: str = None,
+    row_type: str = None,
+    msgpack: bool = False,
+    warm_up: Union[bool, str] = False,
 ):
     """
     Wrap a Flask route with input validation using a combination of reqparse from
@@ -48,20 +87,328 @@ def accepts(
             return a list of the corresponding schema objects when set to True. This
             flag corresopnds only to the request body schema, and not the
             `query_params_schema` or `headers_schema` arguments.
+        as_kwargs (bool, optional): If True, the parsed inputs are passed to the wrapped function
+            as the keyword arguments `args` (only when reqparse arguments were provided), `body`,
+            `query`, `headers` and `form` (each only when the corresponding schema was provided)
+            instead of being stored on the request object. Defaults to False.
+        fast_validate (bool, optional): If True, the request body is first checked by a validator
+            generated from the JSON Schema of the body `schema`, so that bodies with missing,
+            unknown or mistyped fields are rejected before marshmallow processes them. Requires a
+            marshmallow body schema. Defaults to False.
+        validate_only (bool, optional): Implies `fast_validate`, but the body is not loaded by
+            marshmallow afterwards: the decoded JSON is used as the parsed body as is, so field
+            validators, defaults and post_load hooks are not applied. Defaults to False.
+        vectorize_lists (str, optional): If set, the `List` fields of `Float`, `Integer` or
+            `Boolean` of the body `schema` are loaded in a single NumPy pass (see
+            `flask_accepts.vectorized.VectorizedList`) into a "list", an "array" (`array.array`)
+            or an "ndarray". Requires a marshmallow body schema. Defaults to None.
+        row_type (str, optional): If set, each object of a `many=True` body is loaded into a
+            generated class with `__slots__` ("slots") or a namedtuple ("namedtuple") with an
+            attribute per schema field, rather than into a dict. Requires a marshmallow body
+            schema. Defaults to None.
+        msgpack (bool, optional): If True, request bodies sent with the `application/msgpack`
+            content type are decoded as MessagePack rather than JSON. Defaults to False.
+        warm_up (bool or str, optional): If True, the nested schemas of all the schemas are
+            resolved and bound when the route is decorated rather than on the first request.
+            If "synthetic", synthetic data is also loaded and dumped with each schema (see
+            `flask_accepts.warmup`). Defaults to False.
+
+    Returns:
+        The wrapped route
+    """
+
+    spec = _compile_accepts(
+        *args,
+        model_name=model_name,
+        schema=schema,
+        query_params_schema=query_params_schema,
+        headers_schema=headers_schema,
+        form_schema=form_schema,
+        many=many,
+        api=api,
+        use_swagger=use_swagger,
+        as_kwargs=as_kwargs,
+        fast_validate=fast_validate,
+        validate_only=validate_only,
+        vectorize_lists=vectorize_lists,
+        row_type=row_type,
+        msgpack=msgpack,
+        warm_up=warm_up,
+    )
+
+    def decorator(func):
+        from functools import wraps
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            # Resolve the request proxy once rather than on every attribute access
+            req = request._get_current_object()
+            parsed = spec.parse(req)
+
+            if spec.as_kwargs:
+                return func(*args, **kwargs, **parsed)
+            _store_on_request(req, parsed)
+            return func(*args, **kwargs)
+
+        inner.__accepts_spec__ = spec
+
+        # Check if we are decorating a class method
+        return _document_accepts(spec, inner, _is_method(func))
+
+    return decorator
+
+
+def responds(
+    *args,
+    model_name: str = None,
+    schema: Union[Schema, Type[Schema]] = None,
+    alt_schemas: Dict[int, Union[Schema, Type[Schema]]] = None,
+    many: bool = False,
+    api=None,
+    envelope=None,
+    status_code: int = 200,
+    validate: bool = False,
+    description: str = None,
+    use_swagger: bool = True,
+    skip_none: bool = False,
+    columnar: bool = False,
+    msgpack: bool = False,
+    compress: bool = False,
+    compress_level: int = 6,
+    compress_min_size: int = 500,
+    head_content_length: bool = False,
+    sparse_fields_param: str = None,
+    schema_variant: Callable[[Schema], Schema] = None,
+    warm_up: Union[bool, str] = False,
+    profile_fields: Union[bool, FieldProfiler] = False,
+    query_detector: "QueryDetector" = None,
+    paginate_by: str = None,
+    page_size: int = 20,
+    max_page_size: int = 100,
+    stream: bool = False,
+    stream_batch_size: int = 1000,
+    raw_json: bool = False,
+):
+    """
+    Serialize the output of a function using the Marshmallow schema to dump the results.
+    Note that `schema` should be the type, not an instance -- the `responds` decorator
+    will internally handle creation of the schema. If the outputted value is already of
+    type flask.Response, it will be passed along without further modification.
+
+    Args:
+        schema (bool, optional): Marshmallow schema with which to serialize the output
+            of the wrapped function.
+        alt_schemas (dict, optional): Dict of alternate schemas to use based on the status_code.
+            The schemas are instantiated once and documented in Swagger under their status code.
+        many (bool, optional): (DEPRECATED) The Marshmallow schema `many` parameter, which will
+            return a list of the corresponding schema objects when set to True.
+        columnar (bool, optional): If True, clients may request the output of `many=True`
+            schemas in a columnar form, with the `Accept` header or a query param (see
+            `flask_accepts.columnar`). Defaults to False.
+        msgpack (bool, optional): If True, the response is encoded as MessagePack when the
+            `Accept` header prefers `application/msgpack` over JSON. Defaults to False.
+        compress (bool, optional): If True, the response is compressed with gzip or deflate
+            when the `Accept-Encoding` header allows it. JSON output is encoded and compressed
+            incrementally, in a streamed response. Defaults to False.
+        compress_level (int, optional): The zlib compression level, from 1 (fastest) to 9
+            (smallest). Defaults to 6.
+        compress_min_size (int, optional): Responses smaller than this many bytes are not
+            compressed. Defaults to 500.
+        head_content_length (bool, optional): Responses with a status code that has no body
+            (such as 204 and 304) and responses to HEAD requests skip serialization entirely.
+            If True, HEAD requests are serialized anyway so that the response has the actual
+            `Content-Length`, which is only worth it when serialization is cheap.
+            Defaults to False.
+        sparse_fields_param (str, optional): Name of a query param in which clients may list
+            the output fields they want, separated by commas and dotted for nested fields
+            (e.g. "fields" for `?fields=id,owner.name`). The response is then dumped by a
+            cached copy of `schema` with `only` set to those fields, and the field names are
+            available to the view as `request.sparse_fields`. Defaults to None.
+        schema_variant (callable, optional): Called on each request with the schema instance
+            about to dump the response (`schema` or one of `alt_schemas`), returning the schema
+            to use instead, e.g. a per-role variant from
+            `flask_accepts.schema_cache.derive_schema`. Defaults to None.
+        warm_up (bool or str, optional): If True, the nested schemas of `schema` and
+            `alt_schemas` are resolved and bound when the route is decorated. If "synthetic",
+            synthetic data is also loaded and dumped with each schema. Defaults to False.
+        profile_fields (bool or FieldProfiler, optional): If True, the dump time and calls of
+            each field are aggregated by `flask_accepts.profiling.field_profiler`, keyed by the
+            path of the field (e.g. `Widget.cog.cog_foo`), or by the given `FieldProfiler`.
+            The route then dumps with profiled copies of its schemas. Defaults to False.
+        query_detector (QueryDetector, optional): A `flask_accepts.orm.QueryDetector` that
+            counts the SQL statements issued by each field while the response is dumped, such
+            as lazy loads, and warns or raises when there are more than its threshold. The route
+            then dumps with instrumented copies of its schemas. Defaults to None.
+        paginate_by (str, optional): Name of the unique attribute (or dict key), dumped by a
+            field of the schema, by which to paginate the output of a `many=True` marshmallow
+            schema, with keyset pagination (see
+            `flask_accepts.pagination`). Clients pass the page size in the `limit` query param
+            and the `next_cursor` of the previous page in the `cursor` query param, and the page
+            is returned as `{"items": [...], "next_cursor": ...}` (`envelope` naming the items).
+            A SQLAlchemy query returned by the view is filtered, ordered and limited by the
+            key, and other iterables must be ordered by it already. The page requested is
+            available to the view as `request.page`. Defaults to None.
+        page_size (int, optional): Number of items of a page when the client does not pass a
+            `limit`. Defaults to 20.
+        max_page_size (int, optional): Maximum `limit` clients may pass. Defaults to 100.
+        stream (bool, optional): If True and the view returns an iterator rather than a list
+            for a `many=True` schema, such as a generator or a SQLAlchemy query or result, the
+            items are pulled, dumped and encoded to JSON in batches while the response is
+            streamed (see `flask_accepts.streaming`). Defaults to False.
+        stream_batch_size (int, optional): Number of items per batch when streaming.
+            Defaults to 1000.
+        raw_json (bool, optional): If True, `flask_accepts.raw_json.RawJSON` values in the
+            dumped output are spliced into the JSON response as-is. It is turned on for schemas
+            with a `RawJSONField`. A `RawJSON` returned as the whole result of the view is
+            always returned as-is, without being dumped. Defaults to False.
+
+    Returns:
+        The output of schema(many=many).dumps(<return value>) of the wrapped function
+    """
+    from functools import wraps
+
+    spec = _compile_responds(
+        *args,
+        model_name=model_name,
+        schema=schema,
+        alt_schemas=alt_schemas,
+        many=many,
+        api=api,
+        envelope=envelope,
+        status_code=status_code,
+        validate=validate,
+        description=description,
+        use_swagger=use_swagger,
+        skip_none=skip_none,
+        columnar=columnar,
+        msgpack=msgpack,
+        compress=compress,
+        compress_level=compress_level,
+        compress_min_size=compress_min_size,
+        head_content_length=head_content_length,
+        sparse_fields_param=sparse_fields_param,
+        schema_variant=schema_variant,
+        warm_up=warm_up,
+        profile_fields=profile_fields,
+        query_detector=query_detector,
+        paginate_by=paginate_by,
+        page_size=page_size,
+        max_page_size=max_page_size,
+        stream=stream,
+        stream_batch_size=stream_batch_size,
+        raw_json=raw_json,
+    )
+
+    def decorator(func):
+
+        # Check if we are decorating a class method
+        _IS_METHOD = _is_method(func)
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            if spec.has_request_params:
+                spec.prepare(request._get_current_object())
+            return spec.render(func(*args, **kwargs), _IS_METHOD)
+
+        inner.__responds_spec__ = spec
+
+        return _document_responds(spec, inner, _IS_METHOD)
+
+    return decorator
+
+
+def endpoint(accepts: dict = None, responds: dict = None, api=None):
+    """
+    Combine `accepts` and `responds` into a single wrapper. This is behaviorally equivalent to
+    stacking `@accepts(...)` on top of `@responds(...)`, but the route configuration is compiled
+    once and each request goes through a single wrapper with a single request context lookup.
+
+    Args:
+        accepts (dict, optional): Keyword arguments to `accepts`. Positional arguments (reqparse
+            argument dicts or the model name) may be provided as a sequence under the key "args".
+        responds (dict, optional): Keyword arguments to `responds`. Positional arguments may be
+            provided as a sequence under the key "args".
+        api (optional): Flask-restx namespace, shared by both the request and response handling
+            unless given explicitly in `accepts` or `responds`.
 
     Returns:
         The wrapped route
     """
+    from functools import wraps
+
+    accepts_spec = responds_spec = None
+    if accepts is not None:
+        accepts_kwargs = {"api": api, **accepts}
+        accepts_spec = _compile_accepts(*accepts_kwargs.pop("args", ()), **accepts_kwargs)
+    if responds is not None:
+        responds_kwargs = {"api": api, **responds}
+        responds_spec = _compile_responds(*responds_kwargs.pop("args", ()), **responds_kwargs)
+
+    def decorator(func):
+
+        # Check if we are decorating a class method
+        _IS_METHOD = _is_method(func)
+
+        @wraps(func)
+        def inner(*args, **kwargs):
+            # Resolved once, for both the accepts and the responds spec
+            req = request._get_current_object()
+            if accepts_spec:
+                parsed = accepts_spec.parse(req)
+                if accepts_spec.as_kwargs:
+                    kwargs.update(parsed)
+                else:
+                    _store_on_request(req, parsed)
+            if responds_spec and responds_spec.has_request_params:
+                responds_spec.prepare(req)
+
+            rv = func(*args, **kwargs)
+            return responds_spec.render(rv, _IS_METHOD) if responds_spec else rv
+
+        # Document in the same order as the stacked decorators would
+        if responds_spec:
+            inner.__responds_spec__ = responds_spec
+            inner = _document_responds(responds_spec, inner, _IS_METHOD)
+        if accepts_spec:
+            inner.__accepts_spec__ = accepts_spec
+            inner = _document_accepts(accepts_spec, inner, _IS_METHOD)
+        return inner
+
+    return decorator
+
+
+def _compile_accepts(
+    *args,
+    model_name: str = None,
+    schema: Union[Schema, Type[Schema], None] = None,
+    query_params_schema: Union[Schema, Type[Schema], None] = None,
+    headers_schema: Union[Schema, Type[Schema], None] = None,
+    form_schema: Union[Schema, Type[Schema], None] = None,
+    many: bool = False,
+    api=None,
+    use_swagger: bool = True,
+    as_kwargs: bool = False,
+    fast_validate: bool = False,
+    validate_only: bool = False,
+    vectorize_lists: str = None,
+    row_type: str = None,
+    msgpack: bool = False,
+    warm_up: Union[bool, str] = False,
+) -> AcceptsSpec:
+    """Build the request handling for `accepts` once, at decoration time."""
 
     _check_deprecate_many(many)
 
+    query_params = [arg for arg in args if isinstance(arg, dict)]
+
     # If an api was passed in, we need to use its parser so Swagger is aware
+    _parser = None
     if api:
         _parser = api.parser()
-    else:
-        _parser = reqparse.RequestParser(bundle_errors=True)
+    elif query_params or query_params_schema or headers_schema or form_schema:
+        from flask_restx import reqparse
 
-    query_params = [arg for arg in args if isinstance(arg, dict)]
+        _parser = reqparse.RequestParser(bundle_errors=True)
 
     for arg in args:  # check for positional string-arg, which is the model name
         if isinstance(arg, str):
@@ -72,14 +419,40 @@ def accepts(
     for qp in query_params:
         params = {**qp, "location": qp.get("location") or "values"}
         if qp["type"] == bool:
+            from flask_restx import inputs
+
             # mapping native bool is necessary so that string "false" is not truthy
             # https://flask-restx.readthedocs.io/en/stable/parsing.html#advanced-types-handling
             params["type"] = inputs.boolean
         _parser.add_argument(**params)
 
     # Handles request body schema.
+    if msgpack:
+        require_msgpack()
+
+    body_validator = body_row_class = None
     if schema:
-        schema = _get_or_create_schema(schema, many=many)
+        schema = bind_schema(schema, many=many)
+
+        if vectorize_lists:
+            if not isinstance(schema, Schema):
+                raise TypeError("vectorize_lists requires a marshmallow body schema")
+            schema = vectorize_list_fields(schema, output=vectorize_lists)
+
+        if fast_validate or validate_only:
+            if not isinstance(schema, Schema):
+                raise TypeError("fast_validate and validate_only require a marshmallow body schema")
+            body_validator = compile_validator(to_json_schema(schema))
+
+        if row_type:
+            if not isinstance(schema, Schema) or not schema.many:
+                raise TypeError("row_type requires a marshmallow body schema with many=True")
+            if validate_only:
+                raise ValueError("row_type cannot be combined with validate_only")
+            body_row_class = row_class(schema, row_type)
+
+    if query_params_schema or headers_schema or form_schema:
+        from flask_accepts.utils import ma_field_to_reqparse_argument
 
     # Handles query params schema.
     if query_params_schema:
@@ -105,130 +478,131 @@ def accepts(
             params = {**ma_field_to_reqparse_argument(field), "location": "form"}
             _parser.add_argument(field.data_key or name, **params)
 
-    def decorator(func):
-        from functools import wraps
+    steps = []
+    if _parser is not None and _parser.args:
+        # The reqparse result is only passed as a keyword argument if arguments were declared
+        steps.append(
+            Step("args", _parse_args, output=bool(query_params) or not as_kwargs, catch=(Exception,))
+        )
+    if schema:
+        # Backends that can validate the raw body skip decoding it into Python objects first
+        if validate_only:
+            load_body = _validate_body
+        elif body_row_class:
+            load_body = _load_body_rows
+        elif body_validator:
+            load_body = _validate_and_load_body
+        elif hasattr(schema, "load_json"):
+            load_body = _load_body_json
+        else:
+            load_body = _load_body
+        steps.append(Step("body", load_body, "Error parsing request body"))
+    if query_params_schema:
+        steps.append(Step("query", _load_query_params, "Error parsing query params"))
+    if headers_schema:
+        steps.append(Step("headers", _load_headers, "Error parsing headers"))
+    if form_schema:
+        steps.append(Step("form", _load_form, "Error parsing form data"))
+
+    spec = AcceptsSpec(
+        model_name=model_name,
+        api=api,
+        use_swagger=use_swagger,
+        as_kwargs=as_kwargs,
+        parser=_parser,
+        schema=schema,
+        query_params_schema=query_params_schema,
+        headers_schema=headers_schema,
+        form_schema=form_schema,
+        body_validator=body_validator,
+        body_row_class=body_row_class,
+        msgpack=msgpack,
+        steps=tuple(steps),
+    )
+    if warm_up:
+        spec.warm_up(synthetic=warm_up == "synthetic")
+    return spec
 
-        # Check if we are decorating a class method
-        _IS_METHOD = _is_method(func)
 
-        @wraps(func)
-        def inner(*args, **kwargs):
-            from flask import request
-
-            error = schema_error = None
-
-            # Handle arguments
-            try:
-                request.parsed_args = _parser.parse_args()
-            except Exception as e:
-                error = e
-
-            # Handle Marshmallow schema for request body
-            if schema:
-                try:
-                    obj = schema.load(request.get_json(force=True) or {})
-                    request.parsed_obj = obj
-                except ValidationError as ex:
-                    schema_error = ex.messages
-                if schema_error:
-                    error = error or BadRequest(
-                        f"Error parsing request body: {schema_error}"
-                    )
-                    if hasattr(error, "data"):
-                        error.data["errors"].update(schema_error)
-                    else:
-                        error.data = {"errors": schema_error}
-
-            # Handle Marshmallow schema for query params
-            if query_params_schema:
-                request_args = _convert_multidict_values_to_schema(
-                    request.args,
-                    query_params_schema)
-
-                try:
-                    obj = query_params_schema.load(request_args)
-                    request.parsed_query_params = obj
-                except ValidationError as ex:
-                    schema_error = ex.messages
-                if schema_error:
-                    error = error or BadRequest(
-                        f"Error parsing query params: {schema_error}"
-                    )
-                    if hasattr(error, "data"):
-                        error.data["errors"].update(schema_error)
-                    else:
-                        error.data = {"errors": schema_error}
-
-            # Handle Marshmallow schema for headers
-            if headers_schema:
-                request_headers = _convert_multidict_values_to_schema(
-                    request.headers,
-                    headers_schema)
-
-                try:
-                    obj = headers_schema.load(request_headers)
-                    request.parsed_headers = obj
-                except ValidationError as ex:
-                    schema_error = ex.messages
-                if schema_error:
-                    error = error or BadRequest(
-                        f"Error parsing headers: {schema_error}"
-                    )
-                    if hasattr(error, "data"):
-                        error.data["errors"].update(schema_error)
-                    else:
-                        error.data = {"errors": schema_error}
-
-            # Handle Marshmallow schema for form data
-            if form_schema:
-                request_form = _convert_multidict_values_to_schema(
-                    request.form,
-                    form_schema)
-
-                try:
-                    obj = form_schema.load(request_form)
-                    request.parsed_form = obj
-                except ValidationError as ex:
-                    schema_error = ex.messages
-                if schema_error:
-                    error = error or BadRequest(
-                        f"Error parsing form data: {schema_error}"
-                    )
-                    if hasattr(error, "data"):
-                        error.data["errors"].update(schema_error)
-                    else:
-                        error.data = {"errors": schema_error}
-
-            # If any parsing produced an error, combine them and re-raise
-            if error:
-                raise error
+def _parse_args(spec: AcceptsSpec, req):
+    return spec.parser.parse_args(req=req)
 
-            return func(*args, **kwargs)
 
-        # Add Swagger
-        if api and use_swagger and _IS_METHOD:
-            if schema:
-                body = for_swagger(
-                    schema=schema,
-                    model_name=model_name or get_default_model_name(schema),
-                    api=api,
-                    operation="load",
-                )
-                if schema.many is True:
-                    body = [body]
-
-                params = {
-                    "expect": [body, _parser],
-                }
-                inner = api.doc(**params)(inner)
-            elif _parser:
-                inner = api.expect(_parser)(inner)
-        return inner
+def _get_body(spec: AcceptsSpec, req):
+    if spec.msgpack and is_msgpack_request(req):
+        return messagepack.load_body(req) or {}
+    return req.get_json(force=True) or {}
 
-    return decorator
 
+def _load_body(spec: AcceptsSpec, req):
+    return spec.schema.load(_get_body(spec, req))
 
-def responds(
+
+def _validate_body(spec: AcceptsSpec, req):
+    data = _get_body(spec, req)
+    errors = spec.body_validator(data)
+    if errors:
+        raise ValidationError(errors)
+    return data
+
+
+def _validate_and_load_body(spec: AcceptsSpec, req):
+    return spec.schema.load(_validate_body(spec, req))
+
+
+def _load_body_rows(spec: AcceptsSpec, req):
+    load_body = _validate_and_load_body if spec.body_validator else _load_body
+    return to_rows(load_body(spec, req), spec.body_row_class)
+
+
+def _load_body_json(spec: AcceptsSpec, req):
+    if spec.msgpack and is_msgpack_request(req):
+        return _load_body(spec, req)
+    return spec.schema.load_json(req.get_data())
+
+
+def _load_query_params(spec: AcceptsSpec, req):
+    schema = spec.query_params_schema
+    return schema.load(_convert_multidict_values_to_schema(req.args, schema))
+
+
+def _load_headers(spec: AcceptsSpec, req):
+    schema = spec.headers_schema
+    return schema.load(_convert_multidict_values_to_schema(req.headers, schema))
+
+
+def _load_form(spec: AcceptsSpec, req):
+    schema = spec.form_schema
+    return schema.load(_convert_multidict_values_to_schema(req.form, schema))
+
+
+def _document_accepts(spec: AcceptsSpec, inner, is_method: bool):
+    api = spec.api
+    schema = spec.schema
+    # Add Swagger
+    if api and spec.use_swagger and is_method:
+        from flask_accepts.utils import for_swagger, get_default_model_name
+
+        if schema:
+            body = for_swagger(
+                schema=schema,
+                model_name=spec.model_name or get_default_model_name(schema),
+                api=api,
+                operation="load",
+            )
+            if schema.many is True:
+                body = [body]
+
+            params = {
+                "expect": [body, spec.parser],
+            }
+            inner = api.doc(**params)(inner)
+        elif spec.parser:
+            inner = api.expect(spec.parser)(inner)
+    return inner
+
+
+def _compile_responds(
     *args,
     model_name: str = None,
     schema: Union[Schema, Type[Schema]] = None,
@@ -241,36 +615,38 @@ def responds(
     description: str = None,
     use_swagger: bool = True,
     skip_none: bool = False,
-):
-    """
-    Serialize the output of a function using the Marshmallow schema to dump the results.
-    Note that `schema` should be the type, not an instance -- the `responds` decorator
-    will internally handle creation of the schema. If the outputted value is already of
-    type flask.Response, it will be passed along without further modification.
-
-    Args:
-        schema (bool, optional): Marshmallow schema with which to serialize the output
-            of the wrapped function.
-        alt_schemas (dict, optional): Dict of alternate schemas to use based on the status_code
-        many (bool, optional): (DEPRECATED) The Marshmallow schema `many` parameter, which will
-            return a list of the corresponding schema objects when set to True.
-
-    Returns:
-        The output of schema(many=many).dumps(<return value>) of the wrapped function
-    """
-    from functools import wraps
-
-    from flask_restx import reqparse
-
+    columnar: bool = False,
+    msgpack: bool = False,
+    compress: bool = False,
+    compress_level: int = 6,
+    compress_min_size: int = 500,
+    head_content_length: bool = False,
+    sparse_fields_param: str = None,
+    schema_variant: Callable[[Schema], Schema] = None,
+    warm_up: Union[bool, str] = False,
+    profile_fields: Union[bool, FieldProfiler] = False,
+    query_detector: "QueryDetector" = None,
+    paginate_by: str = None,
+    page_size: int = 20,
+    max_page_size: int = 100,
+    stream: bool = False,
+    stream_batch_size: int = 1000,
+    raw_json: bool = False,
+) -> RespondsSpec:
+    """Build the response handling for `responds` once, at decoration time."""
     _check_deprecate_many(many)
 
-    # If an api was passed in, we need to use its parser so Swagger is aware
+    query_params = [arg for arg in args if isinstance(arg, dict)]
+
+    # If an api was passed in, we need to use its parser so Swagger is aware. Without a schema,
+    # the output is marshalled with a model built from the parser.
+    _parser = None
     if api:
         _parser = api.parser()
-    else:
-        _parser = reqparse.RequestParser(bundle_errors=True)
+    elif query_params or not schema:
+        from flask_restx import reqparse
 
-    query_params = [arg for arg in args if isinstance(arg, dict)]
+        _parser = reqparse.RequestParser(bundle_errors=True)
 
     for arg in args:  # check for positional string-arg, which is the model name
         if isinstance(arg, str):
@@ -279,111 +655,395 @@ def responds(
     for qp in query_params:
         _parser.add_argument(**qp, location="values")
 
+    if msgpack:
+        require_msgpack()
+
     ordered = None
     if schema:
-        schema = _get_or_create_schema(schema, many=many)
+        schema = bind_schema(schema, many=many)
         ordered = schema.ordered
 
-    model_name = model_name or get_default_model_name(schema)
-    model_from_parser = _model_from_parser(model_name=model_name, parser=_parser)
+    if sparse_fields_param and not isinstance(schema, Schema):
+        raise TypeError("sparse_fields_param requires a marshmallow schema")
+    paginate_field = None
+    if paginate_by:
+        if not isinstance(schema, Schema) or not schema.many:
+            raise TypeError("paginate_by requires a marshmallow schema with many=True")
+        # Reads and writes the key in cursors
+        paginate_field = key_field(schema, paginate_by)
+    if stream and (columnar or paginate_by):
+        raise ValueError("stream cannot be combined with columnar or paginate_by")
+
+    # Instantiate the alternate schemas once, keyed by status code for the lookup in `render`
+    alt_schemas = {
+        code: bind_schema(alt_schema)
+        for code, alt_schema in (alt_schemas or {}).items()
+    }
+    if columnar and not all(isinstance(s, Schema) for s in (schema, *alt_schemas.values()) if s):
+        raise TypeError("columnar requires marshmallow schemas")
 
-    def decorator(func):
+    # RawJSON values dumped by RawJSONFields cannot be encoded otherwise
+    raw_json = raw_json or any(
+        has_raw_json_fields(s) for s in (schema, *alt_schemas.values()) if s is not None
+    )
 
-        # Check if we are decorating a class method
-        _IS_METHOD = _is_method(func)
+    profiler = None
+    if profile_fields:
+        profiler = field_profiler if profile_fields is True else profile_fields
+    if profiler or query_detector:
+        if not all(isinstance(s, Schema) for s in (schema, *alt_schemas.values()) if s):
+            raise TypeError("profile_fields and query_detector require marshmallow schemas")
+        # Instrument copies, so that schema instances shared with other routes are not profiled
+        if schema:
+            schema = _instrument(copy_schema(schema), profiler, query_detector)
+        alt_schemas = {
+            code: _instrument(copy_schema(alt_schema), profiler, query_detector)
+            for code, alt_schema in alt_schemas.items()
+        }
+
+    skip_none_in_place = frozenset()
+
+    model_from_parser = None
+    if _parser is not None:
+        from flask_accepts.utils import get_default_model_name
+
+        model_name = model_name or get_default_model_name(schema)
+        model_from_parser = _model_from_parser(model_name=model_name, parser=_parser)
+
+    steps = [Step("dump", _dump)]
+    if validate:
+        steps.append(Step("validate", _validate))
+    if schema or alt_schemas:
+        steps.append(Step("mask", _mask))
+    if envelope:
+        steps.append(Step("envelope", _envelope))
+    if skip_none:
+        steps.append(Step("skip_none", _skip_none))
+        # Decide once whether the output of each schema can be cleaned up in place
+        skip_none_in_place = frozenset(
+            id(s)
+            for s in (schema, *alt_schemas.values())
+            if s is not None and _dumps_fresh_containers(s)
+        )
+    columns = {}
+    if columnar:
+        # Runs last, since skip_none would remove the None values of the columns
+        steps.append(Step("columnar", _columnar))
+        columns = {
+            id(s): schema_columns(s)
+            for s in (schema, *alt_schemas.values())
+            if s is not None and s.many
+        }
+
+    spec = RespondsSpec(
+        model_name=model_name,
+        api=api,
+        use_swagger=use_swagger,
+        description=description,
+        parser=_parser,
+        model_from_parser=model_from_parser,
+        schema=schema,
+        alt_schemas=alt_schemas,
+        status_code=status_code,
+        envelope=envelope,
+        ordered=ordered,
+        skip_none_in_place=skip_none_in_place,
+        columnar=columnar,
+        columns=columns,
+        msgpack=msgpack,
+        compress=compress,
+        compress_level=compress_level,
+        compress_min_size=compress_min_size,
+        headers=_vary_headers(columnar or msgpack, compress),
+        head_content_length=head_content_length,
+        sparse_fields_param=sparse_fields_param,
+        schema_variant=schema_variant,
+        profiler=profiler,
+        query_detector=query_detector,
+        paginate_by=paginate_by,
+        paginate_field=paginate_field,
+        page_size=page_size,
+        max_page_size=max_page_size,
+        stream_batch_size=stream_batch_size if stream else 0,
+        # The envelope is written around the streamed items
+        stream_steps=tuple(step for step in steps if step.name != "envelope"),
+        raw_json=raw_json,
+        steps=tuple(steps),
+    )
+    if warm_up:
+        spec.warm_up(synthetic=warm_up == "synthetic")
+    return spec
 
-        @wraps(func)
-        def inner(*args, **kwargs):
-            nonlocal  schema
-            nonlocal status_code
 
-            rv = func(*args, **kwargs)
+def _instrument(schema: Schema, *profilers) -> Schema:
+    for profiler in profilers:
+        if profiler is not None:
+            profiler.instrument(schema)
+    return schema
+
+
+def _dump(spec: RespondsSpec, schema: Schema, rv):
+    if schema:
+        return schema.dump(rv)
+
+    from flask_restx import marshal
+
+    return marshal(rv, spec.model_from_parser)
+
+
+def _validate(spec: RespondsSpec, schema: Schema, serialized):
+    # Validate data if asked to (throws)
+    if schema:
+        errs = schema.validate(serialized)
+        if errs:
+            raise InternalServerError(
+                description="Server attempted to return invalid data"
+            )
+    return serialized
+
+
+def _mask(spec: RespondsSpec, schema: Schema, serialized):
+    # Apply the flask-restx mask after validation
+    return _apply_restx_mask(serialized) if schema else serialized
+
+
+def _envelope(spec: RespondsSpec, schema: Schema, serialized):
+    envelope = spec.envelope
+    return OrderedDict([(envelope, serialized)]) if spec.ordered else {envelope: serialized}
+
+
+def _skip_none(spec: RespondsSpec, schema: Schema, serialized):
+    return _remove_none(serialized, in_place=id(schema) in spec.skip_none_in_place)
+
+
+def _vary_headers(accept: bool, accept_encoding: bool):
+    vary = [name for name, used in (("Accept", accept), ("Accept-Encoding", accept_encoding)) if used]
+    return {"Vary": ", ".join(vary)} if vary else None
+
+
+def _columnar(spec: RespondsSpec, schema: Schema, serialized):
+    form = getattr(schema, "many", False) and negotiate(request)
+    if not form:
+        return serialized
+    # Schemas derived per request (e.g. for sparse fieldsets) have their own columns
+    columns = spec.columns.get(id(schema)) or schema_columns(schema)
+    if spec.envelope:
+        # The envelope was created by the previous step, so it can be updated
+        serialized[spec.envelope] = to_columnar(serialized[spec.envelope], columns, form)
+        return serialized
+    return to_columnar(serialized, columns, form)
 
-            # If a Flask response has been made already, it is passed through unchanged
-            if isinstance(rv, Response):
-                return rv
-
-            resp_schema = schema
-            # allow overriding the status code passed to Flask
-            if isinstance(rv, tuple):
-                rv, status_code = rv
-                if alt_schemas and status_code in alt_schemas:
-                    # override the default response schema
-                    resp_schema = _get_or_create_schema(alt_schemas[status_code])
-
-            if resp_schema:
-                serialized = resp_schema.dump(rv)
-
-                # Validate data if asked to (throws)
-                if validate:
-                    errs = resp_schema.validate(serialized)
-                    if errs:
-                        raise InternalServerError(
-                            description="Server attempted to return invalid data"
-                        )
-
-                # Apply the flask-restx mask after validation
-                serialized = _apply_restx_mask(serialized)
+
+def _remove_none(obj, in_place: bool = False):
+    """
+    Remove None values (and None keys) from the nested dicts and lists of `obj`. This walks the
+    structure with an explicit stack, so deeply nested output cannot hit the recursion limit.
+
+    When `in_place` is True, the containers are modified directly instead of being rebuilt. This
+    is only safe when every container was freshly created by the dump, see `_dumps_fresh_containers`.
+    """
+    if not isinstance(obj, (dict, list)):
+        return obj
+
+    if in_place:
+        stack = [obj]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                dropped = []
+                for key, value in node.items():
+                    if value is None or key is None:
+                        dropped.append(key)
+                    elif isinstance(value, (dict, list)):
+                        stack.append(value)
+                for key in dropped:
+                    del node[key]
             else:
-                from flask_restx import marshal
-
-                serialized = marshal(rv, model_from_parser)
-
-            if envelope:
-                serialized = OrderedDict([(envelope, serialized)]) if ordered else {envelope: serialized}
-
-            if skip_none:
-                def remove_none(obj):
-                    if isinstance(obj, list):
-                        return [remove_none(entry) for entry in obj if entry is not None]
-                    if isinstance(obj, dict):
-                        result = {}
-                        for key, value in obj.items():
-                            value = remove_none(value)
-                            if key is not None and value is not None:
-                                result[key] = value
-                        return result
-                    return obj
-
-                serialized = remove_none(serialized)
-
-            if not _is_method(func):
-                # Regular route, need to manually create Response
-                return jsonify(serialized), status_code
-            return serialized, status_code
-
-        nonlocal schema
-        # Add Swagger
-        if api and use_swagger and _IS_METHOD:
-            if schema:
-                api_model = for_swagger(
-                    schema=schema, model_name=model_name, api=api, operation="dump"
-                )
-                if schema.many is True:
-                    api_model = [api_model]
-
-                inner = _document_like_marshal_with(
-                    api_model, status_code=status_code, description=description,
-                )(inner)
-
-            elif _parser:
-                api.add_model(model_name, model_from_parser)
-                inner = _document_like_marshal_with(
-                    model_from_parser, status_code=status_code, description=description
-                )(inner)
+                has_none = False
+                for value in node:
+                    if value is None:
+                        has_none = True
+                    elif isinstance(value, (dict, list)):
+                        stack.append(value)
+                if has_none:
+                    node[:] = [value for value in node if value is not None]
+        return obj
+
+    result = {} if isinstance(obj, dict) else []
+    stack = [(obj, result)]
+    while stack:
+        source, target = stack.pop()
+        is_dict = isinstance(source, dict)
+        for key, value in source.items() if is_dict else enumerate(source):
+            if value is None or (is_dict and key is None):
+                continue
+            if isinstance(value, (dict, list)):
+                child = {} if isinstance(value, dict) else []
+                stack.append((value, child))
+                value = child
+            if is_dict:
+                target[key] = value
+            else:
+                target.append(value)
+    return result
 
-        return inner
 
-    return decorator
+# Fields whose dumped value is never a container shared with the dumped object
+_SCALAR_FIELDS = (
+    ma.String,
+    ma.Number,
+    ma.Boolean,
+    ma.DateTime,
+    ma.TimeDelta,
+    ma.Tuple,
+    *(getattr(ma, name) for name in ("Enum", "IP", "IPInterface") if hasattr(ma, name)),
+)
+
+
+def _dumps_fresh_containers(schema: Schema, _seen: set = None) -> bool:
+    """
+    Check whether every dict and list in the output of `schema.dump` is created by the dump
+    itself. Fields such as Raw, Dict, Method or Function, and post_dump hooks, may return
+    containers owned by the caller, which must not be modified in place.
+    """
+    if not isinstance(schema, Schema):
+        # Only the fields of marshmallow schemas can be inspected
+        return False
+    if _has_post_dump(schema):
+        return False
+
+    _seen = set() if _seen is None else _seen
+    if id(schema) in _seen:
+        return True
+    _seen.add(id(schema))
+
+    for field in schema.dump_fields.values():
+        while isinstance(field, ma.List):
+            field = field.inner
+        if isinstance(field, ma.Nested):
+            if not _dumps_fresh_containers(field.schema, _seen):
+                return False
+        elif not isinstance(field, _SCALAR_FIELDS):
+            return False
+    return True
+
+
+def _has_post_dump(schema: Schema) -> bool:
+    # Hooks are keyed by "post_dump", or by ("post_dump", pass_many) before marshmallow 3.13
+    return any(
+        hooks and (tag == "post_dump" or isinstance(tag, tuple) and tag[0] == "post_dump")
+        for tag, hooks in schema._hooks.items()
+    )
+
+
+def _document_responds(spec: RespondsSpec, inner, is_method: bool):
+    api = spec.api
+    schema = spec.schema
+    # Add Swagger
+    if api and spec.use_swagger and is_method:
+        from flask_accepts.utils import for_swagger, get_default_model_name
+
+        if schema:
+            api_model = for_swagger(
+                schema=schema, model_name=spec.model_name, api=api, operation="dump"
+            )
+            if spec.paginate_by:
+                api_model = _page_model(api, spec, api_model)
+            elif schema.many is True:
+                api_model = [api_model]
+
+            inner = _document_like_marshal_with(
+                api_model, status_code=spec.status_code, description=spec.description,
+            )(inner)
+
+        elif spec.parser:
+            api.add_model(spec.model_name, spec.model_from_parser)
+            inner = _document_like_marshal_with(
+                spec.model_from_parser, status_code=spec.status_code, description=spec.description
+            )(inner)
+
+        for code, alt_schema in spec.alt_schemas.items():
+            api_model = for_swagger(
+                schema=alt_schema,
+                model_name=get_default_model_name(alt_schema),
+                api=api,
+                operation="dump",
+            )
+            if alt_schema.many is True:
+                api_model = [api_model]
+
+            inner = _document_like_marshal_with(
+                api_model, status_code=code, description=_status_description(code),
+            )(inner)
+
+        if spec.msgpack:
+            inner = api.produces(["application/json", messagepack.MEDIA_TYPE])(inner)
+        if spec.sparse_fields_param:
+            inner = api.doc(params={spec.sparse_fields_param: {
+                "in": "query",
+                "type": "string",
+                "description": "Comma separated output fields to return, dotted for nested fields",
+            }})(inner)
+        if spec.paginate_by:
+            inner = api.doc(params={
+                LIMIT_PARAM: {
+                    "in": "query",
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": spec.max_page_size,
+                    "default": spec.page_size,
+                    "description": "Number of items of the page",
+                },
+                CURSOR_PARAM: {
+                    "in": "query",
+                    "type": "string",
+                    "description": "The next_cursor of the previous page",
+                },
+            })(inner)
+        if spec.columnar:
+            inner = api.doc(params={QUERY_PARAM: {
+                "in": "query",
+                "type": "string",
+                "enum": list(FORMATS),
+                "description": "Return list responses in a columnar form",
+            }})(inner)
+    return inner
+
+
+def _page_model(api, spec: RespondsSpec, item_model):
+    from flask_restx import fields
+
+    return api.model(f"{item_model.name}Page", {
+        spec.envelope or ITEMS_KEY: fields.List(fields.Nested(item_model)),
+        NEXT_CURSOR_KEY: fields.String(description="Cursor of the next page, null on the last"),
+    })
+
+
+def _status_description(status_code: int) -> str:
+    from http import HTTPStatus
+
+    try:
+        return HTTPStatus(status_code).phrase
+    except ValueError:
+        return f"Status {status_code}"
+
+
+def _store_on_request(req, parsed: dict):
+    for key, value in parsed.items():
+        setattr(req, _REQUEST_ATTRIBUTES[key], value)
 
 
 def _apply_restx_mask(serialized):
     from flask import current_app, request
-    from flask_restx.mask import apply as apply_mask
 
     mask_header = current_app.config.get("RESTX_MASK_HEADER", "X-Fields")
     mask = request.headers.get(mask_header)
-    return apply_mask(serialized, mask) if mask else serialized
+    if not mask:
+        return serialized
+    # Only imported once a client sends a mask
+    from flask_restx.mask import apply as apply_mask
+
+    return apply_mask(serialized, mask)
 
 
 def _check_deprecate_many(many: bool = False):
@@ -409,8 +1069,9 @@ def _get_or_create_schema(
     return schema(many=many, unknown=unknown)
 
 
-def _model_from_parser(model_name: str, parser: reqparse.RequestParser) -> Model:
+def _model_from_parser(model_name: str, parser: "reqparse.RequestParser") -> "Model":
     from flask_restx import fields
+    from flask_restx.model import Model
 
     base_type_map = {
         "integer": fields.Integer,
@@ -481,6 +1142,8 @@ def _convert_multidict_values_to_schema(multidict, schema):
     given `multidict` appropriately to be parsed be loaded by `marshmallow`
     later on.
     """
+    from flask_accepts.utils import is_list_field
+
     result = {}
 
     fields = {
@@ -0,0 +1,380 @@
+import json
+import weakref
+from typing import Callable, NamedTuple, Tuple
+
+from flask import current_app, jsonify, request
+from marshmallow.exceptions import ValidationError
+from werkzeug.wrappers import Response
+
+from flask_accepts import compression, messagepack, raw_json
+from flask_accepts.errors import RequestValidationError, combine_validation_errors
+from flask_accepts.messagepack import wants_msgpack
+from flask_accepts.pagination import ITEMS_KEY, NEXT_CURSOR_KEY, parse_page, take_page
+from flask_accepts.raw_json import RawJSON
+from flask_accepts.schema_cache import derive_schema
+from flask_accepts.sparse_fields import (
+    parse_sparse_fields,
+    resolve_sparse_fields,
+    restrict_sparse_fields,
+)
+from flask_accepts.streaming import is_stream, json_stream_response
+from flask_accepts.warmup import warm_up_schema
+
+
+# Every route spec built, for `flask_accepts.warm_up_all`
+_registry = weakref.WeakSet()
+
+
+def registered_specs() -> list:
+    """The specs of all the routes decorated so far."""
+    return list(_registry)
+
+
+class Step(NamedTuple):
+    """A single stage of the per-request pipeline of a route."""
+
+    name: str
+    func: Callable
+    # Error message used when the step fails validation
+    description: str = ""
+    # Whether the result of the step is handed to the view
+    output: bool = True
+    # Exceptions (besides ValidationError) that are collected instead of raised
+    catch: Tuple[type, ...] = ()
+
+
+class _RouteSpec:
+    """
+    Immutable per-route configuration. The decorators build one of these at decoration time,
+    including the tuple of `steps` that actually apply to the route, so nothing is re-checked
+    on each request.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            object.__setattr__(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(f"Unexpected {type(self).__name__} options: {sorted(kwargs)}")
+        _registry.add(self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def step_names(self) -> Tuple[str, ...]:
+        return tuple(step.name for step in self.steps)
+
+    @property
+    def schemas(self) -> Tuple:
+        """All the schema instances used by the route."""
+        raise NotImplementedError
+
+    def warm_up(self, synthetic: bool = False):
+        """Resolve the nested schemas of the route ahead of the first request."""
+        for schema in self.schemas:
+            warm_up_schema(schema, synthetic=synthetic)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(steps={self.step_names})>"
+
+
+class AcceptsSpec(_RouteSpec):
+    """Route configuration built by `accepts`, available on the view as `__accepts_spec__`."""
+
+    __slots__ = (
+        "model_name",
+        "api",
+        "use_swagger",
+        "as_kwargs",
+        "parser",
+        "schema",
+        "query_params_schema",
+        "headers_schema",
+        "form_schema",
+        # Generated pre-check of the request body, when `fast_validate` or `validate_only` is set
+        "body_validator",
+        # Generated row type of a many=True body, when `row_type` is set
+        "body_row_class",
+        # Whether MessagePack request bodies are accepted
+        "msgpack",
+        "steps",
+    )
+
+    @property
+    def schemas(self) -> Tuple:
+        schemas = (self.schema, self.query_params_schema, self.headers_schema, self.form_schema)
+        return tuple(schema for schema in schemas if schema is not None)
+
+    def _empty_args(self):
+        if self.parser is not None:
+            return self.parser.result_class()
+        # Routes without reqparse arguments do not build a parser, to not import flask_restx
+        from flask_restx.reqparse import ParseResult
+
+        return ParseResult()
+
+    def parse(self, req) -> dict:
+        """
+        Run the request steps, returning the parsed inputs keyed by their keyword argument name.
+        Validation errors from every step are combined into a single error which is raised.
+        """
+        parsed = {} if self.as_kwargs else {"args": self._empty_args()}
+        error = errors = description = None
+
+        for step in self.steps:
+            try:
+                value = step.func(self, req)
+            except ValidationError as ex:
+                if errors is None:
+                    errors = {}
+                    description = step.description
+                errors.update(ex.messages)
+            except step.catch as ex:
+                error = error or ex
+            else:
+                if step.output:
+                    parsed[step.name] = value
+
+        # If any parsing produced an error, combine them and re-raise
+        if error or errors:
+            raise combine_validation_errors(error, description, errors)
+
+        return parsed
+
+
+class RespondsSpec(_RouteSpec):
+    """Route configuration built by `responds`, available on the view as `__responds_spec__`."""
+
+    __slots__ = (
+        "model_name",
+        "api",
+        "use_swagger",
+        "description",
+        "parser",
+        "model_from_parser",
+        "schema",
+        # Alternate schema instances keyed by status code
+        "alt_schemas",
+        "status_code",
+        "envelope",
+        "ordered",
+        # ids of the schemas whose dumped output `skip_none` may modify in place
+        "skip_none_in_place",
+        "columnar",
+        # Output keys of the many=True schemas, by schema id, for columnar responses
+        "columns",
+        # Whether MessagePack responses are returned to clients asking for them
+        "msgpack",
+        # Encoding negotiation: whether to compress, the zlib level and the minimum body size
+        "compress",
+        "compress_level",
+        "compress_min_size",
+        # Headers added to every response, e.g. Vary when the response is negotiated
+        "headers",
+        # Whether HEAD requests are serialized in full, to send the actual Content-Length
+        "head_content_length",
+        # Query param listing the fields of a sparse fieldset
+        "sparse_fields_param",
+        # Callable choosing the schema instance to dump with on each request
+        "schema_variant",
+        # FieldProfiler aggregating the dump time of each field, or None
+        "profiler",
+        # QueryDetector counting the SQL statements issued by each field, or None
+        "query_detector",
+        # Keyset pagination: the key attribute and its field, and the default and maximum
+        # page sizes
+        "paginate_by",
+        "paginate_field",
+        "page_size",
+        "max_page_size",
+        # Number of items dumped at a time when streaming iterators, 0 to not stream them
+        "stream_batch_size",
+        # The steps run on each batch of a streamed response
+        "stream_steps",
+        # Whether the output may contain RawJSON values, to splice into the JSON response
+        "raw_json",
+        "steps",
+    )
+
+    @property
+    def schemas(self) -> Tuple:
+        schemas = (self.schema, *self.alt_schemas.values())
+        return tuple(schema for schema in schemas if schema is not None)
+
+    @property
+    def has_request_params(self) -> bool:
+        """Whether `prepare` must parse query params before the view is called."""
+        return bool(self.sparse_fields_param or self.paginate_by)
+
+    def prepare(self, req):
+        """
+        Parse the query params of the response before the view is called: the sparse fieldset
+        requested into `req.sparse_fields` (None when all fields are requested), and the page
+        requested into `req.page`.
+        """
+        if self.paginate_by:
+            try:
+                req.page = parse_page(
+                    req.args, self.page_size, self.max_page_size, self.paginate_field
+                )
+            except ValueError as ex:
+                raise RequestValidationError("Invalid pagination params", ex.args[0]) from ex
+
+        if not self.sparse_fields_param:
+            return
+        value = req.args.get(self.sparse_fields_param)
+        req.sparse_fields = None
+        if value is None:
+            return
+        try:
+            req.sparse_fields = resolve_sparse_fields(self.schema, parse_sparse_fields(value))
+        except ValueError as ex:
+            raise RequestValidationError(
+                "Invalid sparse fieldset", {self.sparse_fields_param: [str(ex)]}
+            ) from ex
+
+    def render(self, rv, is_method: bool):
+        """Serialize the return value of a view by running the response steps."""
+        # If a Flask response has been made already, it is passed through (only compressed)
+        if isinstance(rv, Response):
+            return self._compress(rv, compression.negotiate(request)) if self.compress else rv
+
+        schema = self.schema
+        status_code = self.status_code
+        # allow overriding the status code passed to Flask
+        if isinstance(rv, tuple):
+            rv, status_code = rv
+            # override the default response schema
+            schema = self.alt_schemas.get(status_code, schema)
+
+        # Skip serialization when the body would be discarded anyway
+        if _is_bodyless(status_code) or (
+            request.method == "HEAD" and not self.head_content_length
+        ):
+            response = current_app.response_class(
+                status=status_code, headers=self.headers, mimetype="application/json"
+            )
+            # The length of the body that was not serialized is unknown, rather than 0
+            response.automatically_set_content_length = False
+            return response
+
+        # Pre-serialized JSON is returned as-is
+        if isinstance(rv, RawJSON):
+            return self._raw_response(rv, status_code)
+
+        sparse = self.sparse_fields_param and schema is self.schema
+        paginated = self.paginate_by and schema is self.schema
+        if paginated:
+            rv, next_cursor = take_page(
+                rv, self.paginate_by, request.page, self.paginate_field
+            )
+        if self.schema_variant and schema is not None:
+            schema = self.schema_variant(schema)
+        if sparse and request.sparse_fields is not None:
+            only = request.sparse_fields
+            if schema is not self.schema:
+                # The fieldset was resolved against the base schema, a variant may hide fields
+                only = restrict_sparse_fields(schema, only)
+            schema = derive_schema(schema, only=only)
+        if self.profiler is not None:
+            schema = self.profiler.instrument(schema)
+
+        if (
+            self.stream_batch_size
+            and getattr(schema, "many", False)
+            and is_stream(rv)
+            and not (self.msgpack and wants_msgpack(request))
+        ):
+            response = self._stream(schema, rv, status_code)
+            if self.compress:
+                response = self._compress(response, compression.negotiate(request))
+            return response
+
+        if self.query_detector is not None:
+            schema = self.query_detector.instrument(schema)
+            with self.query_detector.check():
+                for step in self.steps:
+                    rv = step.func(self, schema, rv)
+        else:
+            for step in self.steps:
+                rv = step.func(self, schema, rv)
+
+        if paginated:
+            if self.envelope:
+                # The envelope was created by a step, so it can be updated
+                rv[NEXT_CURSOR_KEY] = next_cursor
+            else:
+                rv = {ITEMS_KEY: rv, NEXT_CURSOR_KEY: next_cursor}
+
+        encoding = self.compress and compression.negotiate(request)
+        if self.msgpack and wants_msgpack(request):
+            response = messagepack.make_response(rv, status_code, self.headers)
+            return self._compress(response, encoding) if encoding else response
+        if encoding:
+            # Encode to JSON incrementally, feeding the compressor as the chunks are produced
+            return self._compress(compression.json_response(rv, status_code, self.headers), encoding)
+
+        if self.raw_json:
+            return current_app.response_class(
+                raw_json.dumps(rv),
+                status=status_code,
+                headers=self.headers,
+                mimetype="application/json",
+            )
+
+        if not is_method:
+            # Regular route, need to manually create Response
+            rv = jsonify(rv)
+        if self.headers:
+            return rv, status_code, self.headers
+        return rv, status_code
+
+    def _raw_response(self, rv: RawJSON, status_code: int) -> Response:
+        body = bytes(rv)
+        if self.envelope:
+            body = b"{%s:%s}" % (json.dumps(self.envelope).encode(), body)
+        response = current_app.response_class(
+            body, status=status_code, headers=self.headers, mimetype="application/json"
+        )
+        if self.compress:
+            response = self._compress(response, compression.negotiate(request))
+        return response
+
+    def _stream(self, schema, rv, status_code: int) -> Response:
+        detector = self.query_detector
+        if detector is not None:
+            schema = detector.instrument(schema)
+
+        def dump(batch):
+            if detector is not None:
+                # The threshold applies to each batch
+                with detector.check():
+                    return run_steps(batch)
+            return run_steps(batch)
+
+        def run_steps(batch):
+            for step in self.stream_steps:
+                batch = step.func(self, schema, batch)
+            return batch
+
+        return json_stream_response(
+            rv, dump, self.stream_batch_size, status_code, self.headers, envelope=self.envelope
+        )
+
+    def _compress(self, response: Response, encoding) -> Response:
+        if not encoding:
+            response.vary.add("Accept-Encoding")
+            return response
+        return compression.compress_response(
+            response, encoding, level=self.compress_level, min_size=self.compress_min_size
+        )
+
+
+def _is_bodyless(status_code: int) -> bool:
+    """Whether responses with the status code have no body (1xx, 204 and 304)."""
+    return status_code < 200 or status_code in (204, 304)
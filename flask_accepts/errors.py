@@ -0,0 +1,44 @@
+import json
+
+from werkzeug.exceptions import BadRequest
+
+
+class RequestValidationError(BadRequest):
+    """
+    400 error raised by `accepts` when the request fails validation. The per-location errors are
+    stored in `data["errors"]`, which is what Flask-restx returns as the response body. Outside of
+    Flask-restx, the same payload is rendered as JSON rather than as an HTML error page.
+    """
+
+    def __init__(self, description: str, errors: dict):
+        super().__init__(description)
+        self.data = {"errors": errors}
+
+    def get_body(self, environ=None, scope=None) -> str:
+        return json.dumps({"message": self.description, **self.data}, default=str)
+
+    def get_headers(self, environ=None, scope=None):
+        return [("Content-Type", "application/json")]
+
+
+def combine_validation_errors(error, description: str, errors: dict):
+    """
+    Build the error raised by `accepts` from the error raised by reqparse, if any, and the
+    errors of all schemas, which have already been merged into a single dict.
+
+    Args:
+        error (Exception, optional): The error raised when parsing the reqparse arguments
+        description (str): The description of the first location that failed schema validation
+        errors (dict, optional): The combined schema validation errors
+
+    Returns:
+        The exception to raise
+    """
+    if error is None:
+        return RequestValidationError(description, errors)
+    if errors:
+        if hasattr(error, "data"):
+            error.data["errors"].update(errors)
+        else:
+            error.data = {"errors": errors}
+    return error
@@ -0,0 +1,285 @@
+"""
+Conversion of marshmallow schemas to JSON Schema, and compilation of JSON Schema into plain
+Python validation functions.
+
+The JSON Schema produced by `to_json_schema` describes the inputs that `schema.load` can
+accept, so types that marshmallow coerces (e.g. numeric strings for an `Integer` field) are
+allowed. Error messages are taken from the marshmallow fields and attached with the
+`errorMessage` keyword (as used by ajv-errors), so that `compile_validator` reports failures
+in the same shape and with the same messages as marshmallow's `ValidationError.messages`.
+"""
+from typing import Any, Callable, Dict, List
+
+from marshmallow import RAISE, Schema
+from marshmallow import fields as ma
+
+
+# Every JSON type except null
+_NON_NULL_TYPES = ["array", "boolean", "integer", "number", "object", "string"]
+
+_STRING_FIELDS = (ma.String, ma.Email, ma.URL, ma.UUID)
+_NUMBER_FIELDS = (ma.Float, ma.Number, ma.Decimal)
+_MAPPING_FIELDS = (ma.Dict, ma.Mapping)
+
+
+def to_json_schema(schema: Schema) -> dict:
+    """
+    Convert a marshmallow schema instance to a JSON Schema of the data `schema.load` accepts.
+
+    Fields without an equivalent JSON Schema type are left unconstrained (besides `required`
+    and `allow_none`), as are schemas with `pre_load` hooks, since those may change the input
+    before marshmallow validates it. Recursive schemas are only expanded once. Fields left out
+    by `schema.partial` are not required, with `partial` passed down to nested schemas as
+    marshmallow does.
+
+    Args:
+        schema (Marshmallow Schema): Instance of the schema to convert
+
+    Returns:
+        dict: The JSON Schema
+    """
+    node = _schema_to_json_schema(schema, schema.unknown, schema.partial, [])
+    if schema.many:
+        return {
+            "type": ["array"],
+            "items": node,
+            "errorMessage": {"type": {"_schema": [schema.error_messages["type"]]}},
+        }
+    return node
+
+
+def _schema_to_json_schema(schema: Schema, unknown: str, partial, stack: List[type]) -> dict:
+    if schema._hooks.get("pre_load") or type(schema) in stack:
+        return {}
+    stack = [*stack, type(schema)]
+
+    properties = {}
+    required = {}
+    for name, field in schema.load_fields.items():
+        key = field.data_key or name
+        properties[key] = _field_to_json_schema(field, _nested_partial(partial, name), stack)
+        if field.required and not (partial is True or (partial and name in partial)):
+            required[key] = field.error_messages["required"]
+
+    node = {
+        "type": ["object"],
+        "properties": properties,
+        "errorMessage": {"type": {"_schema": [schema.error_messages["type"]]}},
+    }
+    if required:
+        node["required"] = list(required)
+        node["errorMessage"]["required"] = required
+    if unknown == RAISE:
+        node["additionalProperties"] = False
+        node["errorMessage"]["additionalProperties"] = schema.error_messages["unknown"]
+    return node
+
+
+def _nested_partial(partial, name: str):
+    """The `partial` marshmallow loads the schema of the field `name` with."""
+    if partial is True or not partial:
+        return partial
+    prefix = name + "."
+    return [key[len(prefix):] for key in partial if key.startswith(prefix)]
+
+
+def _field_to_json_schema(field: ma.Field, partial, stack: List[type]) -> dict:
+    node = _field_type_to_json_schema(field, partial, stack)
+
+    if field.allow_none:
+        if "type" in node:
+            node["type"] = [*node["type"], "null"]
+        if "enum" in node:
+            node["enum"] = [*node["enum"], None]
+    else:
+        if "type" not in node and "enum" not in node:
+            node["type"] = list(_NON_NULL_TYPES)
+        node.setdefault("errorMessage", {})["null"] = field.error_messages["null"]
+    return node
+
+
+def _field_type_to_json_schema(field: ma.Field, partial, stack: List[type]) -> dict:
+    field_type = type(field)
+    invalid = {"errorMessage": {"type": field.error_messages.get("invalid")}}
+
+    if field_type in _STRING_FIELDS:
+        return {"type": ["string"], **invalid}
+    if field_type is ma.Integer:
+        return {"type": ["integer"] if field.strict else ["number", "string"], **invalid}
+    if field_type in _NUMBER_FIELDS:
+        return {"type": ["number", "string"], **invalid}
+    if field_type is ma.Boolean and field.truthy:
+        values = sorted(field.truthy | field.falsy, key=repr)
+        return {"enum": values, "errorMessage": {"enum": field.error_messages["invalid"]}}
+    if field_type in _MAPPING_FIELDS:
+        return {"type": ["object"], **invalid}
+    if field_type is ma.List:
+        items = _field_to_json_schema(field.inner, partial, stack)
+        return {"type": ["array"], "items": items, **invalid}
+    if field_type is ma.Nested:
+        nested = field.schema
+        # Without a partial from its parent, a nested schema keeps the one it was created with
+        if partial is None:
+            partial = nested.partial
+        node = _schema_to_json_schema(nested, field.unknown or nested.unknown, partial, stack)
+        if not node:
+            return {}
+        if field.many:
+            return {
+                "type": ["array"],
+                "items": node,
+                "errorMessage": {"type": field.error_messages["type"]},
+            }
+        return node
+    return {}
+
+
+_TYPE_CHECKS = {
+    "string": "type({v}) in (str, bytes)",
+    "integer": "type({v}) is int",
+    "number": "type({v}) in (int, float)",
+    "boolean": "type({v}) is bool",
+    "array": "type({v}) is list",
+    "object": "type({v}) is dict",
+}
+
+
+def compile_validator(json_schema: dict) -> Callable[[Any], Dict]:
+    """
+    Compile a JSON Schema into a Python function, in the style of fastjsonschema.
+
+    Supports the `type`, `enum`, `properties`, `required`, `additionalProperties` (false),
+    `items` and `errorMessage` keywords, which is what `to_json_schema` produces. Like a
+    strict marshmallow `Integer`, the `integer` type only matches `int` values (not `3.0`).
+
+    Args:
+        json_schema (dict): The JSON Schema
+
+    Returns:
+        A function that takes the decoded data and returns a dict of errors (empty when valid),
+        nested in the same way as marshmallow's `ValidationError.messages`
+    """
+    compiler = _ValidatorCompiler()
+    compiler.lines += ["def validate(data):", "    error = None"]
+    compiler.emit_check(json_schema, "data", "error", "    ")
+    compiler.lines += [
+        "    if error is None:",
+        "        return {}",
+        "    return error if type(error) is dict else {'_schema': error}",
+    ]
+    source = "\n".join(compiler.functions + compiler.lines)
+    exec(compile(source, "<flask_accepts validator>", "exec"), compiler.namespace)
+    validate = compiler.namespace["validate"]
+    validate.source = source
+    return validate
+
+
+class _ValidatorCompiler:
+    def __init__(self):
+        self.namespace = {"_missing": object()}
+        self.functions = []
+        self.lines = []
+        self._counter = 0
+
+    def name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"_{prefix}{self._counter}"
+
+    def constant(self, value) -> str:
+        name = self.name("c")
+        self.namespace[name] = value
+        return name
+
+    def emit_check(self, node: dict, var: str, target: str, indent: str):
+        """Emit statements that assign the error to `target` if `var` does not match `node`."""
+        messages = node.get("errorMessage", {})
+        type_error = _error_literal(messages.get("type", "Invalid value."))
+        branches = []
+
+        types = node.get("type")
+        null_error = _error_literal(messages["null"]) if "null" in messages else type_error
+        if types is not None:
+            branches.append((f"{var} is None", None if "null" in types else null_error))
+            types = set(types) - {"null"}
+            # Anything besides null is allowed when every other type is
+            if types and types != set(_NON_NULL_TYPES):
+                checks = " or ".join(f"({_TYPE_CHECKS[t].format(v=var)})" for t in sorted(types))
+                branches.append((f"not ({checks})", type_error))
+        elif "null" in messages:
+            branches.append((f"{var} is None", null_error))
+
+        if "enum" in node:
+            values = self.constant(frozenset(node["enum"]))
+            enum_error = _error_literal(messages.get("enum", messages.get("type", "Invalid value.")))
+            branches.append((f"type({var}) in (list, dict) or {var} not in {values}", enum_error))
+
+        child = self.emit_child_function(node)
+        if not branches and child is None:
+            return
+
+        keyword = "if"
+        for condition, error in branches:
+            self.lines.append(f"{indent}{keyword} {condition}:")
+            self.lines.append(f"{indent}    {target} = {error}" if error else f"{indent}    pass")
+            keyword = "elif"
+        if child is not None:
+            inner = indent
+            if branches:
+                self.lines.append(f"{indent}else:")
+                inner = indent + "    "
+            self.lines.append(f"{inner}_e = {child}({var})")
+            self.lines.append(f"{inner}if _e:")
+            self.lines.append(f"{inner}    {target} = _e")
+
+    def emit_child_function(self, node: dict):
+        """Emit a function validating the contents of an object or array node, if needed."""
+        if "properties" in node or node.get("additionalProperties") is False:
+            return self._emit_function(self._object_body, node)
+        if node.get("items"):
+            return self._emit_function(self._array_body, node)
+        return None
+
+    def _emit_function(self, emit_body, node: dict) -> str:
+        name = self.name("check")
+        outer, self.lines = self.lines, [f"def {name}(v):", "    errors = {}"]
+        emit_body(node)
+        self.lines.append("    return errors")
+        self.functions += self.lines + [""]
+        self.lines = outer
+        return name
+
+    def _object_body(self, node: dict):
+        messages = node.get("errorMessage", {})
+        required = messages.get("required", {})
+        for key, prop in node.get("properties", {}).items():
+            self.lines.append(f"    item = v.get({key!r}, _missing)")
+            if key in node.get("required", ()):
+                error = _error_literal(required.get(key, "Missing data for required field."))
+                self.lines.append("    if item is _missing:")
+                self.lines.append(f"        errors[{key!r}] = {error}")
+                self.lines.append("    else:")
+            else:
+                self.lines.append("    if item is not _missing:")
+            length = len(self.lines)
+            self.emit_check(prop, "item", f"errors[{key!r}]", "        ")
+            if len(self.lines) == length:
+                self.lines.append("        pass")
+
+        if node.get("additionalProperties") is False:
+            known = self.constant(frozenset(node.get("properties", {})))
+            error = _error_literal(messages.get("additionalProperties", "Unknown field."))
+            self.lines.append("    for key in v:")
+            self.lines.append(f"        if key not in {known}:")
+            self.lines.append(f"            errors[key] = {error}")
+
+    def _array_body(self, node: dict):
+        self.lines.append("    for index, item in enumerate(v):")
+        length = len(self.lines)
+        self.emit_check(node["items"], "item", "errors[index]", "        ")
+        if len(self.lines) == length:
+            self.lines.append("        pass")
+
+
+def _error_literal(message) -> str:
+    """Source code building a new error value on every evaluation."""
+    return repr(message) if isinstance(message, (dict, list)) else repr([message])
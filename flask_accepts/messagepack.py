@@ -0,0 +1,77 @@
+"""
+MessagePack request bodies and responses for `accepts(msgpack=True)` and
+`responds(msgpack=True)`.
+
+Request bodies sent with a MessagePack content type are decoded with `msgpack` instead of as
+JSON, and responses are encoded with `msgpack` when the `Accept` header prefers it over JSON.
+The schemas, and so the Swagger documentation, are the same for both formats.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from werkzeug.exceptions import BadRequest
+from werkzeug.wrappers import Response
+
+from flask_accepts.raw_json import RawJSON
+
+
+MEDIA_TYPE = "application/msgpack"
+MEDIA_TYPES = (MEDIA_TYPE, "application/x-msgpack")
+_JSON_MEDIA_TYPE = "application/json"
+
+
+def require_msgpack():
+    """Raise an ImportError at decoration time if msgpack is not installed."""
+    try:
+        import msgpack  # noqa: F401
+    except ImportError as ex:
+        raise ImportError(
+            "msgpack=True requires msgpack, install it with `pip install flask_accepts[msgpack]`"
+        ) from ex
+
+
+def is_msgpack_request(req) -> bool:
+    return req.mimetype in MEDIA_TYPES
+
+
+def wants_msgpack(req) -> bool:
+    """Whether the `Accept` header of the request prefers MessagePack over JSON."""
+    if not req.accept_mimetypes:
+        return False
+    best = req.accept_mimetypes.best_match((_JSON_MEDIA_TYPE, *MEDIA_TYPES))
+    return best in MEDIA_TYPES
+
+
+def load_body(req):
+    """Decode the MessagePack request body, like `request.get_json(force=True)` for JSON."""
+    import msgpack
+
+    try:
+        return msgpack.unpackb(req.get_data(), raw=False)
+    except (ValueError, msgpack.UnpackException) as ex:
+        raise BadRequest("Failed to decode MessagePack object") from ex
+
+
+def make_response(data, status_code: int, headers=None) -> Response:
+    import msgpack
+
+    return Response(
+        msgpack.packb(data, default=_default),
+        status=status_code,
+        headers=headers,
+        mimetype=MEDIA_TYPE,
+    )
+
+
+def _default(obj):
+    # The types that Flask's JSON provider serializes as strings
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, (decimal.Decimal, uuid.UUID)):
+        return str(obj)
+    if isinstance(obj, RawJSON):
+        # Pre-serialized JSON has to be parsed to be encoded as MessagePack
+        return json.loads(obj.data)
+    raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
@@ -0,0 +1,227 @@
+"""
+Helpers for responses dumped from SQLAlchemy objects.
+
+`QueryDetector` counts the SQL statements issued while `responds` dumps a response, which are
+usually the lazy loads of the relationships behind `Nested` and `List` fields, one per row (the
+"N+1 queries" problem). Statements are attributed to the path of the field being serialized
+(e.g. `Widget.cog`), and a warning is emitted, or an error raised, when a response issues more
+than a threshold.
+
+`eager_load_options` avoids them in the first place: it derives, from the response schema, the
+loader options that fetch the relationships and columns the schema dumps, for the view to
+apply to its query. SQLAlchemy is only imported once these helpers are used.
+"""
+import threading
+import warnings
+import weakref
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterator, List, Mapping, Optional, Union
+
+from marshmallow import Schema
+from marshmallow import fields as ma
+
+from flask_accepts.profiling import FieldProfiler
+
+
+ACTIONS = ("warn", "raise")
+
+# The open detectors, all fed by a single engine event listener registered once
+_detectors = weakref.WeakSet()
+_listener_lock = threading.Lock()
+_listening = False
+
+
+class NPlusOneWarning(UserWarning):
+    """Too many SQL statements were issued while dumping a response."""
+
+
+class NPlusOneError(Exception):
+    """Too many SQL statements were issued while dumping a response."""
+
+
+class QueryDetector(FieldProfiler):
+    """
+    A `FieldProfiler` that also counts the SQL statements issued by each field, through the
+    SQLAlchemy engine events.
+
+    Args:
+        threshold (int, optional): Maximum number of statements a response may issue while
+            it is dumped. Defaults to 10.
+        action (str, optional): "warn" to emit an `NPlusOneWarning` when a response crosses
+            the threshold, or "raise" to raise an `NPlusOneError`. Defaults to "warn".
+    """
+
+    def __init__(self, threshold: int = 10, action: str = "warn"):
+        if action not in ACTIONS:
+            raise ValueError(f"Invalid action: {action}. Options are {', '.join(ACTIONS)}.")
+        super().__init__()
+        self.threshold = threshold
+        self.action = action
+        # Per path: statements issued, across all checks
+        self._queries = {}
+        self._queries_lock = threading.Lock()
+        _listen()
+        _detectors.add(self)
+
+    def close(self):
+        """Stop counting statements. Detectors are also closed once garbage collected."""
+        _detectors.discard(self)
+
+    @contextmanager
+    def check(self) -> Iterator[Dict[str, int]]:
+        """
+        Count the statements issued by instrumented fields in this thread within the block,
+        then warn or raise if there are more than the threshold.
+
+        Yields:
+            dict: The statements issued per field path, filled in as they are executed
+        """
+        counts = {}
+        previous = getattr(self._local, "counts", None)
+        self._local.counts = counts
+        try:
+            yield counts
+        finally:
+            self._local.counts = previous
+
+        total = sum(counts.values())
+        if total > self.threshold:
+            paths = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            message = (
+                f"{total} SQL statements were issued while dumping the response (threshold "
+                f"{self.threshold}): " + ", ".join(f"{path}: {n}" for path, n in paths)
+            )
+            if self.action == "raise":
+                raise NPlusOneError(message)
+            warnings.warn(message, NPlusOneWarning, stacklevel=3)
+
+    def queries(self) -> Dict[str, int]:
+        """The statements issued per field path across all checks, the most first."""
+        with self._queries_lock:
+            items = list(self._queries.items())
+        return dict(sorted(items, key=lambda item: item[1], reverse=True))
+
+    def reset(self):
+        super().reset()
+        with self._queries_lock:
+            self._queries.clear()
+
+    def _on_execute(self):
+        counts = getattr(self._local, "counts", None)
+        path = self.current_path()
+        if counts is None or path is None:
+            return
+        counts[path] = counts.get(path, 0) + 1
+        with self._queries_lock:
+            self._queries[path] = self._queries.get(path, 0) + 1
+
+
+def _listen():
+    global _listening
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _listener_lock:
+        if not _listening:
+            event.listen(Engine, "before_cursor_execute", _on_execute)
+            _listening = True
+
+
+def _on_execute(conn, cursor, statement, parameters, context, executemany):
+    for detector in list(_detectors):
+        detector._on_execute()
+
+
+def eager_load_options(
+    model,
+    schema: Schema,
+    mask: Union[str, Mapping, None] = None,
+    load_only: bool = True,
+) -> list:
+    """
+    Derive SQLAlchemy loader options from the fields a schema dumps: `selectinload` for the
+    collections and `joinedload` for the scalar relationships behind `Nested`, `List(Nested)`
+    and `Pluck` fields, nested as deep as the schemas go, and `load_only` for the columns. Only
+    the fields of the `only` option of the schemas, and of the mask if given, are considered.
+    Columns are not restricted for schemas with `Method` or `Function` fields, or fields that are
+    not mapped attributes, since they may read any attribute.
+
+    Args:
+        model: The SQLAlchemy mapped class of the objects dumped
+        schema (Marshmallow Schema): The schema instance dumping them
+        mask (str or dict, optional): A flask-restx field mask restricting the output, e.g. the
+            value of the `X-Fields` header, as a string (`"{id,cogs{id}}"`) or parsed
+        load_only (bool, optional): Whether to add `load_only` options. Defaults to True.
+
+    Returns:
+        list: The options, for `query.options(*options)` or `select(model).options(*options)`
+    """
+    from sqlalchemy import inspect
+
+    if isinstance(mask, str):
+        from flask_restx.mask import Mask
+
+        mask = Mask(mask)
+    return _loader_options(inspect(model), schema, mask or None, load_only, frozenset())
+
+
+def _loader_options(
+    mapper, schema: Schema, mask: Optional[Mapping], load_only: bool, seen: FrozenSet[type]
+) -> List:
+    from sqlalchemy import orm
+
+    # Recursive schemas are only loaded one level deep
+    if type(schema) in seen:
+        return []
+    seen = seen | {type(schema)}
+
+    columns, options = set(), []
+    # Whether all the attributes the schema reads are known
+    complete = True
+    for name, field in schema.dump_fields.items():
+        key = field.data_key or name
+        if mask is not None and "*" not in mask and key not in mask:
+            continue
+
+        attribute = field.attribute or name
+        prop = mapper.attrs.get(attribute.split(".")[0])
+        if prop is None or "." in attribute or isinstance(field, (ma.Method, ma.Function)):
+            complete = False
+        if isinstance(prop, orm.ColumnProperty):
+            columns.add(prop.key)
+        elif isinstance(prop, orm.RelationshipProperty):
+            loader = orm.selectinload if prop.uselist else orm.joinedload
+            option = loader(getattr(mapper.class_, prop.key))
+            nested = _nested_schema(field)
+            if nested is not None and "." not in attribute:
+                nested_mask = mask.get(key) if mask is not None else None
+                nested_options = _loader_options(
+                    prop.mapper,
+                    nested,
+                    nested_mask if isinstance(nested_mask, Mapping) else None,
+                    load_only,
+                    seen,
+                )
+                if nested_options:
+                    option = option.options(*nested_options)
+            options.append(option)
+            # The columns the relationship is joined on, e.g. a foreign key
+            for column in prop.local_columns:
+                try:
+                    columns.add(mapper.get_property_by_column(column).key)
+                except orm.exc.UnmappedColumnError:
+                    pass
+        elif prop is not None:
+            complete = False
+
+    if load_only and complete and columns:
+        options.append(orm.load_only(*(getattr(mapper.class_, key) for key in sorted(columns))))
+    return options
+
+
+def _nested_schema(field: ma.Field) -> Optional[Schema]:
+    if isinstance(field, ma.List):
+        field = field.inner
+    if isinstance(field, ma.Nested) and isinstance(field.schema, Schema):
+        return field.schema
+    return None
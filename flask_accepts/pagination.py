@@ -0,0 +1,147 @@
+"""
+Keyset (cursor) pagination for `responds(paginate_by=...)`.
+
+Clients pass the page size in the `limit` query param and the `next_cursor` of the previous
+page in the `cursor` query param. The cursor is an opaque token holding the key of the last
+item of the previous page, so a page is the `limit` items following it in key order: the query
+a view returns is filtered, ordered and limited by the key, and other iterables, which must be
+ordered by the key already, are read up to the end of the page only. One more item than the
+page size is fetched to know whether there is a next page.
+
+The key must be unique: items sharing the key value of the last item of a page are skipped.
+It is written into the cursor, and read back, with its field in the response schema, so keys
+such as datetimes, UUIDs and decimals compare with the keys of the items.
+"""
+import base64
+import binascii
+import json
+from collections.abc import Mapping
+from itertools import dropwhile, islice
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+
+from marshmallow import Schema, ValidationError
+from marshmallow import fields as ma
+
+
+LIMIT_PARAM = "limit"
+CURSOR_PARAM = "cursor"
+ITEMS_KEY = "items"
+NEXT_CURSOR_KEY = "next_cursor"
+
+
+class Page(NamedTuple):
+    """The page requested, available to the view as `request.page`."""
+
+    limit: int
+    # Key of the last item of the previous page, None for the first page
+    after: Any
+
+
+def key_field(schema: Schema, key: str) -> ma.Field:
+    """
+    The field of a schema dumping the key items are paginated by, raising a ValueError if there
+    is none.
+    """
+    for name, field in schema.dump_fields.items():
+        if (field.attribute or name) == key:
+            return field
+    raise ValueError(f"paginate_by must name a field of the schema, got {key!r}")
+
+
+def encode_cursor(key: Any, field: Optional[ma.Field] = None) -> str:
+    """
+    Encode the key of an item into a cursor, serialized with its field if given, or else as a
+    JSON scalar.
+    """
+    if field is not None:
+        key = field._serialize(key, None, None)
+    # Decimal fields serialize to decimals unless as_string, they are read back from strings
+    data = json.dumps(key, default=str)
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, field: Optional[ma.Field] = None) -> Any:
+    """
+    Decode a cursor into the key of an item, deserialized with its field if given, raising a
+    ValueError if it is invalid.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return field.deserialize(key) if field is not None else key
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, ValidationError) as ex:
+        raise ValueError("Invalid cursor") from ex
+
+
+def parse_page(
+    args: Mapping, page_size: int, max_page_size: int, field: Optional[ma.Field] = None
+) -> Page:
+    """
+    Parse the page requested in the query params, with the field of the key to read the cursor.
+
+    Raises:
+        ValueError: if the limit is not an integer from 1 to `max_page_size`, or the cursor is
+            invalid. The message is a dict of error messages keyed by query param.
+    """
+    errors = {}
+    limit = args.get(LIMIT_PARAM)
+    if limit is None:
+        limit = page_size
+    else:
+        try:
+            limit = int(limit)
+            if not 1 <= limit <= max_page_size:
+                raise ValueError
+        except ValueError:
+            errors[LIMIT_PARAM] = [f"Must be an integer from 1 to {max_page_size}."]
+
+    after = args.get(CURSOR_PARAM)
+    if after is not None:
+        try:
+            after = decode_cursor(after, field)
+        except ValueError as ex:
+            errors[CURSOR_PARAM] = [str(ex)]
+
+    if errors:
+        raise ValueError(errors)
+    return Page(limit, after)
+
+
+def take_page(
+    rv: Iterable, key: str, page: Page, field: Optional[ma.Field] = None
+) -> Tuple[List, Optional[str]]:
+    """
+    Take the requested page from a SQLAlchemy query or an iterable ordered by `key`.
+
+    Args:
+        rv: The query or iterable returned by the view
+        key (str): Name of the unique attribute (or dict key) the items are ordered by
+        page (Page): The page requested
+        field (Marshmallow Field, optional): The field of the key, to write the next cursor
+
+    Returns:
+        tuple: The items of the page, and the cursor of the next page (None on the last page)
+    """
+    if _is_query(rv):
+        column = getattr(rv.column_descriptions[0]["entity"], key)
+        if page.after is not None:
+            rv = rv.filter(column > page.after)
+        items = rv.order_by(None).order_by(column).limit(page.limit + 1).all()
+    else:
+        items = iter(rv)
+        if page.after is not None:
+            items = dropwhile(lambda item: _get_key(item, key) <= page.after, items)
+        items = list(islice(items, page.limit + 1))
+
+    if len(items) <= page.limit:
+        return items, None
+    items = items[:page.limit]
+    return items, encode_cursor(_get_key(items[-1], key), field)
+
+
+def _is_query(rv) -> bool:
+    # A SQLAlchemy ORM Query, without importing SQLAlchemy
+    return all(hasattr(rv, name) for name in ("column_descriptions", "filter", "order_by", "limit"))
+
+
+def _get_key(item, key: str):
+    return item[key] if isinstance(item, Mapping) else getattr(item, key)
@@ -0,0 +1,98 @@
+"""
+Finalization of the decorated routes before a preforking server (e.g. gunicorn with
+`--preload`) starts its workers.
+
+After fork, the objects created at import time are shared copy-on-write by the workers. The
+garbage collector writes to the header of every object it tracks though, so its first pass in
+each worker copies the pages of all of them. `preload` does the one-time work that would
+otherwise happen on the first requests, then moves everything into the permanent generation
+with `gc.freeze()`, which the collector never visits.
+"""
+import gc
+import sys
+from typing import NamedTuple
+
+
+class PreloadReport(NamedTuple):
+    """What `preload` did, and an estimate of the memory each worker no longer copies."""
+
+    # Number of route specs warmed up
+    routes: int
+    # Number of restx APIs whose Swagger specification was built
+    apis: int
+    # Number of objects moved to the permanent generation
+    frozen_objects: int
+    # Combined size of the frozen objects: an upper bound of the memory saved per worker
+    frozen_bytes: int
+
+    def __str__(self):
+        return (
+            f"Preloaded {self.routes} routes and {self.apis} APIs, froze {self.frozen_objects} "
+            f"objects ({self.frozen_bytes / 2 ** 20:.1f} MiB not copied by the GC of each worker)"
+        )
+
+
+def preload(
+    app, synthetic: bool = False, freeze: bool = True, base_url: str = None
+) -> PreloadReport:
+    """
+    Finalize every route decorated with `accepts`, `responds` or `endpoint`: build the Swagger
+    specification of their restx APIs, warm up their schemas (see `flask_accepts.warm_up_all`)
+    and then freeze all objects with `gc.freeze()`. Call it in the master process, after the
+    app is created and before the workers are forked.
+
+    Args:
+        app (Flask): The app
+        synthetic (bool, optional): Whether to also load and dump synthetic data with each
+            schema. This runs the `Method` and `Function` fields in the master process, so
+            any connection they open would be shared by the workers. Defaults to False.
+        freeze (bool, optional): Whether to call `gc.freeze()`. Defaults to True.
+        base_url (str, optional): URL the app is served under (e.g.
+            "https://example.com/prefix"), as the Swagger specification is built in a
+            request context for it and cached, `basePath` included. Defaults to the root
+            URL of Flask's test request contexts, which is wrong for apps mounted under a
+            prefix or `SCRIPT_NAME`.
+
+    Returns:
+        PreloadReport: What was done. `frozen_bytes` sums the sizes of the frozen objects,
+            which bounds the memory that copy-on-write saves in each worker.
+    """
+    from flask_accepts.decorators.spec import registered_specs
+    from flask_accepts.warmup import warm_up_all
+
+    apis = _restx_apis(registered_specs(), app)
+    with app.test_request_context(base_url=base_url):
+        for api in apis:
+            # Cached by the Api, so the Swagger endpoint does not build it in each worker
+            api.__schema__
+
+    routes = warm_up_all(synthetic=synthetic)
+
+    frozen_objects = frozen_bytes = 0
+    if freeze:
+        # Collect first, so garbage is not kept alive forever in the permanent generation
+        gc.collect()
+        # Measured before freezing, as frozen objects are no longer listed by the collector
+        frozen_bytes = sum(sys.getsizeof(obj) for obj in gc.get_objects())
+        gc.freeze()
+        frozen_objects = gc.get_freeze_count()
+
+    return PreloadReport(
+        routes=routes,
+        apis=len(apis),
+        frozen_objects=frozen_objects,
+        frozen_bytes=frozen_bytes,
+    )
+
+
+def _restx_apis(specs, app) -> list:
+    from flask_restx import Api
+
+    apis = []
+    for spec in specs:
+        # A Namespace is attached to the Apis it was added to
+        for api in getattr(spec.api, "apis", None) or [spec.api]:
+            # Apis of other apps cannot be rendered in the context of this one
+            if isinstance(api, Api) and api.app in (None, app) and api not in apis:
+                apis.append(api)
+    return apis
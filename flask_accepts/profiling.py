@@ -0,0 +1,147 @@
+"""
+Per-field profiling of the dumps of `responds(profile_fields=True)`.
+
+Each field of a profiled schema is wrapped to count its calls and time its serialization,
+keyed by its path from the root schema (e.g. `Widget.cog.cog_foo`). The time of a field
+includes the fields nested within it, and its own time excludes them, so a slow
+`fields.Method` stands out from the `Nested` fields that contain it. Numbers are aggregated
+across requests until the profiler is reset.
+"""
+import threading
+from time import perf_counter
+from typing import Any, List, NamedTuple, Optional
+
+from marshmallow import Schema
+from marshmallow import fields as ma
+
+from flask_accepts.warmup import _nested_schemas
+
+
+class FieldStats(NamedTuple):
+    """The aggregated numbers of a field."""
+
+    path: str
+    calls: int
+    # Seconds spent serializing the field, including the fields nested within it
+    total: float
+    # Seconds spent serializing the field itself
+    own: float
+
+
+class FieldProfiler:
+    """Aggregates the serialization time of the fields of the schemas it instruments."""
+
+    def __init__(self):
+        # Per path: [calls, total, own]
+        self._stats = {}
+        self._lock = threading.Lock()
+        # Per thread: the fields being serialized
+        self._local = threading.local()
+
+    def instrument(self, schema: Any, path: Optional[str] = None) -> Any:
+        """
+        Wrap the fields of a schema instance in place, and those of its nested schemas as they
+        are first used. Schemas that are already instrumented and schemas of other validation
+        backends are returned unchanged.
+
+        Args:
+            schema: The schema instance
+            path (str, optional): Path of the schema. Defaults to the name of its class
+                without the "Schema" suffix.
+
+        Returns:
+            The schema
+        """
+        if not isinstance(schema, Schema) or not _claim(schema, self):
+            return schema
+
+        path = path or "".join(type(schema).__name__.rsplit("Schema", 1))
+        for name, field in schema.fields.items():
+            self._wrap(field, f"{path}.{name}")
+        return schema
+
+    def report(self, limit: Optional[int] = None) -> List[FieldStats]:
+        """The numbers of each field, the most expensive first."""
+        with self._lock:
+            stats = [FieldStats(path, *values) for path, values in self._stats.items()]
+        stats.sort(key=lambda s: s.total, reverse=True)
+        return stats[:limit]
+
+    def format(self, limit: Optional[int] = 20) -> str:
+        """The report as a text table, with times in milliseconds."""
+        lines = [f"{'calls':>10} {'total ms':>10} {'own ms':>10} {'own/call us':>12}  path"]
+        for s in self.report(limit):
+            lines.append(
+                f"{s.calls:>10} {s.total * 1e3:>10.2f} {s.own * 1e3:>10.2f} "
+                f"{s.own / s.calls * 1e6:>12.2f}  {s.path}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def current_path(self) -> Optional[str]:
+        """Path of the innermost field being serialized in this thread, if any."""
+        stack = self._stack()
+        return stack[-1][0] if stack else None
+
+    def _wrap(self, field: ma.Field, path: str):
+        # Fields can be shared, e.g. by the copies of a schema instance passed to `Nested`
+        if not _claim(field, self):
+            return
+        serialize = field.serialize
+        has_nested = isinstance(field, (ma.Nested, ma.List, ma.Tuple, ma.Dict))
+
+        def profiled_serialize(attr, obj, accessor=None, **kwargs):
+            nonlocal has_nested
+            if has_nested:
+                # Resolved on the first call, so recursive schemas are only walked as deep as
+                # the data goes
+                has_nested = False
+                for nested in _nested_schemas(field):
+                    self.instrument(nested, path)
+
+            stack = self._stack()
+            stack.append([path, 0.0])
+            start = perf_counter()
+            try:
+                return serialize(attr, obj, accessor, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                nested_time = stack.pop()[1]
+                if stack:
+                    stack[-1][1] += elapsed
+                self._record(path, elapsed, elapsed - nested_time)
+
+        field.serialize = profiled_serialize
+
+    def _stack(self) -> list:
+        # [path, time spent in nested fields] of each field being serialized
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def _record(self, path: str, total: float, own: float):
+        with self._lock:
+            stats = self._stats.get(path)
+            if stats is None:
+                self._stats[path] = [1, total, own]
+            else:
+                stats[0] += 1
+                stats[1] += total
+                stats[2] += own
+
+
+def _claim(obj, profiler: FieldProfiler) -> bool:
+    # Whether the schema or field was not instrumented by the profiler yet
+    profilers = obj.__dict__.setdefault("_field_profilers", set())
+    if profiler in profilers:
+        return False
+    profilers.add(profiler)
+    return True
+
+
+field_profiler = FieldProfiler()
@@ -0,0 +1,164 @@
+"""
+Pre-serialized JSON fragments, spliced into responses as-is.
+
+A view that already has serialized JSON, e.g. from a cache, returns it wrapped in `RawJSON`,
+either as its whole result or as a value in the objects it returns (dumped with `RawJSONField`,
+`fields.Raw` or a `Method` field). The fragment is written into the response without being
+parsed and encoded again. The fragment is trusted to be valid JSON.
+"""
+import json
+import re
+import uuid
+from typing import Any, Optional, Union
+
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+from marshmallow import Schema, class_registry
+from marshmallow import fields as ma
+from marshmallow.exceptions import RegistryError
+from marshmallow.schema import SchemaMeta
+
+
+class RawJSON:
+    """
+    A serialized JSON value.
+
+    Args:
+        data (str or bytes): The JSON text, UTF-8 encoded if bytes
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Union[str, bytes]):
+        self.data = data
+
+    @property
+    def text(self) -> str:
+        return self.data.decode() if isinstance(self.data, (bytes, bytearray)) else self.data
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.data) if isinstance(self.data, (bytes, bytearray)) else self.data.encode()
+
+    def __eq__(self, other):
+        return isinstance(other, RawJSON) and self.text == other.text
+
+    def __repr__(self):
+        return f"RawJSON({self.data!r})"
+
+
+class RawJSONField(ma.Field):
+    """
+    A field dumping pre-serialized JSON as-is. Values that are not a `RawJSON` already are
+    taken to be the JSON text (str or bytes). Loading returns the value unchanged.
+    """
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is None or isinstance(value, RawJSON):
+            return value
+        return RawJSON(value)
+
+
+def has_raw_json_fields(schema: Any) -> bool:
+    """
+    Whether a schema, or one of its nested schemas, dumps a `RawJSONField`. Nested schemas are
+    inspected without being resolved or bound, and those referenced by a name that is not
+    registered yet are skipped.
+    """
+    if not isinstance(schema, Schema):
+        return False
+
+    seen = {type(schema)}
+    # The fields, and the schema class declaring them, to resolve "self"
+    stack = [(field, type(schema)) for field in schema.dump_fields.values()]
+    while stack:
+        field, owner = stack.pop()
+        if isinstance(field, RawJSONField):
+            return True
+        if isinstance(field, ma.Nested):
+            nested = _schema_class(field.nested, owner)
+            if nested is not None and nested not in seen:
+                seen.add(nested)
+                stack.extend((inner, nested) for inner in nested._declared_fields.values())
+        elif isinstance(field, ma.List):
+            stack.append((field.inner, owner))
+        elif isinstance(field, ma.Tuple):
+            stack.extend((inner, owner) for inner in field.tuple_fields)
+        elif isinstance(field, ma.Dict) and field.value_field is not None:
+            stack.append((field.value_field, owner))
+    return False
+
+
+def _schema_class(nested, owner: SchemaMeta) -> Optional[SchemaMeta]:
+    try:
+        if callable(nested) and not isinstance(nested, SchemaMeta):
+            nested = nested()
+        if nested == "self":
+            return owner
+        if isinstance(nested, str):
+            nested = class_registry.get_class(nested)
+    except (NameError, RegistryError):
+        return None
+    if isinstance(nested, Schema):
+        return type(nested)
+    return nested if isinstance(nested, SchemaMeta) else None
+
+
+class RawJSONEncoder(json.JSONEncoder):
+    """A JSON encoder that splices `RawJSON` values into its output."""
+
+    def __init__(self, *args, default=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fallback = default
+        # Placeholders cannot appear in regular strings, as the encoder escapes "\0"
+        self._token = f"\0raw-json:{uuid.uuid4().hex}:"
+        self._pattern = re.compile(re.escape(json.dumps(self._token)[:-1]) + r'(\d+)"')
+        self._fragments = None
+
+    def default(self, o):
+        if isinstance(o, RawJSON) and self._fragments is not None:
+            self._fragments.append(o.text)
+            return f"{self._token}{len(self._fragments) - 1}"
+        if self._fallback is not None:
+            return self._fallback(o)
+        return super().default(o)
+
+    def encode(self, o) -> str:
+        if isinstance(o, RawJSON):
+            return o.text
+        fragments = self._fragments = []
+        try:
+            text = super().encode(o)
+        finally:
+            self._fragments = None
+        if not fragments:
+            return text
+        return self._pattern.sub(lambda match: fragments[int(match.group(1))], text)
+
+
+def json_encoder(compact: Optional[bool] = None) -> RawJSONEncoder:
+    """
+    A `RawJSONEncoder` with the JSON settings of the app. With a custom JSON provider, the
+    values the standard encoder does not support are encoded by the provider.
+    """
+    provider = current_app.json
+    if compact is None:
+        provider_compact = getattr(provider, "compact", None)
+        compact = provider_compact is not False and not (
+            provider_compact is None and current_app.debug
+        )
+    if isinstance(provider, DefaultJSONProvider):
+        settings = {
+            "default": provider.default,
+            "ensure_ascii": provider.ensure_ascii,
+            "sort_keys": provider.sort_keys,
+        }
+    else:
+        settings = {"default": lambda o: json.loads(provider.dumps(o))}
+    if compact:
+        return RawJSONEncoder(separators=(",", ":"), **settings)
+    return RawJSONEncoder(indent=2, **settings)
+
+
+def dumps(data) -> str:
+    """Encode data to JSON with the settings of the app, splicing in its `RawJSON` values."""
+    return json_encoder().encode(data)
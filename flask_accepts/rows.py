@@ -0,0 +1,87 @@
+"""
+Compact row types for request bodies loaded with `many=True`.
+
+A loaded row is a dict, which takes several times the memory of an object with `__slots__` or
+a namedtuple holding the same values. `row_class` generates such a type from the fields of a
+schema (once per set of fields) and `to_rows` converts the loaded dicts into it.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from typing import List, Tuple
+
+from marshmallow import INCLUDE, Schema
+
+
+ROW_TYPES = ("slots", "namedtuple")
+
+
+def row_class(schema: Schema, row_type: str = "slots") -> type:
+    """
+    Get the row type for the data loaded by a schema. Attributes of fields missing from the
+    input are None.
+
+    Args:
+        schema (Marshmallow Schema): Instance of the schema
+        row_type (str, optional): "slots" for a class with `__slots__`, or "namedtuple".
+            Defaults to "slots".
+
+    Returns:
+        The row type, which takes the loaded values as keyword arguments
+    """
+    if row_type not in ROW_TYPES:
+        raise ValueError(f"Invalid row_type: {row_type}. Options are {', '.join(ROW_TYPES)}.")
+    if schema.unknown == INCLUDE:
+        raise ValueError("Rows cannot hold the unknown fields included by the schema")
+
+    names = tuple(field.attribute or name for name, field in schema.load_fields.items())
+    invalid = [name for name in names if not name.isidentifier() or name.startswith("__")]
+    if row_type == "namedtuple":
+        invalid += [name for name in names if name.startswith("_")]
+    if invalid:
+        raise ValueError(f"Fields {invalid} cannot be used as {row_type} row attributes")
+
+    name = "".join(type(schema).__name__.rsplit("Schema", 1)) + "Row"
+    return _make_row_class(name, names, row_type)
+
+
+def to_rows(data: List[dict], cls: type) -> List:
+    """Convert loaded dicts to rows in place, so each dict can be freed once converted."""
+    for index, row in enumerate(data):
+        data[index] = cls(**row)
+    return data
+
+
+@lru_cache(maxsize=None)
+def _make_row_class(name: str, names: Tuple[str, ...], row_type: str) -> type:
+    if row_type == "namedtuple":
+        return namedtuple(name, names, defaults=(None,) * len(names))
+
+    # Generate an __init__ with one keyword argument per field, like dataclasses do
+    params = "".join(f", {attr}=None" for attr in names)
+    body = "".join(f"\n    self.{attr} = {attr}" for attr in names) or "\n    pass"
+    namespace = {}
+    exec(f"def __init__(self{params}):{body}", namespace)
+
+    return type(
+        name,
+        (_SlotsRow,),
+        {"__slots__": names, "__init__": namespace["__init__"], "__module__": __name__},
+    )
+
+
+class _SlotsRow:
+    """Base of the generated `__slots__` row classes."""
+
+    __slots__ = ()
+
+    def _asdict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._asdict() == other._asdict()
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
@@ -0,0 +1,162 @@
+"""
+Bounded cache of schema instances derived from a base schema, e.g. restricted to some fields
+with `only`, or for a tenant or role with `exclude` and `context`. Building a marshmallow schema
+instance deep copies all of its fields, which is too slow to do on every request.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, Optional, Set, Tuple, Type, Union
+
+from marshmallow import Schema
+from marshmallow import fields as ma
+from marshmallow.schema import SchemaMeta
+
+
+class SchemaCache:
+    """
+    A thread-safe LRU cache of schema instances.
+
+    Args:
+        maxsize (int, optional): Number of instances kept. Defaults to 256.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._instances = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], Schema]) -> Schema:
+        """Get the instance cached under `key`, creating it with `factory` if needed."""
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is not None:
+                self._instances.move_to_end(key)
+                return instance
+
+        # Built outside of the lock, a concurrent miss only builds the instance twice
+        instance = factory()
+        with self._lock:
+            self._instances[key] = instance
+            if len(self._instances) > self.maxsize:
+                self._instances.popitem(last=False)
+        return instance
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
+schema_cache = SchemaCache()
+
+
+def derive_schema(
+    schema: Union[Schema, Type[Schema]],
+    only: Optional[Iterable[str]] = None,
+    exclude: Iterable[str] = (),
+    many: Optional[bool] = None,
+    context: Optional[dict] = None,
+    context_key: Hashable = None,
+) -> Schema:
+    """
+    Get a cached schema instance derived from a base schema class or instance. The options of
+    a base instance are kept, with `exclude` added to its excluded fields and `only` restricted
+    to the fields of its own `only`.
+
+    Args:
+        schema (Marshmallow Schema): The base schema class or instance
+        only (iterable, optional): Names of the fields to keep, which may be dotted paths into
+            nested schemas
+        exclude (iterable, optional): Names of the fields to remove
+        many (bool, optional): Overrides the `many` option of the base schema
+        context (dict, optional): The schema context. Since it is not part of the cache key,
+            `context_key` must identify it, e.g. the tenant or role it was built for.
+        context_key (hashable, optional): Key of the context in the cache
+
+    Returns:
+        The derived schema instance
+    """
+    only = frozenset(only) if only is not None else None
+    exclude = frozenset(exclude)
+    if context is not None and context_key is None:
+        raise ValueError("A context_key is required to cache schemas with a context")
+    unchanged = only is None and not exclude and many is None and context is None
+    if unchanged and isinstance(schema, Schema):
+        return schema
+
+    options = {}
+    if only is not None:
+        options["only"] = only
+    if exclude:
+        options["exclude"] = exclude
+    if many is not None:
+        options["many"] = many
+    if context is not None:
+        options["context"] = context
+    key = (schema, only, exclude, many, context_key)
+    return schema_cache.get(key, lambda: _build(schema, **options))
+
+
+def copy_schema(schema: Schema) -> Schema:
+    """A new, uncached instance of a schema with the same options as `schema`."""
+    return _build(schema)
+
+
+def _build(schema: Union[Schema, Type[Schema]], **options) -> Schema:
+    if isinstance(schema, SchemaMeta):
+        return schema(**options)
+
+    only, exclude = _dotted_options(schema)
+    base_options = {
+        "only": only,
+        "many": schema.many,
+        "exclude": exclude,
+        "load_only": schema.load_only,
+        "dump_only": schema.dump_only,
+        "partial": schema.partial,
+        "unknown": schema.unknown,
+    }
+    # Schema context was removed in marshmallow 4
+    if getattr(schema, "context", None):
+        base_options["context"] = schema.context
+    if "exclude" in options:
+        options["exclude"] = exclude | options["exclude"]
+    if options.get("only") is not None and only is not None:
+        # Fields left out of the base instance stay out
+        options["only"] = _intersect_only(only, options["only"])
+    return type(schema)(**{**base_options, **options})
+
+
+def _dotted_options(schema: Schema) -> Tuple[Optional[Set[str]], Set[str]]:
+    # The `only` and `exclude` options of an instance, including those marshmallow moved to
+    # its nested fields (e.g. "cog.id"), which would be lost when it is rebuilt from its class
+    only = None if schema.only is None else set()
+    exclude = set(schema.exclude)
+    for name, field in schema.declared_fields.items():
+        if isinstance(field, ma.Pluck):
+            continue
+        nested_only = getattr(field, "only", None)
+        if only is not None and name in schema.only:
+            if nested_only:
+                only.update(f"{name}.{nested}" for nested in nested_only)
+            else:
+                only.add(name)
+        exclude.update(f"{name}.{nested}" for nested in getattr(field, "exclude", None) or ())
+    return only, exclude
+
+
+def _intersect_only(base: Iterable[str], only: Iterable[str]) -> Set[str]:
+    # Intersection of two `only` options, whose names may be dotted paths into nested schemas
+    result = set()
+    for name in only:
+        head, _, rest = name.partition(".")
+        if head in base:
+            result.add(name)
+            continue
+        nested = {path.partition(".")[2] for path in base if path.startswith(head + ".")}
+        if nested:
+            nested = _intersect_only(nested, [rest]) if rest else nested
+            result.update(f"{head}.{path}" for path in nested)
+    return result
@@ -0,0 +1,81 @@
+"""
+Sparse fieldsets for `responds(sparse_fields_param=...)`: clients list the output fields they
+want in a query param, JSON:API style (e.g. `?fields=id,name,owner.email`), and the response is
+dumped with a cached schema derived with `only`.
+"""
+from typing import FrozenSet, Iterable, List
+
+from marshmallow import Schema
+from marshmallow import fields as ma
+
+
+def parse_sparse_fields(value: str) -> List[str]:
+    """Split a comma separated list of (dotted) field names."""
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def resolve_sparse_fields(schema: Schema, paths: Iterable[str]) -> FrozenSet[str]:
+    """
+    Map output keys (which may be dotted paths into nested schemas) to the field names that
+    marshmallow's `only` expects.
+
+    Args:
+        schema (Marshmallow Schema): The schema dumping the response
+        paths (list): The requested output keys
+
+    Returns:
+        frozenset: The field names
+
+    Raises:
+        ValueError: if some of the keys are not output by the schema
+    """
+    resolved, unknown = set(), []
+    for path in paths:
+        name = _resolve_path(schema, path.split("."))
+        if name is None:
+            unknown.append(path)
+        else:
+            resolved.add(name)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return frozenset(resolved)
+
+
+def restrict_sparse_fields(schema: Schema, names: Iterable[str]) -> FrozenSet[str]:
+    """
+    Keep the field names (which may be dotted paths into nested schemas) that `schema` dumps,
+    e.g. a variant of the schema they were resolved against which hides some of its fields.
+    """
+    return frozenset(name for name in names if _has_path(schema, name.split(".")))
+
+
+def _has_path(schema: Schema, names: List[str]) -> bool:
+    for index, name in enumerate(names):
+        field = schema.dump_fields.get(name)
+        if field is None:
+            return False
+        if index < len(names) - 1:
+            if isinstance(field, ma.List):
+                field = field.inner
+            if not isinstance(field, ma.Nested) or not isinstance(field.schema, Schema):
+                return False
+            schema = field.schema
+    return True
+
+
+def _resolve_path(schema: Schema, keys: List[str]):
+    names = []
+    for index, key in enumerate(keys):
+        fields = {field.data_key or name: name for name, field in schema.dump_fields.items()}
+        if key not in fields:
+            return None
+        names.append(fields[key])
+
+        if index < len(keys) - 1:
+            field = schema.dump_fields[fields[key]]
+            if isinstance(field, ma.List):
+                field = field.inner
+            if not isinstance(field, ma.Nested) or not isinstance(field.schema, Schema):
+                return None
+            schema = field.schema
+    return ".".join(names)
@@ -0,0 +1,92 @@
+"""
+Streamed serialization for `responds(stream=True)`.
+
+When a view returns an iterator, such as a generator or a SQLAlchemy query or result, rather
+than a list, the items are pulled, dumped and encoded to JSON in batches while the response is
+sent, so only one batch of objects and of serialized output is held in memory at a time.
+SQLAlchemy queries are read with `yield_per`, and results (e.g. from
+`session.scalars(select(Model).execution_options(yield_per=1000))`) by partitions.
+"""
+from collections.abc import Mapping, Sequence
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from flask import current_app, stream_with_context
+from werkzeug.wrappers import Response
+
+from flask_accepts import raw_json
+from flask_accepts.compression import json_chunks, json_encoder
+
+
+def is_stream(rv) -> bool:
+    """Whether the return value of a view is an iterable that was not materialized."""
+    return (
+        isinstance(rv, Iterable)
+        and not isinstance(rv, (Sequence, Mapping, set, frozenset))
+        and not isinstance(rv, (str, bytes))
+    )
+
+
+def batches(rv: Iterable, size: int) -> Iterator[List]:
+    """Read an iterable, SQLAlchemy query or SQLAlchemy result in lists of `size` items."""
+    if hasattr(rv, "partitions"):
+        # A SQLAlchemy Result or ScalarResult
+        for partition in rv.partitions(size):
+            yield list(partition)
+        return
+
+    if hasattr(rv, "yield_per"):
+        # A SQLAlchemy Query, so that rows are fetched and instantiated a batch at a time
+        rv = rv.yield_per(size)
+    iterator = iter(rv)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def json_stream_response(
+    rv: Iterable,
+    dump: Callable[[List], List],
+    size: int,
+    status_code: int,
+    headers=None,
+    envelope: Optional[str] = None,
+) -> Response:
+    """
+    A streamed JSON response of the items of an iterable, pulled, dumped and encoded a batch
+    at a time.
+
+    Args:
+        rv: The iterable returned by the view
+        dump (callable): Serializes a list of items
+        size (int): Number of items per batch
+        status_code (int): The status code
+        headers (dict, optional): The response headers
+        envelope (str, optional): Key of an object to return the items in
+
+    Returns:
+        Response: The response
+    """
+    encoder = json_encoder()
+    # Pretty printing and custom providers encode each batch in one go
+    encode = (encoder or raw_json.json_encoder()).encode
+    prefix = f"{{{encode(envelope)}:[" if envelope else "["
+    suffix = "]}" if envelope else "]"
+
+    def generate() -> Iterator[str]:
+        yield prefix
+        separator = ""
+        for batch in batches(rv, size):
+            items = encode(dump(batch)).strip()[1:-1].strip()
+            if items:
+                yield separator + items
+                separator = ","
+        yield suffix
+
+    # The request context is kept while streaming, e.g. for the schema context or a DB session
+    body = stream_with_context(json_chunks(generate()))
+    return current_app.response_class(
+        body, status=status_code, headers=headers, mimetype="application/json"
+    )
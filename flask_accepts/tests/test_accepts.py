@@ -1,3 +1,4 @@
+import pytest
 from flask import jsonify, request
 from flask_restx import Resource, Api
 from marshmallow import Schema, fields
@@ -689,3 +690,208 @@ def test_responds_with_validate(app, client):  # noqa
         obj = resp.json
         assert resp.status_code == 500
         assert resp.json == {"message": "Server attempted to return invalid data"}
+
+
+def test_accepts_as_kwargs_passes_parsed_inputs(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    class QuerySchema(Schema):
+        limit = fields.Integer()
+
+    class HeadersSchema(Schema):
+        Foo = fields.String()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(
+        dict(name="foo", type=int),
+        schema=TestSchema,
+        query_params_schema=QuerySchema,
+        headers_schema=HeadersSchema,
+        as_kwargs=True,
+    )
+    def test(args, body, query, headers):
+        assert args["foo"] == 3
+        assert body == {"_id": 42, "name": "tests name"}
+        assert query == {"limit": 3}
+        assert headers == {"Foo": "bar"}
+        assert not hasattr(request, "parsed_obj")
+        return "success"
+
+    with client as cl:
+        resp = cl.post(
+            "/test?foo=3&limit=3",
+            json={"_id": 42, "name": "tests name"},
+            headers={"Foo": "bar"},
+        )
+        assert resp.status_code == 200
+
+
+def test_accepts_as_kwargs_with_Resource(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    api = Api(app)
+
+    @api.route("/test/<int:widget_id>")
+    class TestResource(Resource):
+        @accepts(schema=TestSchema, api=api, as_kwargs=True)
+        def post(self, widget_id, body):
+            assert widget_id == 7
+            assert body["_id"] == 42
+            return "success"
+
+    with client as cl:
+        resp = cl.post("/test/7", json={"_id": 42, "name": "tests name"})
+        assert resp.status_code == 200
+
+
+def test_accepts_as_kwargs_view_is_callable_without_request_context():
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @accepts(schema=TestSchema, as_kwargs=True)
+    def test(body):
+        return body["_id"]
+
+    assert test.__wrapped__(body={"_id": 42}) == 42
+
+
+def test_accepts_as_kwargs_validation_errors(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=TestSchema, as_kwargs=True)
+    def test(body):
+        pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post("/test", json={"_id": "not an int"})
+        assert resp.status_code == 400
+
+
+def test_validation_errors_are_json_with_vanilla_flask(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=TestSchema)
+    def test():
+        pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post("/test", json={"_id": "not_int", "name": 42})
+        assert resp.status_code == 400
+        assert resp.content_type == "application/json"
+        assert resp.json == {
+            "message": "Error parsing request body",
+            "errors": {
+                "_id": ["Not a valid integer."],
+                "name": ["Not a valid string."],
+            },
+        }
+
+
+def test_validation_errors_from_reqparse_and_schemas_are_combined(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    class HeadersSchema(Schema):
+        count = fields.Integer(data_key="X-Count")
+
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @accepts(
+            dict(name="foo", type=int),
+            schema=TestSchema,
+            headers_schema=HeadersSchema,
+            api=api,
+        )
+        def post(self):
+            pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post(
+            "/test?foo=not_int", json={"_id": "not_int"}, headers={"X-Count": "1"}
+        )
+        assert resp.status_code == 400
+        assert set(resp.json["errors"]) == {"foo", "_id"}
+        assert resp.json["errors"]["_id"] == ["Not a valid integer."]
+
+
+def test_accepts_fast_validate(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer(required=True)
+        name = fields.String()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=TestSchema, fast_validate=True)
+    def test():
+        assert request.parsed_obj == {"_id": 3, "name": "foo"}
+        return "success"
+
+    with client as cl:
+        resp = cl.post("/test", json={"_id": "3", "name": "foo"})
+        assert resp.status_code == 200
+
+        resp = cl.post("/test", json={"name": 42, "extra": True})
+        assert resp.status_code == 400
+        assert resp.json == {
+            "message": "Error parsing request body",
+            "errors": {
+                "_id": ["Missing data for required field."],
+                "name": ["Not a valid string."],
+                "extra": ["Unknown field."],
+            },
+        }
+
+
+def test_accepts_fast_validate_falls_through_to_marshmallow(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer(validate=lambda value: value > 0)
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=TestSchema, fast_validate=True)
+    def test():
+        pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post("/test", json={"_id": "-1"})
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"_id": ["Invalid value."]}
+
+
+def test_accepts_validate_only(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=TestSchema(many=True), validate_only=True, as_kwargs=True)
+    def test(body):
+        # The decoded JSON is passed through without marshmallow's type conversion
+        assert body == [{"_id": "3"}]
+        return "success"
+
+    with client as cl:
+        resp = cl.post("/test", json=[{"_id": "3"}])
+        assert resp.status_code == 200
+
+        resp = cl.post("/test", json=[{"_id": [3]}])
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"0": {"_id": ["Not a valid integer."]}}
+
+
+def test_accepts_fast_validate_requires_marshmallow_schema():
+    msgspec = pytest.importorskip("msgspec")
+
+    class Struct(msgspec.Struct):
+        _id: int
+
+    with pytest.raises(TypeError):
+        accepts(schema=Struct, fast_validate=True)
@@ -0,0 +1,181 @@
+from typing import List, Optional
+
+import pytest
+from flask import request
+from flask_restx import Resource, Api
+from marshmallow import Schema, fields
+
+from flask_accepts.backends import Backend, MarshmallowBackend, get_backend
+from flask_accepts.decorators import accepts, responds
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+msgspec = pytest.importorskip("msgspec")
+
+
+class Cog(msgspec.Struct):
+    cog_foo: bool
+
+
+class Widget(msgspec.Struct):
+    foo: str
+    baz: int
+    cogs: List[Cog] = []
+    note: Optional[str] = None
+
+
+def test_get_backend():
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    assert isinstance(get_backend(TestSchema), MarshmallowBackend)
+    assert isinstance(get_backend(TestSchema()), MarshmallowBackend)
+    assert get_backend(Widget).bind(Widget).struct is Widget
+
+    with pytest.raises(TypeError):
+        get_backend(dict)
+
+
+def test_msgspec_accepts_and_responds(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @accepts(schema=Widget, api=api)
+        @responds(schema=Widget, api=api)
+        def post(self):
+            assert isinstance(request.parsed_obj, Widget)
+            return request.parsed_obj
+
+    with client as cl:
+        payload = {"foo": "bar", "baz": 3, "cogs": [{"cog_foo": True}], "note": None}
+        resp = cl.post("/test", json=payload)
+        assert resp.status_code == 200
+        assert resp.json == payload
+
+
+def test_msgspec_validation_errors(app, client):  # noqa
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=Widget)
+    def test():
+        pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post("/test", json={"foo": "bar", "baz": "not an int"})
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"baz": ["Expected `int`, got `str`"]}
+
+        resp = cl.post("/test", json={"foo": "bar", "baz": 1, "cogs": [{}]})
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {
+            "cogs": {"0": {"cog_foo": ["Missing data for required field."]}}
+        }
+
+        resp = cl.post("/test", data="not json", content_type="application/json")
+        assert resp.status_code == 400
+
+
+def test_msgspec_unknown_fields(app, client):  # noqa
+    class StrictWidget(msgspec.Struct, forbid_unknown_fields=True):
+        foo: str
+
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=Widget)
+    def test():
+        return "ok"
+
+    @app.route("/strict", methods=["POST"])
+    @accepts(schema=StrictWidget)
+    def strict():
+        pass  # pragma: no cover
+
+    with client as cl:
+        resp = cl.post("/test", json={"foo": "bar", "baz": 1, "extra": 1})
+        assert resp.status_code == 200
+
+        resp = cl.post("/strict", json={"foo": "bar", "extra": 1})
+        assert resp.status_code == 400
+
+
+def test_msgspec_many(app, client):  # noqa
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=Widget, many=True, as_kwargs=True)
+    @responds(schema=Widget, many=True)
+    def test(body):
+        assert len(body) == 2
+        return body
+
+    with client as cl:
+        payload = [{"foo": "a", "baz": 1}, {"foo": "b", "baz": 2}]
+        resp = cl.post("/test", json=payload)
+        assert resp.status_code == 200
+        assert [row["foo"] for row in resp.json] == ["a", "b"]
+
+
+def test_msgspec_rejects_marshmallow_options():
+    class WidgetSchema(Schema):
+        foo = fields.String()
+
+    with pytest.raises(TypeError, match="columnar"):
+        responds(schema=Widget, many=True, columnar=True)
+    with pytest.raises(TypeError, match="columnar"):
+        responds(schema=WidgetSchema, many=True, alt_schemas={201: Widget}, columnar=True)
+
+
+def test_msgspec_swagger(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @accepts(schema=Widget, api=api)
+        @responds(schema=Widget, api=api)
+        def post(self):
+            pass  # pragma: no cover
+
+    with client as cl:
+        cl.get("/swagger.json")
+        definitions = api.__schema__["definitions"]
+        assert definitions["Widget"]["required"] == ["baz", "foo"]
+        assert definitions["Widget"]["properties"]["baz"] == {"type": "integer"}
+        assert definitions["Widget"]["properties"]["cogs"] == {
+            "type": "array",
+            "items": {"$ref": "#/definitions/Cog"},
+        }
+        assert definitions["Cog"]["properties"]["cog_foo"] == {"type": "boolean"}
+
+
+def test_register_custom_backend(app, client):  # noqa
+    from flask_accepts.backends import _backends, register_backend
+
+    class Loader:
+        many = False
+        ordered = False
+
+        def load(self, data):
+            return {"loaded": data}
+
+        def dump(self, obj):
+            return {"dumped": obj}
+
+        def validate(self, data):
+            return {}
+
+    class LoaderBackend(Backend):
+        def handles(self, schema):
+            return isinstance(schema, Loader)
+
+        def bind(self, schema, many=False, unknown=None):
+            return schema
+
+    backend = register_backend(LoaderBackend())
+    try:
+        @app.route("/test", methods=["POST"])
+        @accepts(schema=Loader(), as_kwargs=True)
+        @responds(schema=Loader())
+        def test(body):
+            return body["loaded"]
+
+        with client as cl:
+            resp = cl.post("/test", json={"foo": "bar"})
+            assert resp.json == {"dumped": {"foo": "bar"}}
+    finally:
+        _backends.remove(backend)
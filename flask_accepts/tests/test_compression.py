@@ -0,0 +1,102 @@
+import gzip
+import json
+import zlib
+
+from flask import Response, request
+from flask_restx import Resource, Api
+from marshmallow import Schema, fields
+
+from flask_accepts.compression import compress_chunks, negotiate
+from flask_accepts.decorators import responds
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class WidgetSchema(Schema):
+    foo = fields.String()
+    baz = fields.Integer()
+
+
+WIDGETS = [{"foo": f"widget {i}", "baz": i} for i in range(100)]
+
+
+def test_compress_chunks():
+    chunks = [b"abc" * 100, b"", b"def" * 100]
+
+    assert gzip.decompress(b"".join(compress_chunks(chunks, "gzip"))) == b"".join(chunks)
+    assert zlib.decompress(b"".join(compress_chunks(chunks, "deflate", 1))) == b"".join(chunks)
+
+
+def test_negotiate(app):  # noqa
+    for header, expected in [
+        ("gzip, deflate, br", "gzip"),
+        ("deflate", "deflate"),
+        ("gzip;q=0, deflate", "deflate"),
+        ("br", None),
+        ("identity", None),
+    ]:
+        with app.test_request_context(headers={"Accept-Encoding": header}):
+            assert negotiate(request) == expected
+    with app.test_request_context():
+        assert negotiate(request) is None
+
+
+def test_responds_compress(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=WidgetSchema(many=True), api=api, compress=True)
+        def get(self):
+            return WIDGETS
+
+    @app.route("/small")
+    @responds(schema=WidgetSchema, compress=True, compress_min_size=1000)
+    def small():
+        return WIDGETS[0], 201
+
+    with client as cl:
+        resp = cl.get("/test", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert resp.headers["Vary"] == "Accept-Encoding"
+        assert resp.content_type == "application/json"
+        assert resp.is_streamed
+        assert json.loads(gzip.decompress(resp.data)) == WIDGETS
+
+        resp = cl.get("/test", headers={"Accept-Encoding": "deflate"})
+        assert json.loads(zlib.decompress(resp.data)) == WIDGETS
+
+        resp = cl.get("/test")
+        assert "Content-Encoding" not in resp.headers
+        assert resp.headers["Vary"] == "Accept-Encoding"
+        assert resp.json == WIDGETS
+
+        resp = cl.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 201
+        assert "Content-Encoding" not in resp.headers
+        assert resp.json == WIDGETS[0]
+
+
+def test_responds_compress_responses(app, client):  # noqa
+    body = json.dumps(WIDGETS).encode()
+    cached = gzip.compress(body)
+
+    @app.route("/streamed")
+    @responds(schema=WidgetSchema, compress=True, compress_level=9)
+    def streamed():
+        return Response((body[i:i + 100] for i in range(0, len(body), 100)))
+
+    @app.route("/cached")
+    @responds(schema=WidgetSchema, compress=True)
+    def cached_response():
+        return Response(cached, headers={"Content-Encoding": "gzip"})
+
+    with client as cl:
+        resp = cl.get("/streamed", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(resp.data) == body
+
+        # Already compressed bytes, e.g. from a cache, are not compressed again
+        resp = cl.get("/cached", headers={"Accept-Encoding": "gzip"})
+        assert resp.data == cached
+        assert resp.headers["Vary"] == "Accept-Encoding"
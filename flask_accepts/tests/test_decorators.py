@@ -100,3 +100,113 @@ def test_multidict_list_values_interpreted_correctly(app, client):  # noqa
     ])
     result = _convert_multidict_values_to_schema(multidict, TestSchema())
     assert result["name"] == ["value", "value2"]
+
+
+def test_endpoint_is_equivalent_to_stacked_decorators(app, client):  # noqa
+    from flask import request
+
+    from flask_accepts import endpoint
+
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    api = Api(app)
+
+    @api.route("/stacked")
+    class StackedResource(Resource):
+        @accepts("Foo", dict(name="foo", type=int), schema=TestSchema, api=api)
+        @responds(schema=TestSchema, api=api, status_code=201)
+        def post(self):
+            return {**request.parsed_obj, "_id": request.parsed_args["foo"]}
+
+    @api.route("/fused")
+    class FusedResource(Resource):
+        @endpoint(
+            accepts=dict(args=["Foo", dict(name="foo", type=int)], schema=TestSchema),
+            responds=dict(schema=TestSchema, status_code=201),
+            api=api,
+        )
+        def post(self):
+            return {**request.parsed_obj, "_id": request.parsed_args["foo"]}
+
+    with client as cl:
+        for route in ("/stacked", "/fused"):
+            resp = cl.post(f"{route}?foo=3", json={"_id": 42, "name": "Jon Snow"})
+            assert resp.status_code == 201
+            assert resp.json == {"_id": 3, "name": "Jon Snow"}
+
+            resp = cl.post(f"{route}?foo=3", json={"_id": "not an int"})
+            assert resp.status_code == 400
+            assert "Not a valid integer." in resp.json["errors"]["_id"]
+
+        paths = api.__schema__["paths"]
+        stacked_docs = {k: v for k, v in paths["/stacked"]["post"].items() if k != "operationId"}
+        fused_docs = {k: v for k, v in paths["/fused"]["post"].items() if k != "operationId"}
+        assert stacked_docs == fused_docs
+
+
+def test_endpoint_with_vanilla_flask_and_as_kwargs(app, client):  # noqa
+    from flask_accepts import endpoint
+
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    @app.route("/test", methods=["POST"])
+    @endpoint(
+        accepts=dict(schema=TestSchema, as_kwargs=True),
+        responds=dict(schema=TestSchema(exclude=("_id",))),
+    )
+    def test(body):
+        return body
+
+    with client as cl:
+        resp = cl.post("/test", json={"_id": 42, "name": "Jon Snow"})
+        assert resp.status_code == 200
+        assert resp.json == {"name": "Jon Snow"}
+
+
+def test_route_specs_are_introspectable(app, client):  # noqa
+    import pytest
+
+    from flask_accepts.decorators import AcceptsSpec, RespondsSpec
+
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String()
+
+    @app.route("/test", methods=["POST"])
+    @accepts(dict(name="foo", type=int), schema=TestSchema)
+    @responds(schema=TestSchema, envelope="data")
+    def test():
+        return {"_id": 42}
+
+    accepts_spec = test.__accepts_spec__
+    responds_spec = test.__responds_spec__
+    assert isinstance(accepts_spec, AcceptsSpec)
+    assert isinstance(responds_spec, RespondsSpec)
+    assert isinstance(accepts_spec.schema, TestSchema)
+    assert accepts_spec.step_names == ("args", "body")
+    assert responds_spec.step_names == ("dump", "mask", "envelope")
+    assert responds_spec.envelope == "data"
+
+    with pytest.raises(AttributeError):
+        responds_spec.envelope = "other"
+
+    with client as cl:
+        resp = cl.post("/test?foo=3", json={"_id": 42})
+        assert resp.json == {"data": {"_id": 42}}
+
+
+def test_route_spec_skips_steps_that_do_not_apply():
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @accepts(schema=TestSchema, as_kwargs=True)
+    @responds(schema=TestSchema, validate=True, skip_none=True)
+    def test(body):
+        pass  # pragma: no cover
+
+    assert test.__accepts_spec__.step_names == ("body",)
+    assert test.__responds_spec__.step_names == ("dump", "validate", "mask", "skip_none")
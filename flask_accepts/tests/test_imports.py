@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _imports_flask_restx(statement: str) -> bool:
+    code = f"{statement}; import sys; print('flask_restx' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return result.stdout.strip() == "True"
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("import flask_accepts", False),
+        ("from flask_accepts import accepts, responds, endpoint", False),
+        (
+            "from marshmallow import Schema, fields\n"
+            "from flask_accepts import accepts, responds\n"
+            "class WidgetSchema(Schema):\n"
+            "    name = fields.String()\n"
+            "accepts(schema=WidgetSchema)(responds(schema=WidgetSchema)(lambda: None))",
+            False,
+        ),
+        (
+            "from flask import Flask\n"
+            "from marshmallow import Schema, fields\n"
+            "from flask_accepts import responds\n"
+            "class WidgetSchema(Schema):\n"
+            "    name = fields.String()\n"
+            "app = Flask(__name__)\n"
+            "app.route('/')(responds(schema=WidgetSchema)(lambda: {'name': 'a'}))\n"
+            "assert app.test_client().get('/').json == {'name': 'a'}",
+            False,
+        ),
+        ("from flask_accepts import for_swagger", True),
+        ("from flask_accepts import accepts; accepts(dict(name='foo', type=int))", True),
+    ],
+)
+def test_flask_restx_is_imported_lazily(statement, expected):
+    assert _imports_flask_restx(statement) is expected
+
+
+def test_lazy_attributes():
+    import flask_accepts
+    from flask_accepts import decorators, utils
+
+    assert flask_accepts.accepts is decorators.accepts
+    assert flask_accepts.for_swagger is utils.for_swagger
+    assert "responds" in dir(flask_accepts)
+    with pytest.raises(AttributeError):
+        flask_accepts.missing
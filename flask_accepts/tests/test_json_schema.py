@@ -0,0 +1,121 @@
+import pytest
+from marshmallow import EXCLUDE, Schema, fields, pre_load
+
+from flask_accepts.json_schema import compile_validator, to_json_schema
+
+
+class ChildSchema(Schema):
+    x = fields.Integer(required=True)
+    flag = fields.Boolean()
+
+
+class ParentSchema(Schema):
+    name = fields.String(required=True)
+    score = fields.Float(allow_none=True)
+    tags = fields.List(fields.String())
+    raw = fields.Raw()
+    child = fields.Nested(ChildSchema)
+    kids = fields.Nested(ChildSchema, many=True)
+    parent = fields.Nested(lambda: ParentSchema())
+
+
+def test_to_json_schema():
+    result = to_json_schema(ChildSchema())
+
+    assert result["type"] == ["object"]
+    assert result["required"] == ["x"]
+    assert result["additionalProperties"] is False
+    assert result["properties"]["x"]["type"] == ["number", "string"]
+    assert set(result["properties"]["flag"]["enum"]) == (
+        fields.Boolean.truthy | fields.Boolean.falsy
+    )
+
+
+def test_to_json_schema_unconstrained():
+    class PreLoadSchema(Schema):
+        x = fields.Integer()
+
+        @pre_load
+        def unwrap(self, data, **kwargs):
+            return data["data"]
+
+    class ExcludeSchema(Schema):
+        x = fields.Integer(strict=True, data_key="X")
+
+    assert to_json_schema(PreLoadSchema()) == {}
+    result = to_json_schema(ExcludeSchema(unknown=EXCLUDE))
+    assert "additionalProperties" not in result
+    assert result["properties"]["X"]["type"] == ["integer"]
+    # A recursive schema is only expanded once
+    assert "properties" not in to_json_schema(ParentSchema())["properties"]["parent"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"name": "foo"},
+        {"name": "foo", "score": None, "tags": ["a"], "raw": [1], "child": {"x": "1"}},
+        {"name": "foo", "kids": [{"x": 1, "flag": "yes"}, {"x": 2.0, "flag": 0}]},
+        {"name": 1, "score": "abc", "tags": ["a", 2, None], "raw": None},
+        {"child": {"flag": "maybe", "y": 1}, "kids": {"x": 1}},
+        {"child": [], "kids": [None, {"x": True}], "extra": 1},
+        [],
+        None,
+    ],
+)
+def test_compile_validator_matches_marshmallow(data):
+    schema = ParentSchema()
+    validate = compile_validator(to_json_schema(schema))
+
+    errors = validate(data)
+    expected = schema.validate(data)
+    # Anything the compiled validator reports, marshmallow reports identically. Values it
+    # allows (e.g. "abc" for a Float) are left for marshmallow to reject.
+    assert errors == {key: expected[key] for key in errors}
+    if not expected:
+        assert errors == {}
+
+
+def test_compile_validator_many():
+    schema = ChildSchema(many=True)
+    validate = compile_validator(to_json_schema(schema))
+
+    assert validate([{"x": 1}]) == {}
+    assert validate({"x": 1}) == schema.validate({"x": 1})
+    assert validate([{"x": 1}, {}]) == schema.validate([{"x": 1}, {}])
+
+
+def test_compile_validator_errors_are_not_shared():
+    validate = compile_validator(to_json_schema(ChildSchema()))
+
+    errors = validate({})
+    errors["x"].append("changed")
+    assert validate({}) == {"x": ["Missing data for required field."]}
+
+
+@pytest.mark.parametrize(
+    "partial, data",
+    [
+        (True, {"child": {"flag": True}}),
+        (("name",), {"child": {"x": 1}}),
+        (("name", "child.x"), {"child": {"flag": True}, "kids": [{"flag": True}]}),
+        (("name",), {"child": {"flag": True}}),
+    ],
+)
+def test_compile_validator_partial(partial, data):
+    schema = ParentSchema(partial=partial)
+    validate = compile_validator(to_json_schema(schema))
+
+    assert validate(data) == schema.validate(data)
+
+
+def test_compile_validator_strict_integer():
+    class StrictSchema(Schema):
+        x = fields.Integer(strict=True)
+
+    schema = StrictSchema()
+    validate = compile_validator(to_json_schema(schema))
+
+    assert validate({"x": 3}) == {}
+    for value in (3.0, True, "3"):
+        assert validate({"x": value}) == schema.validate({"x": value}) != {}
@@ -0,0 +1,96 @@
+import datetime
+import decimal
+
+import pytest
+from flask import request
+from flask_restx import Resource, Api
+from marshmallow import Schema, fields
+
+from flask_accepts.decorators import accepts, responds
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+msgpack = pytest.importorskip("msgpack")
+
+
+class WidgetSchema(Schema):
+    foo = fields.String()
+    baz = fields.Integer()
+    price = fields.Decimal()
+    created = fields.Date()
+
+
+def test_accepts_msgpack_body(app, client):  # noqa
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=WidgetSchema, msgpack=True)
+    def test():
+        assert request.parsed_obj == {"foo": "bar", "baz": 3}
+        return "success"
+
+    with client as cl:
+        resp = cl.post(
+            "/test",
+            data=msgpack.packb({"foo": "bar", "baz": "3"}),
+            content_type="application/msgpack",
+        )
+        assert resp.status_code == 200
+
+        # JSON bodies are still accepted
+        resp = cl.post("/test", json={"foo": "bar", "baz": 3})
+        assert resp.status_code == 200
+
+        resp = cl.post(
+            "/test", data=msgpack.packb({"baz": "x"}), content_type="application/x-msgpack"
+        )
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"baz": ["Not a valid integer."]}
+
+        resp = cl.post("/test", data=b"\xc1", content_type="application/msgpack")
+        assert resp.status_code == 400
+
+
+def test_responds_msgpack(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=WidgetSchema, api=api, msgpack=True)
+        def get(self):
+            return {
+                "foo": "bar",
+                "baz": 3,
+                "price": decimal.Decimal("1.50"),
+                "created": datetime.date(2024, 1, 2),
+            }
+
+    @app.route("/plain")
+    @responds(schema=WidgetSchema, status_code=201, msgpack=True)
+    def plain():
+        return {"foo": "bar"}
+
+    with client as cl:
+        resp = cl.get("/test", headers={"Accept": "application/msgpack"})
+        assert resp.status_code == 200
+        assert resp.content_type == "application/msgpack"
+        assert resp.headers["Vary"] == "Accept"
+        assert msgpack.unpackb(resp.data) == {
+            "foo": "bar",
+            "baz": 3,
+            "price": "1.50",
+            "created": "2024-01-02",
+        }
+
+        resp = cl.get("/plain", headers={"Accept": "application/x-msgpack"})
+        assert resp.status_code == 201
+        assert msgpack.unpackb(resp.data) == {"foo": "bar"}
+
+        resp = cl.get("/plain", headers={"Accept": "application/json"})
+        assert resp.content_type == "application/json"
+        assert resp.json == {"foo": "bar"}
+        assert resp.headers["Vary"] == "Accept"
+        assert cl.get("/plain").json == {"foo": "bar"}
+
+        swagger = cl.get("/swagger.json").json
+        assert swagger["paths"]["/test"]["get"]["produces"] == [
+            "application/json",
+            "application/msgpack",
+        ]
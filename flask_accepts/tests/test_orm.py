@@ -0,0 +1,224 @@
+import pytest
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.tests.fixtures import app  # noqa
+
+sa = pytest.importorskip("sqlalchemy")
+orm = pytest.importorskip("sqlalchemy.orm")
+
+from flask_accepts.orm import (  # noqa: E402
+    NPlusOneError,
+    NPlusOneWarning,
+    QueryDetector,
+    eager_load_options,
+)
+
+
+Base = orm.declarative_base()
+
+
+class Owner(Base):
+    __tablename__ = "owner"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    email = sa.Column(sa.String)
+
+
+class Cog(Base):
+    __tablename__ = "cog"
+    id = sa.Column(sa.Integer, primary_key=True)
+    size = sa.Column(sa.Integer)
+    widget_id = sa.Column(sa.ForeignKey("widget.id"))
+
+
+class Widget(Base):
+    __tablename__ = "widget"
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String)
+    notes = sa.Column(sa.String)
+    owner_id = sa.Column(sa.ForeignKey("owner.id"))
+    owner = orm.relationship(Owner)
+    cogs = orm.relationship(Cog)
+
+
+class OwnerSchema(Schema):
+    name = fields.String()
+    email = fields.String()
+
+
+class CogSchema(Schema):
+    id = fields.Integer()
+
+
+class WidgetSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    cogs = fields.List(fields.Nested(CogSchema))
+
+
+@pytest.fixture
+def session():
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with orm.Session(engine) as session:
+        session.add_all(
+            [
+                Widget(id=i, name=f"widget {i}", owner=Owner(name=f"owner {i}"), cogs=[Cog(), Cog()])
+                for i in range(5)
+            ]
+        )
+        session.commit()
+        yield session
+
+
+def test_query_detector(session):
+    detector = QueryDetector(threshold=4, action="raise")
+    schema = detector.instrument(WidgetSchema(many=True))
+
+    widgets = session.query(Widget).all()
+    with pytest.raises(NPlusOneError, match="5 SQL statements .*Widget.cogs: 5"):
+        with detector.check():
+            schema.dump(widgets)
+    assert detector.queries() == {"Widget.cogs": 5}
+
+    # Already loaded relationships issue no statements
+    with detector.check() as counts:
+        schema.dump(widgets)
+    assert counts == {}
+
+    session.expire_all()
+    widgets = session.query(Widget).options(orm.selectinload(Widget.cogs)).all()
+    with detector.check() as counts:
+        schema.dump(widgets)
+    assert counts == {}
+
+    detector.reset()
+    assert detector.queries() == {}
+
+    with pytest.raises(ValueError):
+        QueryDetector(action="ignore")
+
+
+def test_query_detector_close(session):
+    import gc
+    import weakref
+
+    from flask_accepts.orm import _detectors
+
+    detector = QueryDetector(threshold=0, action="raise")
+    schema = detector.instrument(WidgetSchema(many=True))
+    widgets = session.query(Widget).all()
+
+    detector.close()
+    assert detector not in _detectors
+    with detector.check() as counts:
+        schema.dump(widgets)
+    assert counts == {}
+
+    # The listener does not keep detectors alive
+    detector = weakref.ref(QueryDetector())
+    gc.collect()
+    assert detector() is None
+
+
+def test_responds_query_detector(app, session):  # noqa
+    detector = QueryDetector(threshold=2)
+
+    @app.route("/test")
+    @responds(schema=WidgetSchema(many=True), query_detector=detector)
+    def test():
+        session.expire_all()
+        return session.query(Widget).all()
+
+    with app.test_client() as cl:
+        with pytest.warns(NPlusOneWarning, match="Widget.cogs: 5"):
+            resp = cl.get("/test")
+    assert resp.status_code == 200
+    assert len(resp.get_json()) == 5
+    assert detector.queries() == {"Widget.cogs": 5}
+    assert {s.path for s in detector.report()} >= {"Widget.cogs", "Widget.cogs.id"}
+
+
+def test_responds_query_detector_stream(app, session):  # noqa
+    detector = QueryDetector(threshold=2)
+
+    @app.route("/test")
+    @responds(
+        schema=WidgetSchema(many=True),
+        query_detector=detector,
+        stream=True,
+        stream_batch_size=3,
+    )
+    def test():
+        session.expire_all()
+        return session.query(Widget).order_by(Widget.id)
+
+    with app.test_client() as cl:
+        with pytest.warns(NPlusOneWarning, match="Widget.cogs: 3"):
+            resp = cl.get("/test")
+            assert len(resp.get_json()) == 5
+    assert detector.queries() == {"Widget.cogs": 5}
+
+
+class EagerWidgetSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    owner_name = fields.Pluck(OwnerSchema, "name", attribute="owner")
+    cogs = fields.List(fields.Nested(CogSchema(only=["id"])))
+
+
+def _loaded_columns(session, options) -> str:
+    return str(session.query(Widget).options(*options).statement.compile())
+
+
+def test_eager_load_options(session):
+    detector = QueryDetector(threshold=0, action="raise")
+    schema = detector.instrument(EagerWidgetSchema(many=True))
+
+    session.expire_all()
+    options = eager_load_options(Widget, schema)
+    widgets = session.query(Widget).options(*options).all()
+    with detector.check() as counts:
+        dumped = schema.dump(widgets)
+    assert counts == {}
+    assert dumped[0] == {
+        "id": 0,
+        "name": "widget 0",
+        "owner_name": "owner 0",
+        "cogs": [{"id": 1}, {"id": 2}],
+    }
+
+    columns = _loaded_columns(session, options)
+    assert "widget.name" in columns and "widget.owner_id" in columns
+    assert "widget.notes" not in columns
+    assert "owner_1.email" not in columns
+
+
+def test_eager_load_options_mask(session):
+    options = eager_load_options(Widget, EagerWidgetSchema(), mask="{name}")
+    columns = _loaded_columns(session, options)
+    assert "widget.name" in columns and "widget.notes" not in columns
+    assert "owner" not in columns
+    assert len(options) == 1
+
+    options = eager_load_options(Widget, EagerWidgetSchema(), mask={"cogs": {"id": True}})
+    # The relationship, and the primary key it is joined on
+    assert len(options) == 2
+    assert "widget.name" not in _loaded_columns(session, options)
+
+
+def test_eager_load_options_method_fields(session):
+    class MethodWidgetSchema(Schema):
+        name = fields.String()
+        summary = fields.Method("get_summary")
+        cogs = fields.List(fields.Nested(CogSchema))
+
+        def get_summary(self, obj):
+            return obj.notes  # pragma: no cover
+
+    options = eager_load_options(Widget, MethodWidgetSchema())
+    # Columns are not restricted, since the Method field may read any of them
+    assert "widget.notes" in _loaded_columns(session, options)
+    assert len(options) == 1
+    assert eager_load_options(Widget, MethodWidgetSchema(), load_only=False)
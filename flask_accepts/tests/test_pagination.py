@@ -0,0 +1,191 @@
+import datetime
+import decimal
+import uuid
+
+import pytest
+from flask import request
+from flask_restx import Api, Resource
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.pagination import (
+    Page,
+    decode_cursor,
+    encode_cursor,
+    parse_page,
+    take_page,
+)
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+
+
+ITEMS = [{"id": i, "name": f"item {i}"} for i in range(1, 8)]
+
+
+def test_cursor():
+    for key in (1, "a/b?c", None, 1.5):
+        assert decode_cursor(encode_cursor(key)) == key
+    assert "=" not in encode_cursor("ab")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!")
+
+
+def test_cursor_with_key_field():
+    keys = (
+        (fields.DateTime(), datetime.datetime(2024, 1, 2, 3, 4, 5, 6)),
+        (fields.UUID(), uuid.uuid4()),
+        (fields.Decimal(), decimal.Decimal("1.10")),
+    )
+    for field, key in keys:
+        assert decode_cursor(encode_cursor(key, field), field) == key
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor("not a date"), fields.DateTime())
+
+
+def test_parse_page():
+    assert parse_page({}, 20, 100) == Page(20, None)
+    assert parse_page({"limit": "5", "cursor": encode_cursor(3)}, 20, 100) == Page(5, 3)
+    with pytest.raises(ValueError) as ex:
+        parse_page({"limit": "500", "cursor": "%%%"}, 20, 100)
+    assert set(ex.value.args[0]) == {"limit", "cursor"}
+
+
+def test_take_page():
+    items, cursor = take_page(iter(ITEMS), "id", Page(3, None))
+    assert [item["id"] for item in items] == [1, 2, 3]
+    items, cursor = take_page(iter(ITEMS), "id", Page(3, decode_cursor(cursor)))
+    assert [item["id"] for item in items] == [4, 5, 6]
+    items, cursor = take_page(iter(ITEMS), "id", Page(3, decode_cursor(cursor)))
+    assert [item["id"] for item in items] == [7]
+    assert cursor is None
+
+
+def test_take_page_consumes_only_the_page():
+    consumed = []
+
+    def generate():
+        for item in ITEMS:
+            consumed.append(item["id"])
+            yield item
+
+    take_page(generate(), "id", Page(2, 1))
+    # The page, and one more item to know whether there is a next page
+    assert consumed == [1, 2, 3, 4]
+
+
+def test_responds_paginate_by(app, client):  # noqa
+    pages = []
+
+    @app.route("/test")
+    @responds(schema=ItemSchema(many=True), paginate_by="id", page_size=3, max_page_size=5)
+    def test():
+        pages.append(request.page)
+        return ITEMS
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert resp.json["items"] == ITEMS[:3]
+        assert pages[-1] == Page(3, None)
+
+        resp = cl.get(f"/test?limit=5&cursor={resp.json['next_cursor']}")
+        assert resp.json == {"items": ITEMS[3:], "next_cursor": None}
+
+        resp = cl.get("/test?limit=0&cursor=%25")
+        assert resp.status_code == 400
+        assert set(resp.json["errors"]) == {"limit", "cursor"}
+
+
+def test_responds_paginate_by_envelope_and_swagger(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=ItemSchema(many=True), api=api, envelope="data", paginate_by="id")
+        def get(self):
+            return ITEMS
+
+    with client as cl:
+        assert cl.get("/test?limit=1").json == {"data": ITEMS[:1], "next_cursor": encode_cursor(1)}
+
+        swagger = cl.get("/swagger.json").json
+        get = swagger["paths"]["/test"]["get"]
+        assert {"limit", "cursor"} <= {param["name"] for param in get["parameters"]}
+        assert get["responses"]["200"]["schema"] == {"$ref": "#/definitions/ItemPage"}
+        assert set(swagger["definitions"]["ItemPage"]["properties"]) == {"data", "next_cursor"}
+
+
+def test_responds_paginate_by_datetime(app, client):  # noqa
+    class EventSchema(Schema):
+        at = fields.DateTime(data_key="time")
+
+    start = datetime.datetime(2024, 1, 1)
+    events = [{"at": start + datetime.timedelta(hours=i)} for i in range(5)]
+
+    @app.route("/test")
+    @responds(schema=EventSchema(many=True), paginate_by="at", page_size=2)
+    def test():
+        return events
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert [item["time"] for item in resp.json["items"]] == [
+            "2024-01-01T00:00:00",
+            "2024-01-01T01:00:00",
+        ]
+        resp = cl.get(f"/test?cursor={resp.json['next_cursor']}")
+        assert [item["time"] for item in resp.json["items"]] == [
+            "2024-01-01T02:00:00",
+            "2024-01-01T03:00:00",
+        ]
+        assert cl.get(f"/test?cursor={encode_cursor('x')}").status_code == 400
+
+
+def test_responds_paginate_by_requires_many():
+    with pytest.raises(TypeError):
+        responds(schema=ItemSchema, paginate_by="id")
+
+
+def test_responds_paginate_by_requires_key_field():
+    with pytest.raises(ValueError):
+        responds(schema=ItemSchema(many=True), paginate_by="created")
+
+
+def test_responds_paginate_by_query(app, client):  # noqa
+    sa = pytest.importorskip("sqlalchemy")
+    orm = pytest.importorskip("sqlalchemy.orm")
+
+    Base = orm.declarative_base()
+
+    class Item(Base):
+        __tablename__ = "item"
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements = []
+    sa.event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    with orm.Session(engine) as session:
+        session.add_all(Item(**item) for item in ITEMS)
+        session.commit()
+
+        @app.route("/test")
+        @responds(schema=ItemSchema(many=True), paginate_by="id", page_size=2)
+        def test():
+            return session.query(Item).order_by(Item.name.desc())
+
+        with client as cl:
+            statements.clear()
+            resp = cl.get("/test?cursor=" + encode_cursor(4))
+            assert resp.json == {"items": ITEMS[4:6], "next_cursor": encode_cursor(6)}
+            assert len(statements) == 1
+            assert "LIMIT" in statements[0] and "item.id > ?" in statements[0]
@@ -0,0 +1,67 @@
+import gc
+
+from flask_restx import Resource
+from marshmallow import Schema, fields
+
+from flask_accepts import accepts, preload, responds
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class PreloadedOwnerSchema(Schema):
+    email = fields.Email()
+
+
+class PreloadedSchema(Schema):
+    name = fields.String()
+    owner = fields.Nested(PreloadedOwnerSchema)
+
+
+def test_preload(app):  # noqa
+    from flask_restx import Api, Namespace
+
+    api = Api(app)
+    ns = Namespace("preloaded")
+    api.add_namespace(ns)
+
+    @ns.route("/")
+    class TestResource(Resource):
+        @accepts(schema=PreloadedSchema, api=ns)
+        @responds(schema=PreloadedSchema, api=ns)
+        def post(self):
+            pass  # pragma: no cover
+
+    try:
+        report = preload(app)
+        assert report.routes >= 2
+        assert report.apis >= 1
+        assert report.frozen_objects > 0
+        assert gc.get_freeze_count() > 0
+        assert report.frozen_bytes > 0
+        assert "MiB" in str(report)
+    finally:
+        gc.unfreeze()
+
+    assert "Preloaded" in api._schema["definitions"]
+    schema = TestResource.post.__responds_spec__.schema
+    assert isinstance(schema.fields["owner"].schema, PreloadedOwnerSchema)
+
+
+def test_preload_without_freeze(app):  # noqa
+    report = preload(app, synthetic=False, freeze=False)
+    assert report.frozen_objects == report.frozen_bytes == 0
+    assert gc.get_freeze_count() == 0
+
+
+def test_preload_base_url(app):  # noqa
+    from flask_restx import Api
+
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=PreloadedSchema, api=api)
+        def get(self):
+            pass  # pragma: no cover
+
+    preload(app, freeze=False, base_url="http://localhost/prefix")
+    assert api.__schema__["basePath"] == "/prefix"
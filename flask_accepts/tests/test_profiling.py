@@ -0,0 +1,99 @@
+import time
+
+import pytest
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.profiling import FieldProfiler, field_profiler
+from flask_accepts.tests.fixtures import app  # noqa
+
+
+class CogSchema(Schema):
+    cog_foo = fields.Method("get_cog_foo")
+
+    def get_cog_foo(self, obj):
+        time.sleep(0.002)
+        return obj["cog_foo"]
+
+
+class WidgetSchema(Schema):
+    name = fields.String()
+    cog = fields.Nested(CogSchema)
+    cogs = fields.List(fields.Nested(CogSchema))
+    children = fields.List(fields.Nested(lambda: WidgetSchema()))
+
+
+def test_field_profiler():
+    profiler = FieldProfiler()
+    schema = profiler.instrument(WidgetSchema())
+    assert profiler.instrument(schema) is schema
+    widget = {
+        "name": "widget",
+        "cog": {"cog_foo": 1},
+        "cogs": [{"cog_foo": 2}, {"cog_foo": 3}],
+        "children": [{"name": "child", "cog": {"cog_foo": 4}}],
+    }
+    assert schema.dump(widget) == WidgetSchema().dump(widget)
+    schema.dump(widget)
+
+    stats = {s.path: s for s in profiler.report()}
+    assert stats["Widget.cog.cog_foo"].calls == 2
+    assert stats["Widget.cogs.cog_foo"].calls == 4
+    assert stats["Widget.children.cog.cog_foo"].calls == 2
+    assert stats["Widget.name"].calls == 2
+    cog = stats["Widget.cog"]
+    assert cog.total >= stats["Widget.cog.cog_foo"].total >= 0.004
+    assert cog.own < stats["Widget.cog.cog_foo"].own
+    totals = [s.total for s in profiler.report()]
+    assert totals == sorted(totals, reverse=True)
+    assert len(profiler.report(limit=2)) == 2
+    assert "Widget.cogs.cog_foo" in profiler.format()
+
+    profiler.reset()
+    assert profiler.report() == []
+    # Other backends are left unchanged
+    assert profiler.instrument("not a schema") == "not a schema"
+
+
+def test_responds_profile_fields(app):  # noqa
+    field_profiler.reset()
+    shared = CogSchema()
+
+    @app.route("/test")
+    @responds(schema=shared, profile_fields=True)
+    def test():
+        return {"cog_foo": 1}
+
+    with app.test_client() as cl:
+        assert cl.get("/test").get_json() == {"cog_foo": 1}
+        assert cl.get("/test").get_json() == {"cog_foo": 1}
+
+    assert [(s.path, s.calls) for s in field_profiler.report()] == [("Cog.cog_foo", 2)]
+    # The schema instance passed in is not instrumented
+    shared.dump({"cog_foo": 1})
+    assert field_profiler.report()[0].calls == 2
+    field_profiler.reset()
+
+
+def test_responds_profile_fields_custom_profiler(app):  # noqa
+    profiler = FieldProfiler()
+
+    @app.route("/test")
+    @responds(schema=WidgetSchema, alt_schemas={201: CogSchema}, profile_fields=profiler)
+    def test():
+        return {"cog_foo": 1}, 201
+
+    with app.test_client() as cl:
+        assert cl.get("/test").status_code == 201
+
+    assert [s.path for s in profiler.report()] == ["Cog.cog_foo"]
+
+
+def test_responds_profile_fields_requires_marshmallow():
+    msgspec = pytest.importorskip("msgspec")
+
+    class Widget(msgspec.Struct):
+        name: str
+
+    with pytest.raises(TypeError):
+        responds(schema=Widget, profile_fields=True)
@@ -0,0 +1,173 @@
+import gzip
+import json
+
+import pytest
+from flask_restx import Api, Resource
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.raw_json import RawJSON, RawJSONField, dumps, has_raw_json_fields
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class CachedSchema(Schema):
+    id = fields.Integer()
+    payload = RawJSONField()
+
+
+def test_dumps_splices_raw_json(app):  # noqa
+    with app.app_context():
+        data = {"a": RawJSON('{"b": [1, 2]}'), "c": [RawJSON(b"3"), "\0raw-json"]}
+        assert dumps(data) == '{"a":{"b": [1, 2]},"c":[3,"\\u0000raw-json"]}'
+        assert dumps(RawJSON("[1]")) == "[1]"
+        assert dumps({"a": 1}) == '{"a":1}'
+
+
+def test_raw_json_field():
+    dumped = CachedSchema().dump({"id": 1, "payload": '{"x":1}'})
+    assert dumped == {"id": 1, "payload": RawJSON('{"x":1}')}
+    assert CachedSchema().dump({"id": 1, "payload": None}) == {"id": 1, "payload": None}
+
+
+def test_has_raw_json_fields():
+    class ParentSchema(Schema):
+        children = fields.List(fields.Nested(CachedSchema))
+        parent = fields.Nested(lambda: ParentSchema())
+
+    class PlainSchema(Schema):
+        id = fields.Integer()
+        tags = fields.Dict(values=fields.List(fields.String()))
+        parent = fields.Nested(lambda: PlainSchema())
+        later = fields.Nested("NotDefinedYetSchema")
+
+    assert has_raw_json_fields(CachedSchema())
+    assert has_raw_json_fields(ParentSchema())
+    assert not has_raw_json_fields(PlainSchema())
+    assert not has_raw_json_fields(None)
+
+
+def test_responds_raw_json_result(app, client):  # noqa
+    @app.route("/test")
+    @responds(schema=CachedSchema)
+    def test():
+        return RawJSON(b'{"id":1,"payload":{"x":1}}')
+
+    @app.route("/envelope")
+    @responds(schema=CachedSchema, envelope="data", compress=True, compress_min_size=0)
+    def envelope():
+        return RawJSON('{"id":1}')
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert resp.data == b'{"id":1,"payload":{"x":1}}'
+        assert resp.mimetype == "application/json"
+
+        resp = cl.get("/envelope", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(resp.data) == b'{"data":{"id":1}}'
+
+
+def test_responds_raw_json_fields(app, client):  # noqa
+    api = Api(app)
+
+    @app.route("/test")
+    @responds(schema=CachedSchema(many=True), raw_json=True)
+    def test():
+        return [{"id": 1, "payload": '{"x": 1}'}, {"id": 2, "payload": b"[]"}]
+
+    @api.route("/resource")
+    class TestResource(Resource):
+        @responds(schema=CachedSchema, api=api, raw_json=True, status_code=201)
+        def get(self):
+            return {"id": 1, "payload": '{"x": 1}'}
+
+    @app.route("/compressed")
+    @responds(schema=CachedSchema, raw_json=True, compress=True, compress_min_size=0)
+    def compressed():
+        return {"id": 1, "payload": '{"x": 1}'}
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert resp.data == b'[{"id":1,"payload":{"x": 1}},{"id":2,"payload":[]}]'
+
+        resp = cl.get("/resource")
+        assert resp.status_code == 201
+        assert resp.get_json() == {"id": 1, "payload": {"x": 1}}
+
+        resp = cl.get("/compressed", headers={"Accept-Encoding": "gzip"})
+        assert gzip.decompress(resp.data) == b'{"id":1,"payload":{"x": 1}}'
+
+
+def test_responds_raw_json_msgpack(app, client):  # noqa
+    msgpack = pytest.importorskip("msgpack")
+
+    @app.route("/test")
+    @responds(schema=CachedSchema, raw_json=True, msgpack=True)
+    def test():
+        return {"id": 1, "payload": '{"x": 1}'}
+
+    with client as cl:
+        resp = cl.get("/test", headers={"Accept": "application/msgpack"})
+        assert msgpack.unpackb(resp.data) == {"id": 1, "payload": {"x": 1}}
+
+
+def test_responds_raw_json_fields_without_raw_json(app, client):  # noqa
+    @app.route("/test")
+    @responds(schema=CachedSchema)
+    def test():
+        return {"id": 1, "payload": "[1]"}
+
+    assert test.__responds_spec__.raw_json
+    with client as cl:
+        assert cl.get("/test").data == b'{"id":1,"payload":[1]}'
+
+
+def test_responds_raw_json_fields_pretty(app, client):  # noqa
+    app.debug = True
+
+    @app.route("/compressed")
+    @responds(schema=CachedSchema, compress=True, compress_min_size=0)
+    def compressed():
+        return {"id": 1, "payload": "[1]"}
+
+    @app.route("/stream")
+    @responds(schema=CachedSchema(many=True), stream=True, stream_batch_size=1)
+    def stream():
+        return ({"id": i, "payload": "[1]"} for i in range(2))
+
+    with client as cl:
+        resp = cl.get("/compressed", headers={"Accept-Encoding": "gzip"})
+        assert resp.status_code == 200
+        assert json.loads(gzip.decompress(resp.data)) == {"id": 1, "payload": [1]}
+
+        resp = cl.get("/stream")
+        assert resp.status_code == 200
+        assert resp.get_json() == [{"id": 0, "payload": [1]}, {"id": 1, "payload": [1]}]
+
+
+def test_responds_raw_json_fields_custom_provider(app, client):  # noqa
+    from decimal import Decimal
+
+    from flask.json.provider import JSONProvider
+
+    class CustomProvider(JSONProvider):
+        def dumps(self, obj, **kwargs):
+            return json.dumps(obj, default=str, **kwargs)
+
+        def loads(self, s, **kwargs):
+            return json.loads(s, **kwargs)
+
+    class PricedSchema(Schema):
+        price = fields.Raw()
+        payload = RawJSONField()
+
+    app.json = CustomProvider(app)
+
+    @app.route("/test")
+    @responds(schema=PricedSchema, compress=True, compress_min_size=0)
+    def test():
+        return {"price": Decimal("1.5"), "payload": "[1]"}
+
+    with client as cl:
+        resp = cl.get("/test", headers={"Accept-Encoding": "gzip"})
+        assert json.loads(gzip.decompress(resp.data)) == {"price": "1.5", "payload": [1]}
@@ -514,3 +514,319 @@ def test_responds_can_use_alt_schema(app, client):  # noqa
         resp = cl.get("/test?code=401")
         assert resp.status_code == 401
         assert resp.json == {"id": 1234, "name": "Fred Smith"}
+
+
+def test_responds_status_code_override_does_not_leak_between_requests(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @app.route("/test")
+    @responds(schema=TestSchema)
+    def test():
+        if request.args.get("created"):
+            return {"_id": 42}, 201
+        return {"_id": 42}
+
+    with client as cl:
+        assert cl.get("/test?created=1").status_code == 201
+        assert cl.get("/test").status_code == 200
+
+
+def test_responds_skip_none_does_not_modify_returned_raw_values(app, client):  # noqa
+    class TestSchema(Schema):
+        name = fields.String()
+        extra = fields.Raw()
+
+    extra = {"keep": 1, "drop": None}
+
+    @app.route("/test")
+    @responds(schema=TestSchema, skip_none=True)
+    def test():
+        return {"name": None, "extra": extra}
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert resp.json == {"extra": {"keep": 1}}
+        assert extra == {"keep": 1, "drop": None}
+
+
+def test_remove_none_handles_deeply_nested_values():
+    from flask_accepts.decorators.decorators import _remove_none
+
+    for in_place in (False, True):
+        obj = leaf = {"value": None, "items": [None, 1]}
+        for _ in range(5000):
+            obj = {"child": obj, "empty": None}
+
+        result = _remove_none(obj, in_place=in_place)
+        for _ in range(5000):
+            assert "empty" not in result
+            result = result["child"]
+        assert result == {"items": [1]}
+        assert (result is leaf) is in_place
+
+
+def test_dumps_fresh_containers():
+    from flask_accepts.decorators.decorators import _dumps_fresh_containers
+
+    class ChildSchema(Schema):
+        _id = fields.Integer()
+        tags = fields.List(fields.String())
+
+    class FreshSchema(Schema):
+        name = fields.String()
+        child = fields.Nested(ChildSchema)
+        children = fields.List(fields.Nested(ChildSchema))
+        parent = fields.Nested("self", only=("name",))
+
+    class SharedSchema(Schema):
+        child = fields.Nested(ChildSchema)
+        extra = fields.Dict()
+
+    assert _dumps_fresh_containers(FreshSchema())
+    assert not _dumps_fresh_containers(SharedSchema())
+
+
+def test_responds_skip_none_keeps_post_dump_containers(app, client):  # noqa
+    from marshmallow import post_dump
+
+    from flask_accepts.decorators.decorators import _dumps_fresh_containers
+
+    shared = {"meta": None, "v": 1}
+
+    class ChildSchema(Schema):
+        _id = fields.Integer()
+
+        @post_dump
+        def attach(self, data, **kwargs):
+            return shared
+
+    class ParentSchema(Schema):
+        child = fields.Nested(ChildSchema)
+
+    assert not _dumps_fresh_containers(ChildSchema())
+    assert not _dumps_fresh_containers(ParentSchema())
+
+    @app.route("/test")
+    @responds(schema=ParentSchema, skip_none=True)
+    def test():
+        return {"child": {"_id": 1}}
+
+    with client as cl:
+        assert cl.get("/test").json == {"child": {"v": 1}}
+    assert shared == {"meta": None, "v": 1}
+
+
+def test_responds_alt_schemas_are_instantiated_once_and_documented(app, client):  # noqa
+    class DefaultSchema(Schema):
+        id = fields.Integer()
+
+    class ErrorSchema(Schema):
+        code = fields.String()
+        error = fields.String()
+
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=DefaultSchema, api=api, alt_schemas={404: ErrorSchema}, skip_none=True)
+        def get(self):
+            return {"code": "NOT_FOUND", "error": None}, 404
+
+    alt_schema = TestResource.get.__responds_spec__.alt_schemas[404]
+    assert isinstance(alt_schema, ErrorSchema)
+
+    with client as cl:
+        for _ in range(2):
+            resp = cl.get("/test")
+            assert resp.status_code == 404
+            assert resp.json == {"code": "NOT_FOUND"}
+        assert TestResource.get.__responds_spec__.alt_schemas[404] is alt_schema
+
+        responses_docs = api.__schema__["paths"]["/test"]["get"]["responses"]
+        assert responses_docs["404"]["description"] == "Not Found"
+        assert responses_docs["404"]["schema"] == {"$ref": "#/definitions/Error"}
+        assert responses_docs["200"]["schema"] == {"$ref": "#/definitions/Default"}
+
+
+def test_responds_columnar(app, client):  # noqa
+    from flask_accepts.columnar import COLUMNS_MEDIA_TYPE, ROWS_MEDIA_TYPE
+
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        name = fields.String(data_key="Name")
+
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=TestSchema(many=True), api=api, columnar=True, skip_none=True)
+        def get(self):
+            return [{"_id": 1, "name": "a"}, {"_id": 2, "name": None}]
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert resp.json == [{"_id": 1, "Name": "a"}, {"_id": 2}]
+        assert resp.headers["Vary"] == "Accept"
+
+        expected_columns = {
+            "columns": ["_id", "Name"],
+            "data": {"_id": [1, 2], "Name": ["a", None]},
+        }
+        expected_rows = {"columns": ["_id", "Name"], "data": [[1, "a"], [2, None]]}
+        assert cl.get("/test", headers={"Accept": COLUMNS_MEDIA_TYPE}).json == expected_columns
+        assert cl.get("/test", headers={"Accept": ROWS_MEDIA_TYPE}).json == expected_rows
+        assert cl.get("/test?columnar=rows").json == expected_rows
+        assert cl.get(
+            "/test?columnar=columns", headers={"Accept": ROWS_MEDIA_TYPE}
+        ).json == expected_columns
+
+        params = cl.get("/swagger.json").json["paths"]["/test"]["get"]["parameters"]
+        assert {"columnar"} <= {param["name"] for param in params}
+
+
+def test_responds_columnar_with_envelope_and_single_objects(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @app.route("/test")
+    @responds(schema=TestSchema(many=True), envelope="items", columnar=True)
+    def test():
+        return [{"_id": 1}, {"_id": 2}]
+
+    @app.route("/single")
+    @responds(schema=TestSchema, columnar=True)
+    def single():
+        return {"_id": 1}
+
+    with client as cl:
+        resp = cl.get("/test?columnar=columns")
+        assert resp.json == {"items": {"columns": ["_id"], "data": {"_id": [1, 2]}}}
+        # Only list responses are returned in a columnar form
+        assert cl.get("/single?columnar=columns").json == {"_id": 1}
+
+
+def test_to_columnar():
+    from flask_accepts.columnar import to_columnar
+
+    rows = [{"a": 1, "b": 2}, {"a": 3}]
+    assert to_columnar(rows, ["a", "b"], "columns") == {
+        "columns": ["a", "b"],
+        "data": {"a": [1, 3], "b": [2, None]},
+    }
+    assert to_columnar(rows, ["b", "a"], "rows") == {
+        "columns": ["b", "a"],
+        "data": [[2, 1], [None, 3]],
+    }
+    assert to_columnar([], ["a"], "columns") == {"columns": ["a"], "data": {"a": []}}
+
+
+def test_responds_skips_serialization_without_body(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+        def dump(self, obj, **kwargs):
+            dumped.append(obj)
+            return super().dump(obj, **kwargs)
+
+    dumped = []
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=TestSchema, api=api)
+        def get(self):
+            return {"_id": 1}
+
+        @responds(schema=TestSchema, api=api, status_code=204)
+        def delete(self):
+            return {"_id": 1}
+
+    @app.route("/cached")
+    @responds(schema=TestSchema)
+    def cached():
+        return {"_id": 1}, 304
+
+    with client as cl:
+        resp = cl.head("/test")
+        assert resp.status_code == 200
+        assert resp.data == b""
+        assert resp.content_type == "application/json"
+        assert "Content-Length" not in resp.headers
+
+        resp = cl.delete("/test")
+        assert resp.status_code == 204
+        assert resp.data == b""
+
+        resp = cl.get("/cached")
+        assert resp.status_code == 304
+        assert dumped == []
+
+        assert cl.get("/test").json == {"_id": 1}
+        assert len(dumped) == 1
+
+
+def test_responds_head_content_length(app, client):  # noqa
+    class TestSchema(Schema):
+        _id = fields.Integer()
+
+    @app.route("/test")
+    @responds(schema=TestSchema, head_content_length=True)
+    def test():
+        return {"_id": 1}
+
+    with client as cl:
+        resp = cl.head("/test")
+        assert resp.status_code == 200
+        assert resp.data == b""
+        assert int(resp.headers["Content-Length"]) == len(cl.get("/test").data)
+
+
+def test_responds_sparse_fields(app, client):  # noqa
+    from flask_accepts.schema_cache import schema_cache
+
+    class OwnerSchema(Schema):
+        name = fields.String()
+        email = fields.String(data_key="Email")
+
+    class TestSchema(Schema):
+        _id = fields.Integer()
+        title = fields.String(data_key="Title")
+        owner = fields.Nested(OwnerSchema)
+        tags = fields.List(fields.Nested(OwnerSchema))
+
+    obj = {
+        "_id": 1,
+        "title": "a",
+        "owner": {"name": "x", "email": "x@y.z"},
+        "tags": [{"name": "t", "email": "t@y.z"}],
+    }
+    seen = []
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @responds(schema=TestSchema, api=api, sparse_fields_param="fields")
+        def get(self):
+            seen.append(request.sparse_fields)
+            return obj
+
+    with client as cl:
+        assert cl.get("/test").json == TestSchema().dump(obj)
+        assert seen[-1] is None
+
+        resp = cl.get("/test?fields=Title,owner.Email,tags.name")
+        assert resp.json == {"Title": "a", "owner": {"Email": "x@y.z"}, "tags": [{"name": "t"}]}
+        assert seen[-1] == {"title", "owner.email", "tags.name"}
+
+        size = len(schema_cache)
+        cl.get("/test?fields=tags.name, owner.Email,Title")
+        assert len(schema_cache) == size
+
+        resp = cl.get("/test?fields=_id,nope,_id.name")
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"fields": ["Unknown fields: nope, _id.name"]}
+
+        params = cl.get("/swagger.json").json["paths"]["/test"]["get"]["parameters"]
+        assert "fields" in {param["name"] for param in params}
+
@@ -0,0 +1,74 @@
+import pytest
+from flask import request
+from marshmallow import INCLUDE, Schema, fields
+
+from flask_accepts.decorators import accepts
+from flask_accepts.rows import row_class, to_rows
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class PointSchema(Schema):
+    x = fields.Integer(required=True)
+    y = fields.Integer()
+    label = fields.String(data_key="Label", attribute="name")
+
+
+@pytest.mark.parametrize("row_type", ["slots", "namedtuple"])
+def test_row_class(row_type):
+    cls = row_class(PointSchema(), row_type)
+
+    assert cls.__name__ == "PointRow"
+    row = cls(x=1, name="a")
+    assert (row.x, row.y, row.name) == (1, None, "a")
+    assert row._asdict() == {"x": 1, "y": None, "name": "a"}
+    assert row == cls(x=1, name="a")
+    assert not hasattr(row, "__dict__")
+    # Generated classes are cached
+    assert row_class(PointSchema(many=True), row_type) is cls
+
+
+def test_row_class_invalid():
+    class PrivateSchema(Schema):
+        _id = fields.Integer()
+
+    with pytest.raises(ValueError):
+        row_class(PointSchema(), "dict")
+    with pytest.raises(ValueError):
+        row_class(PointSchema(unknown=INCLUDE))
+    with pytest.raises(ValueError):
+        row_class(PrivateSchema(), "namedtuple")
+    assert row_class(PrivateSchema(), "slots")(_id=3)._id == 3
+
+
+def test_to_rows():
+    cls = row_class(PointSchema())
+    data = [{"x": 1}, {"x": 2, "y": 3}]
+
+    result = to_rows(data, cls)
+    assert result is data
+    assert result == [cls(x=1), cls(x=2, y=3)]
+
+
+@pytest.mark.parametrize("row_type", ["slots", "namedtuple"])
+def test_accepts_row_type(app, client, row_type):  # noqa
+    @app.route("/test", methods=["POST"])
+    @accepts(schema=PointSchema(many=True), row_type=row_type, fast_validate=True)
+    def test():
+        rows = request.parsed_obj
+        assert [(row.x, row.y, row.name) for row in rows] == [(1, 2, "a"), (3, None, None)]
+        return "success"
+
+    with client as cl:
+        resp = cl.post("/test", json=[{"x": 1, "y": 2, "Label": "a"}, {"x": "3"}])
+        assert resp.status_code == 200
+
+        resp = cl.post("/test", json=[{"x": 1}, {"y": 2}])
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"1": {"x": ["Missing data for required field."]}}
+
+
+def test_accepts_row_type_requires_many():
+    with pytest.raises(TypeError):
+        accepts(schema=PointSchema, row_type="slots")
+    with pytest.raises(ValueError):
+        accepts(schema=PointSchema(many=True), row_type="slots", validate_only=True)
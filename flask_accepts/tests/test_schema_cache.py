@@ -0,0 +1,115 @@
+import pytest
+from flask import g, request
+from marshmallow import Schema, fields
+
+from flask_accepts.decorators import responds
+from flask_accepts.schema_cache import SchemaCache, derive_schema, schema_cache
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class EmployeeSchema(Schema):
+    name = fields.String()
+    email = fields.String()
+    salary = fields.Integer()
+
+
+def test_derive_schema():
+    base = EmployeeSchema(exclude=("email",))
+
+    schema = derive_schema(base, exclude=["salary"], many=True)
+    assert schema is derive_schema(base, exclude=("salary",), many=True)
+    assert set(schema.fields) == {"name"}
+    assert schema.many
+
+    schema = derive_schema(EmployeeSchema, only=["name", "email"])
+    assert schema is derive_schema(EmployeeSchema, only=["email", "name"])
+    assert set(schema.fields) == {"name", "email"}
+    assert not schema.many
+
+    assert derive_schema(base) is base
+    assert isinstance(derive_schema(EmployeeSchema), EmployeeSchema)
+
+
+def test_derive_schema_keeps_base_only():
+    class TeamSchema(Schema):
+        name = fields.String()
+        lead = fields.Nested(EmployeeSchema)
+        members = fields.List(fields.Nested(EmployeeSchema))
+
+    base = TeamSchema(only=("name", "lead.name", "members"))
+    schema = derive_schema(base, only=["lead", "members.salary"])
+    assert set(schema.dump_fields) == {"lead", "members"}
+    assert set(schema.dump_fields["lead"].schema.dump_fields) == {"name"}
+    assert set(schema.dump_fields["members"].inner.schema.dump_fields) == {"salary"}
+
+    schema = derive_schema(base, only=["lead.email"])
+    assert set(schema.dump_fields) == set()
+
+
+def test_derive_schema_context():
+    with pytest.raises(ValueError):
+        derive_schema(EmployeeSchema, context={"tenant": 1})
+
+    schema = derive_schema(EmployeeSchema, context={"tenant": 1}, context_key=1)
+    assert schema.context == {"tenant": 1}
+    assert derive_schema(EmployeeSchema, context={"tenant": 1}, context_key=1) is schema
+    assert derive_schema(EmployeeSchema, context={"tenant": 2}, context_key=2) is not schema
+
+
+def test_schema_cache_is_bounded():
+    cache = SchemaCache(maxsize=2)
+    built = []
+
+    def factory(key):
+        return lambda: built.append(key) or key
+
+    assert cache.get("a", factory("a")) == "a"
+    assert cache.get("b", factory("b")) == "b"
+    assert cache.get("a", factory("a")) == "a"
+    assert cache.get("c", factory("c")) == "c"
+    # "b" was the least recently used
+    assert cache.get("b", factory("b")) == "b"
+    assert built == ["a", "b", "c", "b"]
+    assert len(cache) == 2
+
+
+def test_responds_schema_variant(app, client):  # noqa
+    def per_role(schema):
+        exclude = () if g.role == "admin" else ("salary",)
+        return derive_schema(schema, exclude=exclude)
+
+    @app.route("/test")
+    @responds(schema=EmployeeSchema, schema_variant=per_role, sparse_fields_param="fields")
+    def test():
+        return {"name": "a", "email": "a@b.c", "salary": 1}
+
+    @app.before_request
+    def set_role():
+        g.role = request.headers.get("X-Role")
+
+    with client as cl:
+        assert cl.get("/test", headers={"X-Role": "admin"}).json == {
+            "name": "a",
+            "email": "a@b.c",
+            "salary": 1,
+        }
+        assert cl.get("/test").json == {"name": "a", "email": "a@b.c"}
+        size = len(schema_cache)
+        assert cl.get("/test?fields=name,salary").json == {"name": "a"}
+        assert cl.get("/test?fields=name,salary").json == {"name": "a"}
+        assert len(schema_cache) == size + 1
+
+
+def test_responds_sparse_fields_of_variant(app, client):  # noqa
+    def public(schema):
+        return derive_schema(schema, only=["name", "email"])
+
+    @app.route("/test")
+    @responds(schema=EmployeeSchema, schema_variant=public, sparse_fields_param="fields")
+    def test():
+        return {"name": "a", "email": "a@b.c", "salary": 1}
+
+    with client as cl:
+        assert cl.get("/test").json == {"name": "a", "email": "a@b.c"}
+        assert cl.get("/test?fields=salary").json == {}
+        assert cl.get("/test?fields=name,salary").json == {"name": "a"}
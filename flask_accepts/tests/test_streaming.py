@@ -0,0 +1,126 @@
+import gzip
+
+import pytest
+from marshmallow import Schema, fields
+
+from flask_accepts import responds
+from flask_accepts.streaming import batches, is_stream
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+
+class ItemSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+
+
+ITEMS = [{"id": i, "name": f"item {i}"} for i in range(10)]
+
+
+def test_is_stream():
+    assert is_stream(iter([]))
+    assert is_stream(item for item in ITEMS)
+    assert not is_stream(ITEMS)
+    assert not is_stream((1, 2))
+    assert not is_stream({"id": 1})
+    assert not is_stream("abc")
+
+
+def test_batches():
+    assert [len(batch) for batch in batches(iter(ITEMS), 4)] == [4, 4, 2]
+    assert list(batches(iter([]), 4)) == []
+
+
+def test_responds_stream(app, client):  # noqa
+    pulled = []
+
+    def generate():
+        for item in ITEMS:
+            pulled.append(item["id"])
+            yield {**item, "extra": "x"}
+
+    @app.route("/test")
+    @responds(schema=ItemSchema(many=True), stream=True, stream_batch_size=3)
+    def test():
+        pulled.clear()
+        return generate()
+
+    @app.route("/list")
+    @responds(schema=ItemSchema(many=True), stream=True)
+    def test_list():
+        return ITEMS
+
+    with client as cl:
+        resp = cl.get("/test")
+        assert "Content-Length" not in resp.headers
+        assert resp.get_json() == ITEMS
+        assert pulled == list(range(10))
+
+        resp = cl.get("/list")
+        assert "Content-Length" in resp.headers
+        assert resp.get_json() == ITEMS
+
+
+def test_responds_stream_envelope_skip_none_and_compress(app, client):  # noqa
+    @app.route("/test")
+    @responds(
+        schema=ItemSchema(many=True),
+        envelope="data",
+        skip_none=True,
+        compress=True,
+        compress_min_size=0,
+        stream=True,
+        stream_batch_size=4,
+    )
+    def test():
+        return ({"id": item["id"], "name": None} for item in ITEMS)
+
+    @app.route("/empty")
+    @responds(schema=ItemSchema(many=True), envelope="data", stream=True)
+    def empty():
+        return iter([])
+
+    with client as cl:
+        resp = cl.get("/test", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(resp.data) == (
+            b'{"data":[' + b",".join(b'{"id":%d}' % i for i in range(10)) + b"]}"
+        )
+        assert cl.get("/empty").get_json() == {"data": []}
+
+
+def test_responds_stream_yield_per(app, client):  # noqa
+    sa = pytest.importorskip("sqlalchemy")
+    orm = pytest.importorskip("sqlalchemy.orm")
+
+    Base = orm.declarative_base()
+
+    class Item(Base):
+        __tablename__ = "item"
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    engine = sa.create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with orm.Session(engine) as session:
+        session.add_all(Item(**item) for item in ITEMS)
+        session.commit()
+
+        @app.route("/query")
+        @responds(schema=ItemSchema(many=True), stream=True, stream_batch_size=3)
+        def query():
+            return session.query(Item).order_by(Item.id)
+
+        @app.route("/result")
+        @responds(schema=ItemSchema(many=True), stream=True, stream_batch_size=3)
+        def result():
+            statement = sa.select(Item).order_by(Item.id).execution_options(yield_per=3)
+            return session.scalars(statement)
+
+        with client as cl:
+            assert cl.get("/query").get_json() == ITEMS
+            assert cl.get("/result").get_json() == ITEMS
+
+
+def test_responds_stream_incompatible_options():
+    with pytest.raises(ValueError):
+        responds(schema=ItemSchema(many=True), stream=True, columnar=True)
@@ -0,0 +1,121 @@
+from array import array
+
+import pytest
+from flask import request
+from flask_restx import Resource, Api
+from marshmallow import Schema, fields, validate
+
+from flask_accepts.decorators import accepts
+from flask_accepts.tests.fixtures import app, client  # noqa
+
+np = pytest.importorskip("numpy")
+
+from flask_accepts.vectorized import VectorizedList, vectorize_list_fields  # noqa: E402
+
+
+class TelemetrySchema(Schema):
+    values = fields.List(fields.Float(validate=validate.Range(min=0)), required=True)
+    counts = fields.List(fields.Integer(validate=validate.Range(max=10, max_inclusive=False)))
+    flags = fields.List(fields.Boolean(), data_key="Flags")
+    names = fields.List(fields.String())
+
+
+def test_vectorize_list_fields():
+    schema = TelemetrySchema()
+    result = vectorize_list_fields(schema)
+
+    assert type(result.fields["values"]) is VectorizedList
+    assert type(result.load_fields["flags"]) is VectorizedList
+    assert type(result.fields["names"]) is fields.List
+    # The original schema is unchanged
+    assert type(schema.fields["values"]) is fields.List
+    assert result.fields["values"].required
+
+
+def test_vectorize_list_fields_without_list_fields():
+    class NameSchema(Schema):
+        name = fields.String()
+
+    schema = NameSchema()
+    assert vectorize_list_fields(schema) is schema
+
+
+@pytest.mark.parametrize(
+    "output, expected_type",
+    [("list", list), ("array", array), ("ndarray", np.ndarray)],
+)
+def test_vectorized_list_outputs(output, expected_type):
+    schema = vectorize_list_fields(TelemetrySchema(), output=output)
+    data = {"values": [1, 2.5], "counts": [1, 2], "Flags": [True, False]}
+
+    result = schema.load(data)
+    for name in ("values", "counts", "flags"):
+        assert type(result[name]) is expected_type
+    assert list(result["values"]) == [1.0, 2.5]
+    assert list(result["counts"]) == [1, 2]
+    assert [bool(flag) for flag in result["flags"]] == [True, False]
+    assert schema.dump(result) == {
+        "values": [1.0, 2.5],
+        "counts": [1, 2],
+        "Flags": [True, False],
+    }
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"values": [1, -2.5, "x", None, float("nan")]},
+        {"values": [], "counts": [1, 10, 2.5, True, 2 ** 70], "Flags": [1, "maybe"]},
+        {"values": "1,2", "counts": {"a": 1}},
+    ],
+)
+def test_vectorized_list_errors_match_marshmallow(data):
+    schema = TelemetrySchema()
+
+    assert vectorize_list_fields(schema, output="ndarray").validate(data) == schema.validate(data)
+
+
+def test_vectorized_list_falls_back_to_elements():
+    schema = vectorize_list_fields(TelemetrySchema(), output="ndarray")
+
+    result = schema.load({"values": ["1.5", 2], "Flags": ["yes", 0]})
+    assert result["values"].tolist() == [1.5, 2.0]
+    assert result["flags"].tolist() == [True, False]
+
+
+def test_vectorized_list_integer_too_large():
+    schema = vectorize_list_fields(TelemetrySchema(), output="array")
+
+    assert schema.validate({"values": [], "counts": [-(2 ** 70)]}) == {
+        "counts": ["Number too large."]
+    }
+
+
+def test_vectorized_list_requires_numeric_inner_field():
+    with pytest.raises(TypeError):
+        VectorizedList(fields.String())
+    with pytest.raises(ValueError):
+        VectorizedList(fields.Float(), output="tuple")
+
+
+def test_accepts_vectorize_lists(app, client):  # noqa
+    api = Api(app)
+
+    @api.route("/test")
+    class TestResource(Resource):
+        @accepts(schema=TelemetrySchema, vectorize_lists="ndarray", api=api)
+        def post(self):
+            assert request.parsed_obj["values"].dtype == np.float64
+            return float(request.parsed_obj["values"].sum())
+
+    with client as cl:
+        resp = cl.post("/test", json={"values": [1.5, 2]})
+        assert resp.status_code == 200
+        assert resp.json == 3.5
+
+        resp = cl.post("/test", json={"values": [1.5, -2]})
+        assert resp.status_code == 400
+        assert resp.json["errors"] == {"values": {"1": ["Must be greater than or equal to 0."]}}
+
+        swagger = cl.get("/swagger.json").json
+        assert swagger["definitions"]["Telemetry"]["properties"]["values"]["type"] == "array"
@@ -0,0 +1,69 @@
+from marshmallow import Schema, fields
+
+from flask_accepts import accepts, responds, warm_up_all
+from flask_accepts.warmup import warm_up_schema
+
+
+class TreeSchema(Schema):
+    name = fields.String(required=True)
+    created = fields.DateTime()
+    owner = fields.Nested("LeafOwnerSchema")
+    children = fields.List(fields.Nested(lambda: TreeSchema()))
+    parent = fields.Nested("self")
+
+
+class LeafOwnerSchema(Schema):
+    email = fields.Email()
+    id = fields.UUID()
+
+
+def _unbound_nested(schema):
+    return [
+        name
+        for name, field in schema.fields.items()
+        if isinstance(field, fields.Nested) and not field._schema
+    ] + [
+        name
+        for name, field in schema.fields.items()
+        if isinstance(field, fields.List) and not field.inner._schema
+    ]
+
+
+def test_warm_up_schema():
+    schema = TreeSchema()
+    assert _unbound_nested(schema) == ["owner", "parent", "children"]
+
+    assert warm_up_schema(schema) is schema
+    assert _unbound_nested(schema) == []
+    assert isinstance(schema.fields["owner"].schema, LeafOwnerSchema)
+
+
+def test_warm_up_schema_synthetic():
+    schema = warm_up_schema(TreeSchema(many=True), synthetic=True)
+    assert _unbound_nested(schema) == []
+    # Other backends are ignored
+    assert warm_up_schema("not a schema", synthetic=True) == "not a schema"
+
+
+def test_accepts_and_responds_warm_up():
+    @accepts(schema=TreeSchema, warm_up=True)
+    def post():
+        pass  # pragma: no cover
+
+    @responds(schema=TreeSchema, alt_schemas={400: LeafOwnerSchema}, warm_up="synthetic")
+    def get():
+        pass  # pragma: no cover
+
+    assert _unbound_nested(post.__accepts_spec__.schema) == []
+    assert _unbound_nested(get.__responds_spec__.schema) == []
+
+
+def test_warm_up_all():
+    @responds(schema=TreeSchema)
+    def get():
+        pass  # pragma: no cover
+
+    schema = get.__responds_spec__.schema
+    assert _unbound_nested(schema)
+    assert warm_up_all() >= 1
+    assert _unbound_nested(schema) == []
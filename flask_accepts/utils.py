@@ -5,6 +5,9 @@ from marshmallow import fields as ma
 from marshmallow import __version_info__ as marshmallow_version
 from marshmallow.schema import Schema, SchemaMeta
 
+from flask_accepts.raw_json import RawJSONField
+from flask_accepts.vectorized import VectorizedList
+
 
 _ma_key_for_fr_example_key = "dump_default"
 _ma_key_for_fr_default_key = "load_default"
@@ -62,7 +65,8 @@ def for_swagger(schema, api, model_name: str = None, operation: str = "dump"):
     Convert a marshmallow schema to equivalent Flask-restx model
 
     Args:
-        schema (Marshmallow Schema): Schema defining the inputs
+        schema (Marshmallow Schema): Schema defining the inputs. Schemas of other registered
+            validation backends (see `flask_accepts.backends`) are converted by their backend.
         api (Namespace): Flask-restx namespace (necessary for context)
         model_name (str): Name of Flask-restx model
 
@@ -70,6 +74,14 @@ def for_swagger(schema, api, model_name: str = None, operation: str = "dump"):
         api.model: An equivalent api.model
     """
 
+    if not isinstance(schema, (Schema, SchemaMeta)):
+        # Schemas of other validation backends provide their own conversion
+        from flask_accepts.backends import get_backend
+
+        return get_backend(schema).for_swagger(
+            schema, api, model_name=model_name, operation=operation
+        )
+
     model_name = model_name or get_default_model_name(schema)
 
     # For nested Schemas, the internal fields are stored in _declared_fields, whereas
@@ -135,6 +147,7 @@ type_map = {
     ma.Number: fr.Float,
     ma.Pluck: fr.Raw,
     ma.Raw: fr.Raw,
+    RawJSONField: fr.Raw,
     ma.Str: fr.String,
     ma.String: fr.String,
     ma.Time: fr.DateTime,
@@ -150,6 +163,7 @@ type_map = {k: make_type_mapper(v) for k, v in type_map.items()}
 type_map.update(
     {
         ma.List: unpack_list,
+        VectorizedList: unpack_list,
         ma.Nested: unpack_nested,
         Schema: for_swagger,
         SchemaMeta: for_swagger,
@@ -163,9 +177,11 @@ def get_default_model_name(schema: Optional[Union[Schema, Type[Schema]]] = None)
     if schema:
         if isinstance(schema, Schema):
             return "".join(schema.__class__.__name__.rsplit("Schema", 1))
-        else:
-            # It is a type itself
+        elif hasattr(schema, "__name__"):
+            # It is a type itself, or a backend schema named after its type
             return "".join(schema.__name__.rsplit("Schema", 1))
+        else:
+            return "".join(schema.__class__.__name__.rsplit("Schema", 1))
 
     global num_default_models
     name = f"DefaultResponseModel_{num_default_models}"
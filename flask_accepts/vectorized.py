@@ -0,0 +1,171 @@
+"""
+Vectorized loading of large numeric lists with NumPy.
+
+`VectorizedList` is a drop-in replacement for `fields.List(fields.Float())` (or `Integer` or
+`Boolean`) that type checks, range validates and converts the whole list in a single NumPy pass
+instead of deserializing each element through the inner field. Lists that fail the vectorized
+checks are deserialized by marshmallow element by element, so validation errors are exactly the
+ones `fields.List` reports. NumPy is only imported once a `VectorizedList` is created.
+"""
+import copy
+from array import array
+from marshmallow import Schema, utils
+from marshmallow import fields as ma
+from marshmallow.validate import Range
+
+
+OUTPUTS = ("list", "array", "ndarray")
+
+# Per inner field type: the exact Python types accepted by the vectorized path, the NumPy dtype
+# and the `array.array` typecode
+_VECTORIZABLE = {
+    ma.Float: (frozenset([int, float]), "float64", "d"),
+    ma.Integer: (frozenset([int]), "int64", "q"),
+    ma.Boolean: (frozenset([bool]), "bool", "b"),
+}
+
+
+class VectorizedList(ma.List):
+    """
+    A `List` of `Float`, `Integer` or `Boolean` loaded with NumPy.
+
+    Args:
+        cls_or_instance: The inner field
+        output (str, optional): Type of the loaded value, one of "list", "array" (an
+            `array.array`) or "ndarray". Defaults to "list".
+    """
+
+    def __init__(self, cls_or_instance, output: str = "list", **kwargs):
+        # Fail when the schema is declared rather than on the first request
+        import numpy  # noqa: F401
+
+        super().__init__(cls_or_instance, **kwargs)
+        if output not in OUTPUTS:
+            raise ValueError(f"Invalid output: {output}. Options are {', '.join(OUTPUTS)}.")
+        if type(self.inner) not in _VECTORIZABLE:
+            raise TypeError("VectorizedList requires a Float, Integer or Boolean inner field")
+        self.output = output
+        self._types, self._dtype, self._typecode = _VECTORIZABLE[type(self.inner)]
+
+    @classmethod
+    def from_list(cls, field: ma.List, output: str = "list") -> "VectorizedList":
+        """Build a `VectorizedList` with the same options as an existing `List` field."""
+        return cls(
+            field.inner,
+            output=output,
+            load_default=field.load_default,
+            dump_default=field.dump_default,
+            data_key=field.data_key,
+            attribute=field.attribute,
+            validate=field.validators,
+            required=field.required,
+            allow_none=field.allow_none,
+            load_only=field.load_only,
+            dump_only=field.dump_only,
+            error_messages=field.error_messages,
+            metadata=field.metadata,
+        )
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if not utils.is_collection(value):
+            raise self.make_error("invalid")
+
+        result = self._load_vectorized(value)
+        if result is None:
+            # Let marshmallow report the errors of each element
+            result = super()._deserialize(value, attr, data, **kwargs)
+        return self._to_output(result)
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is not None and not isinstance(value, list):
+            # Both arrays convert back to Python scalars in a single call
+            value = value.tolist()
+        return super()._serialize(value, attr, obj, **kwargs)
+
+    def _load_vectorized(self, value):
+        """Load the list in one pass, or return None if any element needs marshmallow."""
+        import numpy as np
+
+        inner = self.inner
+        if not self._types.issuperset(map(type, value)):
+            return None
+        try:
+            values = np.asarray(value, dtype=self._dtype)
+        except OverflowError:
+            return None
+
+        if self._dtype == "float64" and not inner.allow_nan and not np.isfinite(values).all():
+            return None
+        for validator in inner.validators:
+            if not isinstance(validator, Range) or not _in_range(values, validator):
+                return None
+        return values
+
+    def _to_output(self, values):
+        if self.output == "list":
+            return values if isinstance(values, list) else values.tolist()
+        if isinstance(values, list):
+            # Loaded by marshmallow, so may not fit the fixed size type of the array
+            try:
+                return self._to_array(values)
+            except OverflowError as ex:
+                raise self.inner.make_error("too_large") from ex
+        return self._to_array(values)
+
+    def _to_array(self, values):
+        if self.output == "ndarray":
+            import numpy as np
+
+            return np.asarray(values, dtype=self._dtype)
+        if isinstance(values, list):
+            return array(self._typecode, values)
+        result = array(self._typecode)
+        # The bytes of a bool array are those of the "b" typecode
+        result.frombytes(values.view("int8").tobytes() if self._typecode == "b" else values.tobytes())
+        return result
+
+
+def _in_range(values, validator: Range) -> bool:
+    if validator.min is not None:
+        below = values < validator.min if validator.min_inclusive else values <= validator.min
+        if below.any():
+            return False
+    if validator.max is not None:
+        above = values > validator.max if validator.max_inclusive else values >= validator.max
+        if above.any():
+            return False
+    return True
+
+
+def vectorize_list_fields(schema: Schema, output: str = "list") -> Schema:
+    """
+    Return a copy of a schema instance in which its `List` fields of `Float`, `Integer` or
+    `Boolean` are replaced by `VectorizedList` fields. Nested schemas are left unchanged. The
+    schema itself is returned if it has no such fields.
+
+    Args:
+        schema (Marshmallow Schema): Instance of the schema
+        output (str, optional): The `VectorizedList` output. Defaults to "list".
+
+    Returns:
+        The schema instance to use
+    """
+    replaced = {
+        name: VectorizedList.from_list(field, output=output)
+        for name, field in schema.fields.items()
+        if type(field) is ma.List and type(field.inner) in _VECTORIZABLE
+    }
+    if not replaced:
+        return schema
+
+    vectorized = copy.copy(schema)
+    for name, field in replaced.items():
+        field._bind_to_schema(name, vectorized)
+    vectorized.fields = {**schema.fields, **replaced}
+    vectorized.load_fields = {
+        name: replaced.get(name, field) for name, field in schema.load_fields.items()
+    }
+    vectorized.dump_fields = {
+        name: replaced.get(name, field) for name, field in schema.dump_fields.items()
+    }
+    return vectorized
@@ -0,0 +1,138 @@
+"""
+Warm-up of the schemas used by `accepts` and `responds`.
+
+marshmallow resolves the schemas of `fields.Nested` (including the ones referenced by name or
+with a lambda) and instantiates them the first time they are used, so the first request of
+each route in each worker is noticeably slower. Warming up a schema does that work ahead of
+time, and optionally runs a load and a dump of synthetic data through it.
+"""
+import datetime
+import decimal
+import uuid
+from typing import Any, Set
+
+from marshmallow import Schema, ValidationError
+from marshmallow import fields as ma
+
+
+# Synthetic values for the field types whose deserialization has a cold path worth warming
+_SAMPLES = {
+    ma.String: "",
+    ma.Email: "user@example.com",
+    ma.URL: "https://example.com",
+    ma.UUID: str(uuid.UUID(int=0)),
+    ma.Integer: 0,
+    ma.Float: 0.0,
+    ma.Decimal: "0",
+    ma.Boolean: True,
+    ma.DateTime: datetime.datetime(2000, 1, 1).isoformat(),
+    ma.NaiveDateTime: datetime.datetime(2000, 1, 1).isoformat(),
+    ma.AwareDateTime: datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc).isoformat(),
+    ma.Date: datetime.date(2000, 1, 1).isoformat(),
+    ma.Time: datetime.time(0).isoformat(),
+}
+_OBJECT_SAMPLES = {
+    ma.UUID: uuid.UUID(int=0),
+    ma.Decimal: decimal.Decimal(0),
+    ma.DateTime: datetime.datetime(2000, 1, 1),
+    ma.NaiveDateTime: datetime.datetime(2000, 1, 1),
+    ma.AwareDateTime: datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc),
+    ma.Date: datetime.date(2000, 1, 1),
+    ma.Time: datetime.time(0),
+}
+
+
+def warm_up_schema(schema: Any, synthetic: bool = False) -> Any:
+    """
+    Resolve and bind all the nested schemas of a schema instance, and optionally load and
+    dump synthetic data with it. Schemas of other validation backends are left unchanged.
+
+    Args:
+        schema: The schema instance
+        synthetic (bool, optional): Whether to also run a load and a dump. Validation errors
+            of the synthetic data are ignored. Defaults to False.
+
+    Returns:
+        The schema
+    """
+    if not isinstance(schema, Schema):
+        return schema
+
+    _bind_nested(schema, set())
+    if synthetic:
+        try:
+            schema.load(_sample(schema, set(), _SAMPLES))
+        except ValidationError:
+            pass
+        try:
+            schema.dump(_sample(schema, set(), _OBJECT_SAMPLES))
+        except Exception:  # noqa: B902 - the sample need not be a valid object for the schema
+            pass
+    return schema
+
+
+def warm_up_all(synthetic: bool = False) -> int:
+    """
+    Warm up the schemas of every route decorated with `accepts`, `responds` or `endpoint`,
+    e.g. before the workers of a preforking server are started.
+
+    Args:
+        synthetic (bool, optional): Whether to also run a load and a dump of synthetic data
+            through each schema. Defaults to False.
+
+    Returns:
+        int: The number of route specs warmed up
+    """
+    from flask_accepts.decorators.spec import registered_specs
+
+    specs = registered_specs()
+    for spec in specs:
+        spec.warm_up(synthetic=synthetic)
+    return len(specs)
+
+
+def _bind_nested(schema: Schema, seen: Set[type]):
+    # Recursive schemas are only walked once
+    if type(schema) in seen:
+        return
+    seen = seen | {type(schema)}
+    for field in schema.fields.values():
+        for nested in _nested_schemas(field):
+            _bind_nested(nested, seen)
+
+
+def _nested_schemas(field: ma.Field):
+    if isinstance(field, ma.Nested):
+        # Accessing the schema resolves, instantiates and binds it
+        yield field.schema
+    elif isinstance(field, ma.List):
+        yield from _nested_schemas(field.inner)
+    elif isinstance(field, ma.Tuple):
+        for inner in field.tuple_fields:
+            yield from _nested_schemas(inner)
+    elif isinstance(field, ma.Dict) and field.value_field is not None:
+        yield from _nested_schemas(field.value_field)
+
+
+def _sample(schema: Schema, seen: Set[type], samples: dict):
+    if type(schema) in seen:
+        return {}
+    seen = seen | {type(schema)}
+
+    fields = schema.load_fields if samples is _SAMPLES else schema.dump_fields
+    data = {}
+    for name, field in fields.items():
+        value = _sample_value(field, seen, samples)
+        if value is not None:
+            key = (field.data_key or name) if samples is _SAMPLES else (field.attribute or name)
+            data[key] = value
+    return [data] if schema.many else data
+
+
+def _sample_value(field: ma.Field, seen: Set[type], samples: dict):
+    if isinstance(field, ma.Nested):
+        return _sample(field.schema, seen, samples)
+    if isinstance(field, ma.List):
+        value = _sample_value(field.inner, seen, samples)
+        return [value] if value is not None else []
+    return samples.get(type(field), _SAMPLES.get(type(field)))
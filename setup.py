@@ -11,10 +11,17 @@ setup(
     ext_modules=[],
     packages=find_packages(),
     install_requires=[
+        "flask>=2.2",
         "marshmallow>=3.17.0",
         "flask-restx==1.1.0; python_version < '3.8'",
         "flask-restx>=1.2.0; python_version >= '3.8'",
         "werkzeug>=2,<3; python_version < '3.8'",
         "werkzeug>=3,<4; python_version >= '3.8'",
     ],
+    extras_require={
+        "msgspec": ["msgspec>=0.18"],
+        "numpy": ["numpy"],
+        "msgpack": ["msgpack>=1.0"],
+        "sqlalchemy": ["sqlalchemy>=1.4"],
+    },
 )